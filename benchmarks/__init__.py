@@ -0,0 +1,4 @@
+"""
+Benchmark suite for SuperNan project.
+Times the media utilities and service stages on synthetic media.
+"""
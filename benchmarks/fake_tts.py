@@ -0,0 +1,229 @@
+"""
+Fake TTS server for SuperNan benchmarks.
+A local stand-in for a speech synthesis service with configurable latency
+and failure rate, and a load test of the TTS client against it.
+
+Usage:
+    python -m benchmarks.fake_tts --serve --port 8766 --latency 0.2 --failure-rate 0.05
+    python -m benchmarks.fake_tts --requests 200 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import random
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import soundfile as sf
+
+from src.audio_processor import OUTPUT_SAMPLE_RATE
+from src.tts_client import HTTPTTSBackend, TTSClient
+
+
+def tone_wav(text: str) -> bytes:
+    """
+    Render a tone lasting 60 ms per character as WAV bytes.
+    
+    Args:
+        text: Text standing in for speech
+    
+    Returns:
+        WAV file contents
+    """
+    t = np.arange(int(max(len(text), 1) * 0.06 * OUTPUT_SAMPLE_RATE)) / OUTPUT_SAMPLE_RATE
+    buffer = io.BytesIO()
+    sf.write(buffer, (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32), OUTPUT_SAMPLE_RATE, format="WAV")
+    return buffer.getvalue()
+
+
+class FakeTTSServer:
+    """
+    HTTP server answering POST /synthesize like HTTPTTSBackend expects.
+    
+    Each request sleeps for latency seconds and then fails with HTTP 503
+    with probability failure_rate, or returns a tone as WAV audio.
+    """
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.1, failure_rate: float = 0.0):
+        """
+        Initialize the server (not started).
+        
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (any free port if 0)
+            latency: Seconds each request takes
+            failure_rate: Fraction of requests answered with HTTP 503
+        """
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.requests = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+    
+    @property
+    def url(self) -> str:
+        """Synthesis endpoint of the server."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/synthesize"
+    
+    def _handler(self):
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, so clients can reuse connections
+            protocol_version = "HTTP/1.1"
+            
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if self.path != "/synthesize":
+                    self._reply(404, b"", "text/plain")
+                    return
+                
+                try:
+                    text = json.loads(body)["text"]
+                except (ValueError, KeyError, TypeError):
+                    self._reply(400, b"", "text/plain")
+                    return
+                
+                time.sleep(server.latency)
+                failed = random.random() < server.failure_rate
+                with server._lock:
+                    server.requests += 1
+                    server.failures += failed
+                if failed:
+                    self._reply(503, b"", "text/plain")
+                else:
+                    self._reply(200, tone_wav(text), "audio/wav")
+            
+            def _reply(self, status: int, data: bytes, content_type: str):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return Handler
+    
+    def start(self) -> "FakeTTSServer":
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def serve(self):
+        """Serve requests on the calling thread until interrupted."""
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+    
+    def stop(self):
+        """Stop serving and close the listening socket."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def load_test(url: str, requests: int = 100, concurrency: int = 8, rate: float = None, max_retries: int = 3) -> dict:
+    """
+    Send requests through a TTSClient and measure throughput and latency.
+    
+    Args:
+        url: Synthesis endpoint
+        requests: Number of requests to send
+        concurrency: Requests in flight at once
+        rate: Requests per second allowed (unlimited if None)
+        max_retries: Retries of a failed request
+    
+    Returns:
+        Dictionary with throughput, latency percentiles and retry counts
+    """
+    client = TTSClient(HTTPTTSBackend(url), max_concurrency=concurrency, rate=rate, max_retries=max_retries, backoff=0.05)
+    latencies = []
+    errors = 0
+    
+    async def one(index):
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            await client.synthesize(f"Load test sentence number {index}.", "fake", {})
+        except Exception:
+            errors += 1
+            return
+        latencies.append(time.perf_counter() - start)
+    
+    async def run_all():
+        try:
+            await asyncio.gather(*(one(index) for index in range(requests)))
+        finally:
+            await client.close()
+    
+    start = time.perf_counter()
+    asyncio.run(run_all())
+    elapsed = time.perf_counter() - start
+    
+    latencies.sort()
+    stats = client.stats()
+    return {
+        "requests": requests,
+        "seconds": elapsed,
+        "throughput": requests / elapsed if elapsed else 0.0,
+        "p50": statistics.median(latencies) if latencies else None,
+        "p95": latencies[int(0.95 * (len(latencies) - 1))] if latencies else None,
+        "errors": errors,
+        "attempts": stats["requests"],
+        "retries": stats["retries"]
+    }
+
+
+def main(argv: list = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Fake TTS server and TTS client load test")
+    parser.add_argument("--serve", action="store_true", help="Run the server until interrupted")
+    parser.add_argument("--port", type=int, default=8766, help="Port to listen on (default: 8766)")
+    parser.add_argument("--latency", type=float, default=0.1, help="Seconds per request (default: 0.1)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of requests failing with HTTP 503")
+    parser.add_argument("--requests", type=int, default=100, help="Requests sent by the load test (default: 100)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight at once (default: 8)")
+    parser.add_argument("--rate", type=float, help="Requests per second allowed (default: unlimited)")
+    args = parser.parse_args(argv)
+    
+    if args.serve:
+        server = FakeTTSServer(port=args.port, latency=args.latency, failure_rate=args.failure_rate)
+        print(f"Serving fake TTS at {server.url}")
+        server.serve()
+        return 0
+    
+    with FakeTTSServer(latency=args.latency, failure_rate=args.failure_rate) as server:
+        result = load_test(server.url, args.requests, args.concurrency, args.rate)
+    
+    print(f"{result['requests']} requests in {result['seconds']:.2f}s ({result['throughput']:.1f}/s)")
+    if result["p50"] is not None:
+        print(f"Latency p50 {result['p50'] * 1000:.0f} ms, p95 {result['p95'] * 1000:.0f} ms")
+    print(f"Attempts {result['attempts']}, retries {result['retries']}, failed {result['errors']}")
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+Synthetic media module for SuperNan benchmarks.
+Generates test videos with ffmpeg lavfi sources, so no sample files are needed.
+"""
+
+import os
+
+from src.ffmpeg import run_ffmpeg
+
+
+# Lengths of the generated test videos in seconds
+DEFAULT_LENGTHS = [10, 30, 120]
+
+
+def make_video(path: str, duration: float, size: str = "640x360", rate: int = 25, gop: int = 50):
+    """
+    Generate an H.264/AAC test video.
+    
+    The audio alternates one second of tone with half a second of silence,
+    so silence detection and segment timing have something to work with.
+    
+    Args:
+        path: Output video path
+        duration: Length in seconds
+        size: Frame size
+        rate: Frame rate
+        gop: Keyframe interval in frames
+    """
+    run_ffmpeg([
+        "-f", "lavfi", "-i", f"testsrc2=size={size}:rate={rate}:duration={duration}",
+        "-f", "lavfi", "-i", f"sine=frequency=440:sample_rate=44100:duration={duration}",
+        "-af", "volume='if(lt(mod(t,1.5),1),1,0)':eval=frame",
+        "-c:v", "libx264", "-preset", "ultrafast", "-g", gop, "-pix_fmt", "yuv420p",
+        "-c:a", "aac", "-shortest",
+        path
+    ])
+
+
+def make_speech(path: str, duration: float, sample_rate: int = 24000):
+    """
+    Generate a WAV file standing in for synthesized speech.
+    
+    Args:
+        path: Output audio path
+        duration: Length in seconds
+        sample_rate: Sample rate
+    """
+    run_ffmpeg([
+        "-f", "lavfi", "-i", f"sine=frequency=220:sample_rate={sample_rate}:duration={duration}",
+        "-ac", 1, path
+    ])
+
+
+def ensure_media(work_dir: str, lengths: list = None) -> dict:
+    """
+    Generate the test videos once and reuse them on later runs.
+    
+    Args:
+        work_dir: Directory holding generated media
+        lengths: Video lengths in seconds
+    
+    Returns:
+        Mapping of length to video path
+    """
+    os.makedirs(work_dir, exist_ok=True)
+    videos = {}
+    for length in lengths or DEFAULT_LENGTHS:
+        path = os.path.join(work_dir, f"synthetic_{length}s.mp4")
+        if not os.path.exists(path):
+            print(f"Generating {path}...")
+            make_video(path, length)
+        videos[length] = path
+    return videos
@@ -0,0 +1,540 @@
+"""
+Benchmark runner for SuperNan project.
+Times every media utility and service stage on synthetic videos, writes the
+results as JSON and compares them against a stored baseline.
+
+Usage:
+    python -m benchmarks.run
+    python -m benchmarks.run --models all --lengths 10 30
+    python -m benchmarks.run --update-baseline
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+
+# Model weights must come from the local cache; never reach the network
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+import numpy as np
+import soundfile as sf
+
+from src import audio_processor, video_processor
+from src.ffmpeg import run_ffmpeg
+from src.instrumentation import Tracer
+from src.keyframes import get_keyframes
+from src.models import get_registry
+
+from .media import DEFAULT_LENGTHS, ensure_media, make_speech
+from .startup import check_startup, violations
+from .stubs import StubTTS, stub_pipeline
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Sentences translated by the translator benchmark
+SENTENCES = [
+    "The weather is nice today.",
+    "Please close the door when you leave the room.",
+    "We are going to the market to buy fresh vegetables and some fruit.",
+    "She has been learning to play the piano for three years.",
+    "The children were playing in the park until it started raining.",
+    "Can you tell me how to get to the railway station?",
+    "This video explains how the new software update works.",
+    "He said that the meeting would be postponed until next week."
+] * 4
+
+# Model registry (kind, compute_type) of each translation backend
+TRANSLATOR_REGISTRY_KEYS = {
+    "torch": ("translator", "float32"),
+    "torch-int8": ("translator", "int8"),
+    "ctranslate2": ("translator-ct2", "int8"),
+}
+
+
+def measure(func, repeat: int = 3, warmup: bool = True) -> dict:
+    """
+    Time a callable.
+    
+    Output printed by the callable is suppressed.
+    
+    Args:
+        func: Callable to time
+        repeat: Number of timed runs
+        warmup: Run once untimed first (JIT compilation, file caches)
+    
+    Returns:
+        Dictionary with median and min wall time in seconds and run count
+    """
+    if warmup:
+        with contextlib.redirect_stdout(io.StringIO()):
+            func()
+    
+    timings = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+    return {"median": statistics.median(timings), "min": min(timings), "runs": repeat}
+
+
+def chrf(hypotheses: list, references: list, max_order: int = 6, beta: float = 2.0) -> float:
+    """
+    Corpus-level chrF score of translations against references.
+    
+    Args:
+        hypotheses: Translated sentences
+        references: Reference translations
+        max_order: Largest character n-gram
+        beta: Weight of recall relative to precision
+    
+    Returns:
+        chrF in [0, 100]
+    """
+    precisions = []
+    recalls = []
+    for order in range(1, max_order + 1):
+        matches = hypothesis_total = reference_total = 0
+        for hypothesis, reference in zip(hypotheses, references):
+            hypothesis_ngrams = Counter(
+                hypothesis.replace(" ", "")[i:i + order] for i in range(len(hypothesis.replace(" ", "")) - order + 1)
+            )
+            reference_ngrams = Counter(
+                reference.replace(" ", "")[i:i + order] for i in range(len(reference.replace(" ", "")) - order + 1)
+            )
+            matches += sum((hypothesis_ngrams & reference_ngrams).values())
+            hypothesis_total += sum(hypothesis_ngrams.values())
+            reference_total += sum(reference_ngrams.values())
+        if hypothesis_total and reference_total:
+            precisions.append(matches / hypothesis_total)
+            recalls.append(matches / reference_total)
+    
+    if not precisions:
+        return 0.0
+    precision = sum(precisions) / len(precisions)
+    recall = sum(recalls) / len(recalls)
+    if precision + recall == 0:
+        return 0.0
+    return 100 * (1 + beta ** 2) * precision * recall / (beta ** 2 * precision + recall)
+
+
+def translation_backend_cases(translator_model: str) -> tuple:
+    """
+    Load every translation backend available offline for a model.
+    
+    Args:
+        translator_model: Translation model name or local path
+    
+    Returns:
+        Tuple of (dict of backend to TranslationService, skip reasons)
+    """
+    from src.translator import BACKENDS, TranslationService, converted_model_dir
+    
+    services = {}
+    skipped = {}
+    for backend in BACKENDS:
+        model = translator_model
+        if backend == "ctranslate2" and not os.path.isfile(os.path.join(translator_model, "model.bin")):
+            model = converted_model_dir(translator_model)
+        try:
+            services[backend] = TranslationService(model_name=model, backend=backend)
+        except Exception as e:
+            skipped[backend] = f"{backend} not available offline: {e}"
+    return services, skipped
+
+
+def media_cases(video: str, length: float, work_dir: str) -> list:
+    """
+    Build the video_processor and audio_processor cases for one video.
+    
+    Args:
+        video: Synthetic video path
+        length: Video length in seconds
+        work_dir: Scratch directory for outputs
+    
+    Returns:
+        List of (name, callable) tuples
+    """
+    def out(name):
+        return os.path.join(work_dir, name)
+    
+    speech_path = out("speech.wav")
+    make_speech(speech_path, length * 1.2)
+    audio_path = out("audio.wav")
+    video_processor.extract_audio(video, audio_path)
+    
+    speech = audio_processor.load_audio_file(speech_path)
+    total_samples = int(length * audio_processor.OUTPUT_SAMPLE_RATE)
+    clips = [
+        {"start": float(start), "samples": speech[:audio_processor.OUTPUT_SAMPLE_RATE]}
+        for start in np.arange(0.0, length, 1.5)
+    ]
+    regions = [
+        {"source_start": float(start), "source_end": float(start) + 1.0, "start": float(start), "end": float(start) + 1.2}
+        for start in np.arange(0.0, length - 1.5, 1.5)
+    ]
+    
+    # Cut points off the keyframe grid, so smart cutting re-encodes both ends
+    start, end = 2.3, length - 2.7
+    
+    return [
+        ("parse_time", lambda: [video_processor.parse_time("01:02:03.500") for _ in range(1000)]),
+        ("get_keyframes", lambda: get_keyframes(video, use_cache=False)),
+        ("extract_chunk.smart", lambda: video_processor.extract_chunk(video, out("smart.mp4"), start, end)),
+        ("extract_chunk.copy", lambda: video_processor.extract_chunk(video, out("copy.mp4"), start, end, smart=False)),
+        ("extract_audio", lambda: video_processor.extract_audio(video, out("extracted.wav"))),
+        ("load_audio", lambda: video_processor.load_audio(video)),
+        ("merge_audio_video", lambda: video_processor.merge_audio_video(video, speech_path, out("merged.mp4"))),
+        ("concat_files", lambda: video_processor.concat_files([video, video], out("joined.mp4"))),
+        ("get_duration", lambda: audio_processor.get_duration(speech_path)),
+        ("load_audio_file", lambda: audio_processor.load_audio_file(speech_path)),
+        ("time_stretch", lambda: audio_processor.time_stretch(speech, total_samples)),
+        ("stretch_regions", lambda: audio_processor.stretch_regions(speech, audio_processor.OUTPUT_SAMPLE_RATE, regions, length)),
+        ("place_segments", lambda: audio_processor.place_segments(clips, length)),
+        ("assemble_segments", lambda: audio_processor.assemble_segments(clips, out("assembled.wav"), length)),
+        ("adjust_duration", lambda: audio_processor.adjust_duration(speech_path, out("adjusted.wav"), length)),
+        ("match_audio_duration", lambda: audio_processor.match_audio_duration(audio_path, speech_path, out("matched.wav"))),
+    ]
+
+
+def pipeline_case(pipeline, video: str, length: float, mode: str, work_dir: str, stages: dict):
+    """
+    Build a callable running the whole pipeline over a video.
+    
+    Args:
+        pipeline: VideoDubbingPipeline (real or stub services)
+        video: Synthetic video path
+        length: Video length in seconds
+        mode: Pipeline mode
+        work_dir: Scratch directory for outputs
+        stages: Dictionary filled with per-stage wall times of the last run
+    
+    Returns:
+        Callable running the pipeline
+    """
+    def run():
+        tracer = Tracer()
+        pipeline.run(video, os.path.join(work_dir, f"dubbed_{mode}.mp4"), 0, length, mode=mode, tracer=tracer)
+        stages.clear()
+        for stage in tracer.metrics()["stages"]:
+            stages[stage["name"]] = stages.get(stage["name"], 0.0) + stage["wall_seconds"]
+    return run
+
+
+def load_model_services(whisper_model: str, translator_model: str) -> tuple:
+    """
+    Load small local models for the model benchmarks.
+    
+    Args:
+        whisper_model: Whisper model size
+        translator_model: Translation model name or local path
+    
+    Returns:
+        Tuple of (transcriber or None, dict of backend to translator,
+        skip reasons)
+    """
+    transcriber = None
+    skipped = {}
+    
+    try:
+        from src.transcriber import TranscriptionService
+        transcriber = TranscriptionService(model_size=whisper_model, compute_type="int8", device="cpu")
+    except Exception as e:
+        skipped["transcribe"] = f"{whisper_model} not available offline: {e}"
+    
+    translators, translator_skipped = translation_backend_cases(translator_model)
+    skipped.update({f"translate_batch.{backend}": reason for backend, reason in translator_skipped.items()})
+    
+    return transcriber, translators, skipped
+
+
+def run_benchmarks(
+    lengths: list,
+    repeat: int = 3,
+    models: str = "stub",
+    whisper_model: str = "tiny",
+    translator_model: str = "facebook/nllb-200-distilled-600M",
+    work_dir: str = ".benchmarks",
+    name_filter: str = None
+) -> dict:
+    """
+    Run the benchmark cases.
+    
+    Args:
+        lengths: Synthetic video lengths in seconds
+        repeat: Timed runs per case
+        models: "stub", "tiny" or "all"
+        whisper_model: Whisper model size for the model benchmarks
+        translator_model: Translation model for the model benchmarks
+        work_dir: Directory for generated media
+        name_filter: Only run cases whose name contains this string
+    
+    Returns:
+        Dictionary with run metadata and per-case results
+    """
+    videos = ensure_media(work_dir, lengths)
+    results = {}
+    
+    def record(name, func, runs=repeat, stages=None, warmup=True):
+        if name_filter and name_filter not in name:
+            return
+        print(f"  {name}...", end=" ", flush=True)
+        try:
+            results[name] = measure(func, runs, warmup=warmup)
+            if stages:
+                results[name]["stages"] = dict(stages)
+            print(f"{results[name]['median']:.3f}s")
+        except Exception as e:
+            results[name] = {"error": f"{type(e).__name__}: {e}"}
+            print("error")
+    
+    print("Startup:")
+    for name, result in check_startup(repeat).items():
+        if not name_filter or name_filter in name:
+            results[name] = result
+            print(f"  {name}... {result['median']:.3f}s")
+    
+    transcriber = translator = None
+    translators = {}
+    if models in ("tiny", "all"):
+        print("Loading local models...")
+        transcriber, translators, skipped = load_model_services(whisper_model, translator_model)
+        for stage, reason in skipped.items():
+            results[stage] = {"skipped": reason}
+    
+    # Speed, memory and quality (chrF against full-precision torch) per backend
+    reference = translators["torch"].translate_batch(SENTENCES) if "torch" in translators else None
+    memory = {
+        (entry["kind"], entry["name"], entry["compute_type"]): entry["memory_bytes"]
+        for entry in get_registry().memory_report()
+    }
+    for backend, service in translators.items():
+        name = f"translate_batch.{backend}"
+        record(name, lambda: service.translate_batch(SENTENCES))
+        if "median" not in results.get(name, {}):
+            continue
+        kind, compute_type = TRANSLATOR_REGISTRY_KEYS[backend]
+        results[name]["sentences_per_second"] = len(SENTENCES) / results[name]["median"]
+        results[name]["memory_bytes"] = memory.get((kind, service.model_name, compute_type))
+        if reference is not None:
+            results[name]["chrf_vs_torch"] = chrf(service.translate_batch(SENTENCES), reference)
+            print(f"    chrF vs torch: {results[name]['chrf_vs_torch']:.1f}")
+    
+    translator = translators.get("torch") or next(iter(translators.values()), None)
+    
+    for length in lengths:
+        print(f"Benchmarks on {length}s video:")
+        scratch = tempfile.mkdtemp(dir=work_dir)
+        try:
+            if models in ("stub", "all"):
+                for name, func in media_cases(videos[length], length, scratch):
+                    record(f"{name}.{length}s", func)
+                
+                for mode in ("clip", "segments", "streaming"):
+                    stages = {}
+                    record(
+                        f"pipeline.{mode}.stub.{length}s",
+                        pipeline_case(stub_pipeline(), videos[length], length, mode, scratch, stages),
+                        stages=stages
+                    )
+            
+            if transcriber is not None:
+                audio = video_processor.load_audio(videos[length])
+                record(f"transcribe.{whisper_model}.{length}s", lambda: transcriber.transcribe(audio), runs=1, warmup=False)
+                
+                stages = {}
+                pipeline = stub_pipeline(transcriber=transcriber, translator=translator, tts=StubTTS())
+                record(
+                    f"pipeline.segments.{whisper_model}.{length}s",
+                    pipeline_case(pipeline, videos[length], length, "segments", scratch, stages),
+                    runs=1,
+                    stages=stages,
+                    warmup=False
+                )
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+    
+    if transcriber is not None:
+        # Many short clips through the batched path, against one at a time
+        clips = [video_processor.load_audio(videos[lengths[0]])] * 8
+        record(f"transcribe_sequential.{whisper_model}.8x{lengths[0]}s", lambda: [transcriber.transcribe(clip) for clip in clips], runs=1, warmup=False)
+        record(f"transcribe_many.{whisper_model}.8x{lengths[0]}s", lambda: transcriber.transcribe_many(clips), runs=1, warmup=False)
+    
+    return {"meta": environment(), "results": results}
+
+
+def environment() -> dict:
+    """Describe the machine the benchmarks ran on."""
+    try:
+        ffmpeg_version = run_ffmpeg(["-version"]).decode().splitlines()[0]
+    except Exception:
+        ffmpeg_version = None
+    
+    return {
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "ffmpeg": ffmpeg_version,
+        "numpy": np.__version__,
+        "soundfile": sf.__version__
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.25, noise_floor: float = 0.005) -> list:
+    """
+    Compare results against a baseline.
+    
+    Args:
+        results: Per-case results of this run
+        baseline: Per-case results of the baseline run
+        tolerance: Allowed relative slowdown of the median
+        noise_floor: Slowdowns smaller than this many seconds are ignored
+    
+    Returns:
+        List of regressions, each a dict with name, baseline, current and ratio
+    """
+    regressions = []
+    for name, result in sorted(results.items()):
+        previous = baseline.get(name)
+        if not previous or "median" not in previous or "median" not in result:
+            continue
+        
+        ratio = result["median"] / previous["median"] if previous["median"] else float("inf")
+        if ratio > 1 + tolerance and result["median"] - previous["median"] > noise_floor:
+            regressions.append({
+                "name": name,
+                "baseline": previous["median"],
+                "current": result["median"],
+                "ratio": ratio
+            })
+    return regressions
+
+
+def main(argv: list = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run",
+        description="SuperNan - Offline benchmarks on synthetic media"
+    )
+    parser.add_argument(
+        "--lengths",
+        type=float,
+        nargs="+",
+        default=DEFAULT_LENGTHS,
+        help=f"Synthetic video lengths in seconds (default: {' '.join(map(str, DEFAULT_LENGTHS))})"
+    )
+    parser.add_argument(
+        "--repeat", "-r",
+        type=int,
+        default=3,
+        help="Timed runs per case (default: 3)"
+    )
+    parser.add_argument(
+        "--models",
+        choices=["stub", "tiny", "all"],
+        default="stub",
+        help="Stub services only, locally cached small models only, or both (default: stub)"
+    )
+    parser.add_argument(
+        "--whisper-model",
+        default="tiny",
+        help="Whisper model size for model benchmarks (default: tiny)"
+    )
+    parser.add_argument(
+        "--translator-model",
+        default="facebook/nllb-200-distilled-600M",
+        help="Translation model name or local path for model benchmarks"
+    )
+    parser.add_argument(
+        "--filter", "-k",
+        help="Only run cases whose name contains this string"
+    )
+    parser.add_argument(
+        "--work-dir",
+        default=".benchmarks",
+        help="Directory for generated media (default: .benchmarks)"
+    )
+    parser.add_argument(
+        "--output", "-o",
+        default="benchmark_results.json",
+        help="Results JSON path (default: benchmark_results.json)"
+    )
+    parser.add_argument(
+        "--baseline",
+        default=DEFAULT_BASELINE,
+        help="Baseline JSON to compare against (default: benchmarks/baseline.json)"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed relative slowdown before a case counts as a regression (default: 0.25)"
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store this run as the new baseline instead of comparing"
+    )
+    
+    args = parser.parse_args(argv)
+    lengths = [int(length) if float(length).is_integer() else length for length in args.lengths]
+    
+    report = run_benchmarks(
+        lengths,
+        repeat=args.repeat,
+        models=args.models,
+        whisper_model=args.whisper_model,
+        translator_model=args.translator_model,
+        work_dir=args.work_dir,
+        name_filter=args.filter
+    )
+    
+    with open(args.output, "w") as output:
+        json.dump(report, output, indent=2)
+    print(f"\nResults saved to: {args.output}")
+    
+    heavy_imports = violations(report["results"])
+    for violation in heavy_imports:
+        print(f"Heavy import at startup - {violation}")
+    
+    if args.update_baseline:
+        with open(args.baseline, "w") as output:
+            json.dump(report, output, indent=2)
+        print(f"Baseline updated: {args.baseline}")
+        return 1 if heavy_imports else 0
+    
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 1 if heavy_imports else 0
+    
+    with open(args.baseline) as stored:
+        baseline = json.load(stored)
+    
+    regressions = compare(report["results"], baseline["results"], tolerance=args.tolerance)
+    if not regressions:
+        print(f"No regressions against {args.baseline}")
+        return 1 if heavy_imports else 0
+    
+    print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+    for regression in regressions:
+        print(
+            f"  {regression['name']}: {regression['baseline']:.3f}s -> "
+            f"{regression['current']:.3f}s ({regression['ratio']:.2f}x)"
+        )
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
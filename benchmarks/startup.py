@@ -0,0 +1,122 @@
+"""
+Startup check for SuperNan benchmarks.
+Verifies that importing the package and starting the CLI stay cheap: no
+model framework may be imported until a service actually needs it.
+
+Usage:
+    python -m benchmarks.startup
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+# Modules that must not be imported by lightweight entry points
+HEAVY_MODULES = ["torch", "transformers", "faster_whisper", "ctranslate2", "edge_tts", "librosa", "TTS"]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Code run in a fresh interpreter for each entry point
+ENTRY_POINTS = {
+    "startup.import_package": "import src",
+    "startup.ffmpeg_helpers": "from src import run_ffmpeg, probe, extract_chunk, extract_audio",
+    "startup.cli_help": (
+        "import sys, runpy, contextlib, io\n"
+        "sys.argv = ['main.py', '--help']\n"
+        "with contextlib.redirect_stdout(io.StringIO()):\n"
+        "    try:\n"
+        "        runpy.run_path('main.py', run_name='__main__')\n"
+        "    except SystemExit:\n"
+        "        pass\n"
+    ),
+}
+
+# Appended to each entry point to report what it imported
+REPORT = (
+    "\nimport json, sys\n"
+    "print(json.dumps([name for name in {heavy!r} if name in sys.modules]))\n"
+)
+
+
+def run_entry_point(code: str) -> tuple:
+    """
+    Run code in a fresh interpreter from the repository root.
+    
+    Args:
+        code: Python source to run
+    
+    Returns:
+        Tuple of (wall seconds, heavy modules that were imported)
+    """
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", code + REPORT.format(heavy=HEAVY_MODULES)],
+        cwd=ROOT,
+        stdout=subprocess.PIPE,
+        check=True
+    ).stdout
+    elapsed = time.perf_counter() - start
+    return elapsed, json.loads(output.decode().strip().splitlines()[-1])
+
+
+def check_startup(repeat: int = 3) -> dict:
+    """
+    Time each lightweight entry point and record heavy imports.
+    
+    Args:
+        repeat: Runs per entry point
+    
+    Returns:
+        Mapping of case name to a result with median/min seconds, run count
+        and the list of heavy modules imported
+    """
+    results = {}
+    for name, code in ENTRY_POINTS.items():
+        timings = []
+        for _ in range(repeat):
+            elapsed, heavy = run_entry_point(code)
+            timings.append(elapsed)
+        results[name] = {
+            "median": statistics.median(timings),
+            "min": min(timings),
+            "runs": repeat,
+            "heavy_modules": heavy
+        }
+    return results
+
+
+def violations(results: dict) -> list:
+    """
+    List entry points that imported heavy modules.
+    
+    Args:
+        results: Output of check_startup
+    
+    Returns:
+        List of "name: modules" strings
+    """
+    return [
+        f"{name}: {', '.join(result['heavy_modules'])}"
+        for name, result in results.items()
+        if result.get("heavy_modules")
+    ]
+
+
+def main() -> int:
+    """Command-line entry point."""
+    results = check_startup()
+    for name, result in results.items():
+        print(f"{name}: {result['median']:.3f}s")
+    
+    failed = violations(results)
+    for violation in failed:
+        print(f"Heavy import at startup - {violation}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
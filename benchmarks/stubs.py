@@ -0,0 +1,100 @@
+"""
+Stub services module for SuperNan benchmarks.
+Stand-ins for Whisper, NLLB and Edge TTS that do no model work, so the
+pipeline plumbing (ffmpeg, decoding, stretching, caching) can be timed alone.
+"""
+
+import numpy as np
+import soundfile as sf
+
+from src.audio_processor import OUTPUT_SAMPLE_RATE
+from src.ffmpeg import WHISPER_SAMPLE_RATE
+from src.pipeline import VideoDubbingPipeline
+
+
+class StubTranscriber:
+    """Emits one fixed segment every 1.5 seconds of audio."""
+    
+    model_size = "stub"
+    compute_type = "none"
+    
+    def transcribe_stream(self, audio_path, task: str = "translate", language: str = None) -> tuple:
+        result = self.transcribe(audio_path, task=task, language=language)
+        info = {"language": result["language"], "language_probability": result["language_probability"]}
+        return info, iter(result["segments"])
+    
+    def transcribe(self, audio_path, task: str = "translate", language: str = None) -> dict:
+        if isinstance(audio_path, np.ndarray):
+            duration = len(audio_path) / WHISPER_SAMPLE_RATE
+        else:
+            duration = sf.info(audio_path).duration
+        
+        segments = [
+            {"start": start, "end": min(start + 1.0, duration), "text": f"This is sentence number {index}."}
+            for index, start in enumerate(np.arange(0.0, duration, 1.5))
+        ]
+        return {
+            "text": " ".join(segment["text"] for segment in segments),
+            "segments": segments,
+            "language": language or "en",
+            "language_probability": 1.0
+        }
+
+
+class StubTranslator:
+    """Returns its input unchanged."""
+    
+    model_name = "stub"
+    backend = "stub"
+    cache = None
+    
+    def translate(self, text: str, source_lang: str = "eng_Latn", target_lang: str = "hin_Deva") -> str:
+        return text
+    
+    def translate_batch(self, texts: list, source_lang: str = "eng_Latn", target_lang: str = "hin_Deva", **kwargs) -> list:
+        return list(texts)
+    
+    def translate_multi(self, texts: list, target_langs: list, source_lang: str = "eng_Latn", **kwargs) -> dict:
+        return {lang: list(texts) for lang in target_langs}
+
+
+class StubTTS:
+    """Writes a tone lasting 60 ms per character instead of speech."""
+    
+    voice = "stub"
+    options = {}
+    cache = None
+    
+    def generate_speech(self, text: str, output_path: str) -> str:
+        t = np.arange(int(len(text) * 0.06 * OUTPUT_SAMPLE_RATE)) / OUTPUT_SAMPLE_RATE
+        sf.write(output_path, (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32), OUTPUT_SAMPLE_RATE)
+        return output_path
+    
+    async def generate_speech_async(self, text: str, output_path: str) -> str:
+        return self.generate_speech(text, output_path)
+    
+    def variant(self, **changes) -> "StubTTS":
+        return self
+
+
+def stub_pipeline(transcriber=None, translator=None, tts=None) -> VideoDubbingPipeline:
+    """
+    Build a VideoDubbingPipeline without loading any model.
+    
+    Args:
+        transcriber: Transcription service (StubTranscriber if None)
+        translator: Translation service (StubTranslator if None)
+        tts: TTS service (StubTTS if None)
+    
+    Returns:
+        Pipeline using the given or stub services
+    """
+    pipeline = VideoDubbingPipeline.__new__(VideoDubbingPipeline)
+    pipeline.transcriber = transcriber or StubTranscriber()
+    pipeline.translator = translator or StubTranslator()
+    pipeline.tts = tts or StubTTS()
+    pipeline.artifacts = None
+    pipeline.vad = False
+    pipeline.tts_voices = None
+    pipeline.keep_background = False
+    return pipeline
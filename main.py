@@ -7,6 +7,7 @@ Main entry point for the video dubbing pipeline.
 
 import argparse
 import os
+import sys
 
 from src import (
     extract_chunk,
@@ -16,14 +17,322 @@ from src import (
     generate_hindi_speech,
     match_audio_duration,
     merge_audio_video,
-    VideoDubbingPipeline
+    create_pipeline,
+    resolve_language,
+    Tracer
 )
 
 
-def main():
+def add_pipeline_arguments(parser: argparse.ArgumentParser):
+    """Add options that configure how the VideoDubbingPipeline is built."""
+    parser.add_argument(
+        "--translation-cache",
+        metavar="PATH",
+        help="SQLite file used to cache translated sentences across runs"
+    )
+    parser.add_argument(
+        "--tts-cache",
+        metavar="PATH",
+        help="SQLite file used to cache synthesized speech across runs"
+    )
+    parser.add_argument(
+        "--whisper-compute-type",
+        default="auto",
+        help="Whisper computation type, e.g. int8, float16, float32 (default: auto for the hardware)"
+    )
+    parser.add_argument(
+        "--translator-backend",
+        choices=["torch", "torch-int8", "ctranslate2"],
+        default="torch",
+        help="Translation backend: full-precision PyTorch, int8 dynamic quantization, "
+             "or a CTranslate2 int8 model from `main.py convert-translator` (default: torch)"
+    )
+    parser.add_argument(
+        "--voice",
+        action="append",
+        default=[],
+        metavar="LANG=VOICE",
+        help="TTS voice for a target language in multi-language runs, e.g. es=es-MX-DaliaNeural (repeatable)"
+    )
+    parser.add_argument(
+        "--tts-url",
+        metavar="URL",
+        help="Send speech synthesis to this HTTP service instead of Edge TTS "
+             "(e.g. the fake server from `python -m benchmarks.fake_tts --serve`)"
+    )
+    parser.add_argument(
+        "--local-tts",
+        action="store_true",
+        help="Synthesize offline with a local Coqui XTTS model that clones the original speaker's voice"
+    )
+    parser.add_argument(
+        "--tts-concurrency",
+        type=int,
+        default=8,
+        help="Speech synthesis requests in flight at once (default: 8)"
+    )
+    parser.add_argument(
+        "--tts-rate",
+        type=float,
+        metavar="PER_SECOND",
+        help="Limit speech synthesis requests per second (default: unlimited)"
+    )
+    parser.add_argument(
+        "--keep-background",
+        action="store_true",
+        help="Keep the original music and effects under the dubbed speech, ducked while it speaks"
+    )
+    parser.add_argument(
+        "--vad",
+        action="store_true",
+        help="Detect speech first: transcribe only speech regions and keep pauses and music silent"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Keep stage outputs on disk and skip stages that already ran"
+    )
+    parser.add_argument(
+        "--artifact-dir",
+        default=".supernan_artifacts",
+        metavar="DIR",
+        help="Directory for stage outputs used by --resume (default: .supernan_artifacts)"
+    )
+
+
+def parse_voices(values: list) -> dict:
+    """Parse repeated LANG=VOICE options into a mapping of NLLB codes to voices."""
+    voices = {}
+    for value in values:
+        lang, separator, voice = value.partition("=")
+        if not separator or not voice:
+            raise SystemExit(f"Invalid --voice value '{value}', expected LANG=VOICE")
+        voices[resolve_language(lang)] = voice
+    return voices or None
+
+
+def pipeline_options(args) -> dict:
+    """Collect parsed pipeline options as create_pipeline keyword arguments."""
+    return {
+        "translation_cache": args.translation_cache,
+        "tts_cache": args.tts_cache,
+        "translator_backend": args.translator_backend,
+        "whisper_compute_type": args.whisper_compute_type,
+        "vad": args.vad,
+        "keep_background": args.keep_background,
+        "tts_voices": parse_voices(args.voice),
+        "tts_url": args.tts_url,
+        "tts_concurrency": args.tts_concurrency,
+        "tts_rate": args.tts_rate,
+        "local_tts": args.local_tts,
+        "artifact_dir": args.artifact_dir if args.resume else None
+    }
+
+
+def serve_main(argv: list) -> int:
+    """Entry point for `main.py serve`: run the warm dubbing server."""
+    from src.server import serve
+    
+    parser = argparse.ArgumentParser(
+        prog="main.py serve",
+        description="SuperNan - Dubbing server with warm models and a job queue"
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Host to bind (default: 127.0.0.1)"
+    )
+    parser.add_argument(
+        "--port", "-p",
+        type=int,
+        default=8765,
+        help="Port to bind (default: 8765)"
+    )
+    parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        help="Serve on a Unix socket instead of TCP"
+    )
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=1,
+        help="Number of jobs dubbed concurrently (default: 1)"
+    )
+    parser.add_argument(
+        "--max-pending",
+        type=int,
+        default=100,
+        help="Maximum number of queued jobs (default: 100)"
+    )
+    add_pipeline_arguments(parser)
+    
+    args = parser.parse_args(argv)
+    
+    print("Loading models...")
+    serve(
+        host=args.host,
+        port=args.port,
+        socket_path=args.socket,
+        max_workers=args.workers,
+        max_pending=args.max_pending,
+        pipeline=create_pipeline(**pipeline_options(args))
+    )
+    return 0
+
+
+def batch_main(argv: list) -> int:
+    """Entry point for `main.py batch`: dub a directory or manifest of videos."""
+    from src.batch import load_jobs, run_batch
+    from src.models import available_cpus
+    
+    parser = argparse.ArgumentParser(
+        prog="main.py batch",
+        description="SuperNan - Dub a directory or CSV/JSONL manifest of videos"
+    )
+    parser.add_argument(
+        "source",
+        help="Directory of videos, or CSV/JSONL manifest with input, start, end, target_lang, output"
+    )
+    parser.add_argument(
+        "--output-dir", "-o",
+        default="dubbed",
+        help="Output directory for rows without an output (default: dubbed)"
+    )
+    parser.add_argument(
+        "--start", "-s",
+        default="00:00:15",
+        help="Default start time (default: 00:00:15)"
+    )
+    parser.add_argument(
+        "--end", "-e",
+        default="00:00:30",
+        help="Default end time (default: 00:00:30)"
+    )
+    parser.add_argument(
+        "--target-lang", "-t",
+        default="hi",
+        help="Default target language code (default: hi for Hindi)"
+    )
+    parser.add_argument(
+        "--mode", "-m",
+        choices=["clip", "segments", "streaming"],
+        default="clip",
+        help="Pipeline dubbing mode (default: clip)"
+    )
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=2,
+        help="Number of worker processes, 0 for one per CPU (default: 2)"
+    )
+    parser.add_argument(
+        "--share-models",
+        action="store_true",
+        help="Load the translation model once and share it with forked workers "
+             "instead of loading it in every worker (POSIX only)"
+    )
+    parser.add_argument(
+        "--job-file",
+        default="supernan_jobs.json",
+        help="Job status file used to resume the batch (default: supernan_jobs.json)"
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=2,
+        help="Retries per failed job (default: 2)"
+    )
+    add_pipeline_arguments(parser)
+    
+    args = parser.parse_args(argv)
+    
+    if not os.path.exists(args.source):
+        print(f"Error: Batch source '{args.source}' not found")
+        return 1
+    
+    try:
+        jobs = load_jobs(
+            args.source,
+            output_dir=args.output_dir,
+            defaults={
+                "start": args.start,
+                "end": args.end,
+                "target_lang": args.target_lang,
+                "mode": args.mode
+            }
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    counts = run_batch(
+        jobs,
+        job_file=args.job_file,
+        workers=args.workers or available_cpus(),
+        max_retries=args.max_retries,
+        pipeline_options=pipeline_options(args),
+        share_models=args.share_models
+    )
+    
+    print("\n=== Batch Complete ===")
+    for status, count in sorted(counts.items()):
+        print(f"{status}: {count}")
+    return 0 if counts.get("failed", 0) == 0 else 1
+
+
+def convert_translator_main(argv: list) -> int:
+    """Entry point for `main.py convert-translator`: one-time CTranslate2 conversion."""
+    from src.translator import convert_translator
+    
+    parser = argparse.ArgumentParser(
+        prog="main.py convert-translator",
+        description="SuperNan - Convert the translation model to CTranslate2 for --translator-backend ctranslate2"
+    )
+    parser.add_argument(
+        "--model",
+        default="facebook/nllb-200-distilled-600M",
+        help="Hugging Face model name or path (default: facebook/nllb-200-distilled-600M)"
+    )
+    parser.add_argument(
+        "--output",
+        help="Output directory (default: .supernan_models/<model>-ct2-<quantization>)"
+    )
+    parser.add_argument(
+        "--quantization",
+        default="int8",
+        choices=["int8", "int8_float32", "float16", "float32"],
+        help="Weight quantization (default: int8)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Overwrite an existing conversion"
+    )
+    
+    args = parser.parse_args(argv)
+    
+    print(f"Converting {args.model} ({args.quantization})...")
+    output_dir = convert_translator(args.model, args.output, quantization=args.quantization, force=args.force)
+    print(f"Converted model saved to: {output_dir}")
+    return 0
+
+
+def main(argv: list = None):
     """Main entry point."""
+    argv = sys.argv[1:] if argv is None else argv
+    
+    if argv and argv[0] == "serve":
+        return serve_main(argv[1:])
+    if argv and argv[0] == "batch":
+        return batch_main(argv[1:])
+    if argv and argv[0] == "convert-translator":
+        return convert_translator_main(argv[1:])
+    
     parser = argparse.ArgumentParser(
-        description="SuperNan - Video Dubbing & Lip Sync Pipeline"
+        description="SuperNan - Video Dubbing & Lip Sync Pipeline",
+        epilog="Run `main.py serve --help` for the dubbing server, "
+               "`main.py batch --help` to dub many videos and "
+               "`main.py convert-translator --help` to prepare the CTranslate2 backend."
     )
     parser.add_argument(
         "--input", "-i",
@@ -48,47 +357,111 @@ def main():
     parser.add_argument(
         "--target-lang", "-t",
         default="hi",
-        help="Target language code (default: hi for Hindi)"
+        help="Target language code, or a comma-separated list (e.g. hi,es,fr) to write one "
+             "audio track per language with --use-pipeline (default: hi for Hindi)"
     )
     parser.add_argument(
         "--use-pipeline",
         action="store_true",
         help="Use the complete pipeline (vs manual steps)"
     )
+    parser.add_argument(
+        "--mode", "-m",
+        choices=["clip", "segments", "streaming"],
+        default="clip",
+        help="Pipeline dubbing mode: whole clip, per Whisper segment, or per segment with stages overlapped (default: clip)"
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Dub the whole video: split it into chunks dubbed in parallel (ignores --start/--end)"
+    )
+    parser.add_argument(
+        "--chunk-seconds",
+        type=float,
+        default=60.0,
+        help="Target chunk length for --full (default: 60)"
+    )
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=2,
+        help="Worker processes for --full (default: 2)"
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="PATH",
+        help="With --use-pipeline, write per-stage timings as a Chrome/Perfetto trace JSON"
+    )
+    parser.add_argument(
+        "--metrics-csv",
+        metavar="PATH",
+        help="With --use-pipeline, write per-stage metrics as CSV"
+    )
+    add_pipeline_arguments(parser)
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Check if input file exists
     if not os.path.exists(args.input):
         print(f"Error: Input file '{args.input}' not found")
         return 1
     
-    if args.use_pipeline:
+    target_langs = [resolve_language(code.strip()) for code in args.target_lang.split(",")]
+    if len(target_langs) > 1 and not args.use_pipeline:
+        print("Error: several target languages require --use-pipeline")
+        return 1
+    if len(target_langs) > 1 and args.full:
+        print("Error: --full dubs one target language per run")
+        return 1
+    
+    if args.full:
+        from src.full_length import dub_full_video
+        
+        print("Running full-length dubbing...")
+        result = dub_full_video(
+            args.input,
+            args.output,
+            target_lang=target_langs[0],
+            mode=args.mode,
+            chunk_seconds=args.chunk_seconds,
+            workers=args.workers,
+            pipeline_options=pipeline_options(args)
+        )
+        print("\n=== Full-Length Dubbing Complete ===")
+        print(f"Output saved to: {result['output_video']}")
+        print(f"Detected language: {result['language']}")
+        print(f"Chunks: {len(result['chunks'])}")
+    elif args.use_pipeline:
         # Use the complete pipeline
         print("Running complete pipeline...")
-        pipeline = VideoDubbingPipeline()
+        pipeline = create_pipeline(**pipeline_options(args))
         
-        lang_map = {
-            "hi": "hin_Deva",
-            "en": "eng_Latn",
-            "es": "spa_Latn",
-            "fr": "fra_Latn",
-        }
-        target_lang = lang_map.get(args.target_lang, "hin_Deva")
+        target_lang = target_langs[0] if len(target_langs) == 1 else target_langs
+        tracer = Tracer()
         
         result = pipeline.run(
             args.input,
             args.output,
             args.start,
             args.end,
-            target_lang
+            target_lang,
+            mode=args.mode,
+            tracer=tracer
         )
         
+        if args.trace:
+            tracer.to_chrome_trace(args.trace)
+        if args.metrics_csv:
+            tracer.to_csv(args.metrics_csv)
+        
         if result["success"]:
             print("\n=== Pipeline Complete ===")
             print(f"Output saved to: {result['output_video']}")
             print(f"Original duration: {result['original_duration']:.2f}s")
             print(f"Final duration: {result['final_duration']:.2f}s")
+            for stage in result["metrics"]["stages"]:
+                print(f"  {stage['name']:<14} {stage['wall_seconds']:7.2f}s wall  {stage['cpu_seconds']:7.2f}s cpu")
         else:
             print("Pipeline failed!")
             return 1
@@ -128,7 +501,7 @@ def main():
         # Step 6: Match duration
         adjusted_path = os.path.join(temp_dir, "adjusted_hindi.wav")
         print("[6/7] Matching duration...")
-        match_audio_duration(audio_path, tts_path, adjusted_path)
+        match_audio_duration(audio_path, tts_path, adjusted_path, vad=args.vad)
         
         # Step 7: Merge
         print("[7/7] Creating final output...")
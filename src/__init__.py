@@ -6,36 +6,112 @@ videos from English to Hindi with realistic voice cloning and
 automatic lip synchronization.
 """
 
-from .video_processor import extract_chunk, extract_audio, merge_audio_video
-from .audio_processor import get_duration, adjust_duration, match_audio_duration
-from .transcriber import TranscriptionService, transcribe_auto
-from .translator import TranslationService, translate_to_hindi
-from .tts import TTSService, generate_hindi_speech
-from .pipeline import VideoDubbingPipeline, run_pipeline
+import importlib
 
 __version__ = "1.0.0"
 __author__ = "SuperNan Team"
 
-__all__ = [
+# Public names and the submodules defining them. Submodules are imported on
+# first attribute access, so importing the package (e.g. for the ffmpeg
+# helpers) does not load torch, transformers, faster_whisper or edge_tts.
+_EXPORTS = {
+    # FFmpeg
+    "FFmpegError": "ffmpeg",
+    "run_ffmpeg": "ffmpeg",
+    "run_ffprobe": "ffmpeg",
+    "decode_audio": "ffmpeg",
+    "probe": "ffmpeg",
+    "get_keyframes": "keyframes",
     # Video processing
-    "extract_chunk",
-    "extract_audio", 
-    "merge_audio_video",
+    "extract_chunk": "video_processor",
+    "extract_audio": "video_processor",
+    "load_audio": "video_processor",
+    "concat_files": "video_processor",
+    "parse_time": "video_processor",
+    "merge_audio_video": "video_processor",
+    "merge_audio_samples": "video_processor",
     # Audio processing
-    "get_duration",
-    "adjust_duration",
-    "match_audio_duration",
+    "get_duration": "audio_processor",
+    "adjust_duration": "audio_processor",
+    "match_audio_duration": "audio_processor",
+    "assemble_segments": "audio_processor",
+    "load_audio_file": "audio_processor",
+    "time_stretch": "audio_processor",
+    "stretch_regions": "audio_processor",
+    "place_segments": "audio_processor",
+    # Mixing
+    "mix_over_background": "mixer",
+    "duck_envelope": "mixer",
+    "speech_activity": "mixer",
     # Transcription
-    "TranscriptionService",
-    "transcribe_auto",
+    "TranscriptionService": "transcriber",
+    "transcribe_auto": "transcriber",
+    # Voice activity detection
+    "detect_speech": "vad",
+    "SpeechMap": "vad",
     # Translation
-    "TranslationService",
-    "translate_to_hindi",
+    "TranslationService": "translator",
+    "translate_to_hindi": "translator",
+    "split_sentences": "translator",
+    "resolve_language": "translator",
     # TTS
-    "TTSService",
-    "generate_hindi_speech",
+    "TTSService": "tts",
+    "generate_hindi_speech": "tts",
+    "TTSClient": "tts_client",
+    "TTSBackend": "tts_client",
+    "EdgeTTSBackend": "tts_client",
+    "HTTPTTSBackend": "tts_client",
+    "XTTSBackend": "tts_client",
+    "TokenBucket": "tts_client",
+    "TTSBackendError": "tts_client",
+    # Model registry
+    "ModelRegistry": "models",
+    "get_registry": "models",
+    "preload_models": "models",
+    "unload_models": "models",
+    "model_memory_report": "models",
+    # Caching
+    "SQLiteCache": "cache",
+    "TranslationCache": "cache",
+    "TTSCache": "cache",
+    "ArtifactStore": "artifacts",
+    "file_fingerprint": "artifacts",
+    # Instrumentation
+    "Tracer": "instrumentation",
+    "register_hook": "instrumentation",
+    "unregister_hook": "instrumentation",
     # Pipeline
-    "VideoDubbingPipeline",
-    "run_pipeline",
-]
+    "VideoDubbingPipeline": "pipeline",
+    "run_pipeline": "pipeline",
+    "create_pipeline": "pipeline",
+    "AsyncVideoDubbingPipeline": "async_pipeline",
+    "StageTimeoutError": "async_pipeline",
+    "run_pipeline_async": "async_pipeline",
+    # Full-length dubbing
+    "detect_silences": "full_length",
+    "plan_chunks": "full_length",
+    "dub_full_video": "full_length",
+    # Serving
+    "JobQueue": "jobs",
+    "QueueFullError": "jobs",
+    "DubbingService": "server",
+    "serve": "server",
+}
 
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    """Import the submodule defining a public name on first access."""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    """List public names alongside those already loaded."""
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,271 @@
+"""
+Artifact store module for SuperNan project.
+Keeps pipeline stage outputs on disk, keyed by their inputs, so reruns
+can skip stages that already ran.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+from .cache import make_key
+
+
+def file_fingerprint(path: str) -> list:
+    """
+    Identify a source file cheaply, without hashing its contents.
+    
+    Args:
+        path: Path to file
+    
+    Returns:
+        [absolute path, size, modification time in ns]
+    """
+    stat = os.stat(path)
+    return [os.path.abspath(path), stat.st_size, stat.st_mtime_ns]
+
+
+def file_digest(path: str) -> str:
+    """
+    Identify a file by its contents.
+    
+    Args:
+        path: Path to file
+    
+    Returns:
+        Hex SHA-1 digest of the file contents
+    """
+    digest = hashlib.sha1()
+    with open(path, "rb") as source:
+        for block in iter(lambda: source.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ArtifactStore:
+    """
+    Content-addressed store of stage outputs.
+    
+    Each entry is a directory named by a key hashed from the stage name,
+    the keys of its upstream stages and its parameters. Entries are evicted
+    when older than max_age_days, then least recently used first while the
+    store is larger than max_bytes.
+    """
+    
+    def __init__(
+        self,
+        root: str = ".supernan_artifacts",
+        max_bytes: int = 10 * 1024 ** 3,
+        max_age_days: float = 30.0
+    ):
+        """
+        Initialize the store.
+        
+        Args:
+            root: Directory holding the artifacts
+            max_bytes: Maximum total size of the store
+            max_age_days: Entries unused for longer are evicted
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(root, exist_ok=True)
+    
+    @staticmethod
+    def key(stage: str, *inputs, **params) -> str:
+        """
+        Build the key of a stage output.
+        
+        Args:
+            stage: Stage name
+            *inputs: Upstream keys or source fingerprints
+            **params: Parameters that affect the output
+        
+        Returns:
+            Artifact key
+        """
+        return make_key("artifact", stage, inputs, params)
+    
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key)
+    
+    def path(self, key: str, name: str) -> str:
+        """
+        Get the path an artifact is stored at.
+        
+        Args:
+            key: Artifact key
+            name: File name within the entry
+        
+        Returns:
+            Path inside the store
+        """
+        return os.path.join(self._entry_dir(key), name)
+    
+    def lookup(self, key: str, name: str) -> str:
+        """
+        Find a stored artifact, counting a hit or a miss.
+        
+        Args:
+            key: Artifact key
+            name: File name within the entry
+        
+        Returns:
+            Path of the stored file (marked as used), or None
+        """
+        path = self.path(key, name)
+        if os.path.exists(path):
+            self.hits += 1
+            os.utime(self._entry_dir(key))
+            return path
+        self.misses += 1
+        return None
+    
+    def fetch_file(self, key: str, name: str, produce) -> str:
+        """
+        Get a file artifact, producing it on a miss.
+        
+        Args:
+            key: Artifact key
+            name: File name within the entry
+            produce: Callable writing the artifact to the path it is given
+        
+        Returns:
+            Path of the stored file
+        """
+        path = self.lookup(key, name)
+        if path is not None:
+            return path
+        return self._store(key, name, produce)
+    
+    def put_file(self, key: str, name: str, source_path: str) -> str:
+        """
+        Store a copy of an existing file as an artifact.
+        
+        Used when the output was produced outside fetch_file (e.g. by a
+        coroutine); look it up first with lookup.
+        
+        Args:
+            key: Artifact key
+            name: File name within the entry
+            source_path: File to copy into the store
+        
+        Returns:
+            Path of the stored file
+        """
+        return self._store(key, name, lambda path: shutil.copyfile(source_path, path))
+    
+    def _store(self, key: str, name: str, produce) -> str:
+        """Produce an artifact in a private directory and move it into place."""
+        entry_dir = self._entry_dir(key)
+        tmp_dir = os.path.join(entry_dir, f".tmp-{os.getpid()}-{time.monotonic_ns()}")
+        os.makedirs(tmp_dir)
+        try:
+            tmp_path = os.path.join(tmp_dir, name)
+            produce(tmp_path)
+            os.replace(tmp_path, self.path(key, name))
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        return self.path(key, name)
+    
+    def fetch_json(self, key: str, name: str, compute):
+        """
+        Get a JSON artifact, computing it on a miss.
+        
+        Args:
+            key: Artifact key
+            name: File name within the entry
+            compute: Callable returning a JSON-serializable value
+        
+        Returns:
+            The stored value
+        """
+        value = []
+        
+        def produce(path):
+            value.append(compute())
+            with open(path, "w") as output:
+                json.dump(value[0], output, ensure_ascii=False)
+        
+        path = self.fetch_file(key, name, produce)
+        if value:
+            return value[0]
+        with open(path) as stored:
+            return json.load(stored)
+    
+    def fetch_array(self, key: str, name: str, compute) -> np.ndarray:
+        """
+        Get a NumPy array artifact, computing it on a miss.
+        
+        Args:
+            key: Artifact key
+            name: File name within the entry (".npy")
+            compute: Callable returning the array
+        
+        Returns:
+            The stored array
+        """
+        value = []
+        
+        def produce(path):
+            value.append(compute())
+            with open(path, "wb") as output:
+                np.save(output, value[0])
+        
+        path = self.fetch_file(key, name, produce)
+        return value[0] if value else np.load(path)
+    
+    def evict(self) -> int:
+        """
+        Remove entries past the age limit, then least recently used entries
+        until the store fits in max_bytes.
+        
+        Returns:
+            Number of entries removed
+        """
+        entries = []
+        for prefix in os.listdir(self.root):
+            prefix_dir = os.path.join(self.root, prefix)
+            if not os.path.isdir(prefix_dir):
+                continue
+            for key in os.listdir(prefix_dir):
+                entry_dir = os.path.join(prefix_dir, key)
+                try:
+                    size = sum(
+                        os.path.getsize(os.path.join(directory, name))
+                        for directory, _, names in os.walk(entry_dir)
+                        for name in names
+                    )
+                    entries.append((os.path.getmtime(entry_dir), size, entry_dir))
+                except OSError:
+                    # Removed concurrently by another process
+                    continue
+        
+        entries.sort()
+        cutoff = time.time() - self.max_age_days * 86400
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        
+        for last_used, size, entry_dir in entries:
+            if last_used >= cutoff and total <= self.max_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+            removed += 1
+        
+        return removed
+    
+    def stats(self) -> dict:
+        """
+        Get hit and miss counters of this instance.
+        
+        Returns:
+            Dictionary with hits and misses
+        """
+        return {"hits": self.hits, "misses": self.misses}
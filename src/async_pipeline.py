@@ -0,0 +1,412 @@
+"""
+Asynchronous pipeline module for SuperNan project.
+Runs the dubbing workflow on an asyncio event loop.
+"""
+
+import asyncio
+import functools
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .video_processor import extract_chunk, load_audio
+from .audio_processor import OUTPUT_SAMPLE_RATE, load_audio_file, place_segments
+from .ffmpeg import WHISPER_SAMPLE_RATE
+from .artifacts import ArtifactStore, file_fingerprint
+from .instrumentation import Tracer
+from .pipeline import VideoDubbingPipeline
+from .tts import TTSService
+from .vad import SpeechMap, detect_speech
+
+
+class StageTimeoutError(TimeoutError):
+    """Raised when a pipeline stage exceeds its timeout."""
+    
+    def __init__(self, stage: str, timeout: float):
+        super().__init__(f"Stage '{stage}' timed out after {timeout}s")
+        self.stage = stage
+        self.timeout = timeout
+
+
+class AsyncVideoDubbingPipeline:
+    """
+    Video dubbing pipeline with an asyncio API.
+    
+    CPU-bound work (ffmpeg, Whisper, NLLB, time stretching) runs on a thread
+    pool so the event loop stays responsive, while speech synthesis runs
+    natively on the loop with up to tts_concurrency requests in flight.
+    Stages can have timeouts, and cancelling the task running a stage
+    stops the run (work already handed to the thread pool finishes in the
+    background and its result is discarded).
+    
+    The models, caches, artifact store and voice activity setting come
+    from a wrapped VideoDubbingPipeline, so a warm synchronous pipeline can
+    be shared, and every stage output, including the per-mode speech and
+    adjusted-track keys, is stored under the same artifact key as in the
+    synchronous pipeline, so either pipeline reuses the other's results.
+    Supports the "clip" and "segments" modes with one target language.
+    """
+    
+    def __init__(
+        self,
+        pipeline: VideoDubbingPipeline = None,
+        max_workers: int = 4,
+        tts_concurrency: int = 8,
+        timeouts: dict = None
+    ):
+        """
+        Initialize the pipeline.
+        
+        Args:
+            pipeline: Synchronous pipeline providing the services (a default
+                one is built if None)
+            max_workers: Threads for CPU-bound stages, shared by all runs
+            tts_concurrency: Speech synthesis requests in flight per run
+            timeouts: Mapping of stage name ("extract_chunk", "decode_audio",
+                "vad", "transcribe", "translate", "synthesize", "merge") to
+                a timeout in seconds
+        """
+        self.pipeline = pipeline or VideoDubbingPipeline()
+        self.executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+        self.tts_concurrency = max(1, tts_concurrency)
+        self.timeouts = dict(timeouts or {})
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        client = getattr(self.pipeline.tts, "client", None)
+        if client is not None:
+            await client.close()
+        self.close()
+    
+    def close(self):
+        """Shut down the thread pool, waiting for running work."""
+        self.executor.shutdown(wait=True)
+    
+    async def _call(self, function, *args, **kwargs):
+        """Run a blocking function on the thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(function, *args, **kwargs))
+    
+    async def _stage(self, name: str, tracer: Tracer, awaitable, **attributes):
+        """
+        Await one stage under its timeout, recording it on the tracer.
+        
+        Raises:
+            StageTimeoutError: If the stage exceeds its timeout
+        """
+        timeout = self.timeouts.get(name)
+        with tracer.stage(name, **attributes):
+            try:
+                return await asyncio.wait_for(awaitable, timeout)
+            except asyncio.TimeoutError:
+                if timeout is None:
+                    raise
+                raise StageTimeoutError(name, timeout) from None
+    
+    async def extract_chunk(self, input_video: str, start_time: str, end_time: str, temp_dir: str, tracer: Tracer) -> tuple:
+        """
+        Cut the chunk out of the input video.
+        
+        Returns:
+            Tuple of (chunk path, chunk artifact key)
+        """
+        key = ArtifactStore.key("chunk", file_fingerprint(input_video), start=start_time, end=end_time)
+        path = await self._stage("extract_chunk", tracer, self._call(
+            self.pipeline._stage_file, key, "chunk.mp4", temp_dir,
+            lambda output: extract_chunk(input_video, output, start_time, end_time)
+        ))
+        return path, key
+    
+    async def decode_audio(self, chunk_path: str, chunk_key: str, tracer: Tracer) -> tuple:
+        """
+        Decode the chunk audio into memory.
+        
+        Returns:
+            Tuple of (16 kHz mono samples, audio artifact key)
+        """
+        key = ArtifactStore.key("audio", chunk_key, sample_rate=WHISPER_SAMPLE_RATE)
+        audio = await self._stage("decode_audio", tracer, self._call(
+            self.pipeline._stage_array, key, "audio.npy", lambda: load_audio(chunk_path)
+        ))
+        return audio, key
+    
+    async def detect_speech(self, audio, audio_key: str, tracer: Tracer) -> SpeechMap:
+        """Find the speech regions of the chunk audio."""
+        regions = await self._stage("vad", tracer, self._call(
+            self.pipeline._stage_json, ArtifactStore.key("speech_regions", audio_key),
+            "speech_regions.json", lambda: detect_speech(audio)
+        ))
+        return SpeechMap(regions)
+    
+    async def transcribe(
+        self,
+        audio,
+        audio_key: str,
+        source_language: str,
+        tracer: Tracer,
+        speech_map: SpeechMap = None
+    ) -> tuple:
+        """
+        Transcribe the chunk audio to English.
+        
+        Returns:
+            Tuple of (transcription dict, transcript artifact key)
+        """
+        key = self.pipeline._transcript_key(audio_key, source_language, speech_map)
+        transcription = await self._stage("transcribe", tracer, self._call(
+            self.pipeline._stage_json, key, "transcript.json",
+            lambda: self.pipeline._transcribe(audio, source_language, speech_map)
+        ))
+        return transcription, key
+    
+    async def translate(self, text: str, translation_key: str, target_lang: str, tracer: Tracer) -> str:
+        """Translate the whole transcript."""
+        translator = self.pipeline.translator
+        return await self._stage("translate", tracer, self._call(
+            self.pipeline._stage_json, translation_key, "translation.json",
+            lambda: translator.translate(text, target_lang=target_lang)
+        ))
+    
+    async def translate_segments(self, texts: list, translation_key: str, target_lang: str, tracer: Tracer) -> list:
+        """
+        Translate segment texts in batches.
+        
+        Returns:
+            Translated texts, in input order
+        """
+        translator = self.pipeline.translator
+        return await self._stage("translate", tracer, self._call(
+            self.pipeline._stage_json, translation_key, "translations.json",
+            lambda: translator.translate_batch(texts, target_lang=target_lang)
+        ), segments=len(texts))
+    
+    async def _speech_file(self, tts: TTSService, text: str, key: str, name: str, temp_dir: str, slots: asyncio.Semaphore) -> str:
+        """Synthesize one text to a file, reusing the artifact store if enabled."""
+        store = self.pipeline.artifacts
+        if store is not None:
+            stored = store.lookup(key, name)
+            if stored is not None:
+                return stored
+        
+        path = os.path.join(temp_dir, name)
+        async with slots:
+            await tts.generate_speech_async(text, path)
+        return store.put_file(key, name, path) if store is not None else path
+    
+    async def synthesize(
+        self,
+        segments: list,
+        translation_key: str,
+        temp_dir: str,
+        total_duration: float,
+        tracer: Tracer,
+        speech_map: SpeechMap = None,
+        tts: TTSService = None,
+        mode: str = "segments"
+    ):
+        """
+        Synthesize every segment concurrently and place it in its time slot.
+        
+        Args:
+            segments: Dicts with "start", "end" and "translated_text"
+            translation_key: Artifact key of the translations
+            temp_dir: Working directory for intermediate files
+            total_duration: Length of the dubbed track in seconds
+            tracer: Tracer recording per-stage measurements
+            speech_map: Speech regions to fit the dubbed speech into
+            tts: TTS service to use (the pipeline's own if None)
+            mode: "clip" for a single segment spanning the chunk, or
+                "segments"; selects the artifact keys the synchronous
+                pipeline uses for that mode
+        
+        Returns:
+            Dubbed track as mono samples at OUTPUT_SAMPLE_RATE
+        """
+        if tts is None:
+            tts = self.pipeline.tts
+        tts_options = {"voice": tts.voice, **tts.options}
+        speech_regions = speech_map.regions if speech_map is not None else None
+        if mode == "clip":
+            speech_keys = [(ArtifactStore.key("tts", translation_key, **tts_options), "generated_speech.wav")]
+            adjusted_key = ArtifactStore.key(
+                "adjusted", speech_keys[0][0], duration=total_duration, speech_regions=speech_regions
+            )
+        else:
+            speech_keys = [
+                (ArtifactStore.key("segment_tts", translation_key, index=index, **tts_options), f"segment_{index:04d}_speech.wav")
+                for index in range(len(segments))
+            ]
+            adjusted_key = ArtifactStore.key(
+                "segment_adjusted", translation_key, duration=total_duration,
+                speech_regions=speech_regions, **tts_options
+            )
+        
+        # A stored adjusted track skips synthesis entirely
+        store = self.pipeline.artifacts
+        if store is not None:
+            stored = store.lookup(adjusted_key, "adjusted_speech.npy")
+            if stored is not None:
+                return await self._call(np.load, stored)
+        
+        slots = asyncio.Semaphore(self.tts_concurrency)
+        
+        async def dub_segment(segment: dict, key: str, name: str) -> dict:
+            path = await self._speech_file(tts, segment["translated_text"], key, name, temp_dir, slots)
+            samples = await self._call(
+                lambda: self.pipeline._fit(load_audio_file(path), segment["start"], segment["end"], speech_map)
+            )
+            return {"start": segment["start"], "samples": samples}
+        
+        async def dub_all():
+            placed = await asyncio.gather(*(
+                dub_segment(segment, key, name) for segment, (key, name) in zip(segments, speech_keys)
+            ))
+            return place_segments(placed, total_duration)
+        
+        speech = await self._stage("synthesize", tracer, dub_all(), segments=len(segments))
+        return await self._call(self.pipeline._stage_array, adjusted_key, "adjusted_speech.npy", lambda: speech)
+    
+    async def merge(self, chunk_path: str, speech, output_video: str, tracer: Tracer):
+        """Mix the dubbed track and mux it with the chunk video."""
+        await self._stage("merge", tracer, self._call(
+            self.pipeline._merge, chunk_path, {"dubbed": speech}, output_video
+        ))
+    
+    async def run(
+        self,
+        input_video: str,
+        output_video: str,
+        start_time: str = "00:00:15",
+        end_time: str = "00:00:30",
+        target_lang: str = "hin_Deva",
+        mode: str = "clip",
+        source_language: str = None,
+        tracer: Tracer = None
+    ) -> dict:
+        """
+        Run the complete dubbing pipeline.
+        
+        Args:
+            input_video: Path to input video
+            output_video: Path to save dubbed video
+            start_time: Start time for chunk extraction
+            end_time: End time for chunk extraction
+            target_lang: Target language code
+            mode: "clip" to dub the chunk as one block, "segments" to dub
+                each Whisper segment separately at its original offset
+            source_language: Spoken language of the input (detected if None)
+            tracer: Tracer recording per-stage measurements (a new one is
+                created if None); its summary is returned under "metrics"
+        
+        Returns:
+            Dictionary with pipeline results and metadata, as returned by
+            VideoDubbingPipeline.run
+        
+        Raises:
+            StageTimeoutError: If a stage exceeds its timeout
+        """
+        if mode not in ("clip", "segments"):
+            raise ValueError(f"Unsupported async pipeline mode: {mode}")
+        
+        pipeline = self.pipeline
+        if tracer is None:
+            tracer = Tracer()
+        tracer.caches.update({
+            name: cache for name, cache in (
+                ("translation", pipeline.translator.cache),
+                ("tts", pipeline.tts.cache),
+                ("artifacts", pipeline.artifacts)
+            ) if cache is not None
+        })
+        
+        temp_dir = tempfile.mkdtemp()
+        
+        try:
+            chunk_path, chunk_key = await self.extract_chunk(input_video, start_time, end_time, temp_dir, tracer)
+            audio, audio_key = await self.decode_audio(chunk_path, chunk_key, tracer)
+            original_duration = len(audio) / WHISPER_SAMPLE_RATE
+            tracer.clip_duration = original_duration
+            
+            speech_map = None
+            if pipeline.vad:
+                speech_map = await self.detect_speech(audio, audio_key, tracer)
+            
+            if speech_map is not None and not speech_map.regions:
+                transcription = {"language": source_language, "text": "", "segments": []}
+                dubbed = []
+                speech = place_segments([], original_duration)
+            else:
+                transcription, transcript_key = await self.transcribe(
+                    audio, audio_key, source_language, tracer, speech_map
+                )
+                translation_key = ArtifactStore.key(
+                    "translation" if mode == "clip" else "segment_translations", transcript_key,
+                    model=pipeline.translator.model_name,
+                    backend=pipeline.translator.backend, target_lang=target_lang
+                )
+                if mode == "clip":
+                    segments = [{"start": 0.0, "end": original_duration, "text": transcription["text"]}]
+                    translations = [await self.translate(transcription["text"], translation_key, target_lang, tracer)]
+                else:
+                    segments = [segment for segment in transcription["segments"] if segment["text"]]
+                    translations = await self.translate_segments(
+                        [segment["text"] for segment in segments], translation_key, target_lang, tracer
+                    )
+                dubbed = [
+                    {**segment, "translated_text": translated}
+                    for segment, translated in zip(segments, translations)
+                ]
+                speaker = await self._call(pipeline._speaker_reference, audio, temp_dir, speech_map)
+                speech = await self.synthesize(
+                    dubbed, translation_key, temp_dir, original_duration, tracer, speech_map,
+                    pipeline._tts_for(target_lang, pipeline.tts.voice, speaker), mode
+                )
+            
+            await self.merge(chunk_path, speech, output_video, tracer)
+            
+            return {
+                "success": True,
+                "input_video": input_video,
+                "output_video": output_video,
+                "language": transcription["language"],
+                "transcript": transcription["text"] if mode == "clip" else " ".join(segment["text"] for segment in dubbed),
+                "translated_text": " ".join(segment["translated_text"] for segment in dubbed),
+                "segments": None if mode == "clip" else dubbed,
+                "original_duration": original_duration,
+                "final_duration": len(speech) / OUTPUT_SAMPLE_RATE,
+                "metrics": tracer.metrics()
+            }
+        
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            if pipeline.artifacts is not None:
+                pipeline.artifacts.evict()
+
+
+async def run_pipeline_async(
+    input_video: str,
+    output_video: str,
+    start_time: str = "00:00:15",
+    end_time: str = "00:00:30",
+    mode: str = "clip"
+) -> dict:
+    """
+    Convenience coroutine to run the complete dubbing pipeline.
+    
+    Args:
+        input_video: Path to input video
+        output_video: Path to save dubbed video
+        start_time: Start time for chunk
+        end_time: End time for chunk
+        mode: "clip" or "segments" (see AsyncVideoDubbingPipeline.run)
+    
+    Returns:
+        Pipeline results
+    """
+    async with AsyncVideoDubbingPipeline() as pipeline:
+        return await pipeline.run(input_video, output_video, start_time, end_time, mode=mode)
@@ -3,24 +3,102 @@ Audio processing utilities for SuperNan project.
 Handles duration adjustment and audio manipulation.
 """
 
-import os
-import librosa
+import numpy as np
+import soundfile as sf
+
+from .ffmpeg import decode_audio, probe
+
+
+# Sample rate of synthesized speech and of the dubbed audio track
+OUTPUT_SAMPLE_RATE = 24000
 
 
 def get_duration(audio_path: str) -> float:
     """
     Get duration of an audio file.
     
+    The duration is read from the file header (soundfile for WAV/FLAC/OGG,
+    ffprobe otherwise) without decoding the audio.
+    
     Args:
         audio_path: Path to audio file
-        
+    
     Returns:
         Duration in seconds
     """
-    return librosa.get_duration(path=audio_path)
+    try:
+        return sf.info(audio_path).duration
+    except RuntimeError:
+        return float(probe(audio_path)["format"]["duration"])
+
+
+def load_audio_file(audio_path: str, sample_rate: int = OUTPUT_SAMPLE_RATE) -> np.ndarray:
+    """
+    Decode an audio file into memory.
+    
+    Args:
+        audio_path: Path to audio file (any format ffmpeg reads)
+        sample_rate: Output sample rate
+    
+    Returns:
+        Mono float32 samples
+    """
+    return decode_audio(audio_path, sample_rate=sample_rate)
 
 
-def adjust_duration(input_audio: str, output_audio: str, target_duration: float):
+def time_stretch(samples: np.ndarray, target_length: int) -> np.ndarray:
+    """
+    Stretch audio to an exact number of samples without changing pitch.
+    
+    Any stretch factor is supported; the phase-vocoder output is trimmed
+    or zero-padded to exactly target_length samples.
+    
+    Args:
+        samples: Mono float32 samples
+        target_length: Length of the output in samples
+    
+    Returns:
+        Stretched mono float32 samples
+    """
+    if target_length <= 0:
+        return np.zeros(0, dtype=np.float32)
+    if len(samples) == 0:
+        return np.zeros(target_length, dtype=np.float32)
+    
+    rate = len(samples) / target_length
+    if abs(rate - 1.0) > 1e-3:
+        import librosa
+        samples = librosa.effects.time_stretch(samples, rate=rate)
+    
+    stretched = np.zeros(target_length, dtype=np.float32)
+    length = min(target_length, len(samples))
+    stretched[:length] = samples[:length]
+    return stretched
+
+
+def stretch_regions(samples: np.ndarray, sample_rate: int, regions: list, total_duration: float) -> np.ndarray:
+    """
+    Stretch regions of audio independently onto a new timeline.
+    
+    Args:
+        samples: Mono float32 source samples
+        sample_rate: Sample rate of the source and output
+        regions: List of dicts with "source_start"/"source_end" (region of
+            samples, seconds) and "start"/"end" (where it goes, seconds)
+        total_duration: Length of the output timeline in seconds
+    
+    Returns:
+        Mono float32 timeline with every region stretched into its slot
+    """
+    segments = []
+    for region in regions:
+        source = samples[int(round(region["source_start"] * sample_rate)):int(round(region["source_end"] * sample_rate))]
+        target_length = int(round((region["end"] - region["start"]) * sample_rate))
+        segments.append({"start": region["start"], "samples": time_stretch(source, target_length)})
+    return place_segments(segments, total_duration, sample_rate)
+
+
+def adjust_duration(input_audio: str, output_audio: str, target_duration: float) -> float:
     """
     Adjust audio duration to match target duration using tempo change.
     
@@ -28,21 +106,23 @@ def adjust_duration(input_audio: str, output_audio: str, target_duration: float)
         input_audio: Path to input audio
         output_audio: Path to save adjusted audio
         target_duration: Target duration in seconds
+    
+    Returns:
+        Duration of the adjusted audio in seconds
     """
-    current_duration = librosa.get_duration(path=input_audio)
+    samples = load_audio_file(input_audio)
     
-    if current_duration <= 0:
+    if len(samples) == 0:
         raise ValueError("Invalid audio duration")
+    if target_duration <= 0:
+        raise ValueError("Invalid target duration")
     
-    speed_factor = target_duration / current_duration
-    
-    # Clamp speed factor to valid range for atempo
-    speed_factor = max(0.5, min(2.0, speed_factor))
-    
-    os.system(f"ffmpeg -y -i {input_audio} -filter:a 'atempo={speed_factor}' {output_audio}")
+    stretched = time_stretch(samples, int(round(target_duration * OUTPUT_SAMPLE_RATE)))
+    sf.write(output_audio, stretched, OUTPUT_SAMPLE_RATE)
+    return len(stretched) / OUTPUT_SAMPLE_RATE
 
 
-def match_audio_duration(orig_audio: str, new_audio: str, output_audio: str):
+def match_audio_duration(orig_audio: str, new_audio: str, output_audio: str, vad: bool = False) -> float:
     """
     Match new audio duration to original audio duration.
     
@@ -50,11 +130,66 @@ def match_audio_duration(orig_audio: str, new_audio: str, output_audio: str):
         orig_audio: Path to original audio file
         new_audio: Path to new audio file
         output_audio: Path to save duration-matched audio
+        vad: Stretch the new audio into the speech regions of the original
+            only, leaving its pauses silent, instead of over the whole length
+    
+    Returns:
+        Duration of the matched audio in seconds
+    """
+    if not vad:
+        return adjust_duration(new_audio, output_audio, get_duration(orig_audio))
+    
+    from .ffmpeg import WHISPER_SAMPLE_RATE
+    from .vad import SpeechMap, detect_speech
+    
+    original = load_audio_file(orig_audio, WHISPER_SAMPLE_RATE)
+    duration = len(original) / WHISPER_SAMPLE_RATE
+    fitted = SpeechMap(detect_speech(original)).fit(load_audio_file(new_audio), 0.0, duration)
+    sf.write(output_audio, fitted, OUTPUT_SAMPLE_RATE)
+    return len(fitted) / OUTPUT_SAMPLE_RATE
+
+
+def place_segments(segments: list, total_duration: float, sample_rate: int = OUTPUT_SAMPLE_RATE) -> np.ndarray:
     """
-    orig_duration = get_duration(orig_audio)
-    new_duration = get_duration(new_audio)
+    Place audio clips at their offsets on a silent timeline in memory.
     
-    speed_factor = new_duration / orig_duration
+    Args:
+        segments: List of dicts with "start" (seconds) and "samples"
+            (mono float32 at sample_rate)
+        total_duration: Length of the output timeline in seconds
+        sample_rate: Sample rate of the clips and timeline
+    
+    Returns:
+        Mono float32 timeline
+    """
+    total_samples = int(round(total_duration * sample_rate))
+    timeline = np.zeros(total_samples, dtype=np.float32)
     
-    os.system(f"ffmpeg -y -i {new_audio} -filter:a 'atempo={speed_factor}' {output_audio}")
+    for segment in segments:
+        offset = int(round(segment["start"] * sample_rate))
+        if offset >= total_samples:
+            continue
+        clip = segment["samples"][:total_samples - offset]
+        timeline[offset:offset + len(clip)] += clip
+    
+    np.clip(timeline, -1.0, 1.0, out=timeline)
+    return timeline
+
 
+def assemble_segments(segments: list, output_audio: str, total_duration: float, sample_rate: int = OUTPUT_SAMPLE_RATE):
+    """
+    Place audio clips at their offsets on a silent timeline.
+    
+    Args:
+        segments: List of dicts with "start" (seconds) and either
+            "samples" (mono float32 at sample_rate) or "audio_path"
+        output_audio: Path to save the assembled audio
+        total_duration: Length of the output timeline in seconds
+        sample_rate: Sample rate of the output audio
+    """
+    loaded = [
+        segment if "samples" in segment
+        else {"start": segment["start"], "samples": load_audio_file(segment["audio_path"], sample_rate)}
+        for segment in segments
+    ]
+    sf.write(output_audio, place_segments(loaded, total_duration, sample_rate), sample_rate)
@@ -0,0 +1,415 @@
+"""
+Batch dubbing module for SuperNan project.
+Dubs a directory or manifest of videos on a pool of worker processes.
+"""
+
+import csv
+import gc
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from .memory import process_memory
+from .models import available_cpus
+from .translator import LANGUAGE_ALIASES, SUPPORTED_LANGUAGES, resolve_language
+
+
+VIDEO_EXTENSIONS = (".mp4", ".mkv", ".mov", ".avi", ".webm", ".m4v")
+
+DEFAULT_JOB = {
+    "start": "00:00:15",
+    "end": "00:00:30",
+    "target_lang": "hin_Deva",
+    "mode": "clip"
+}
+
+
+def load_jobs(source: str, output_dir: str = "dubbed", defaults: dict = None) -> list:
+    """
+    Build the job list for a batch.
+    
+    Args:
+        source: Directory of videos, or a CSV / JSONL manifest with
+            input, start, end, target_lang and output columns
+        output_dir: Output directory for directory sources and manifest rows
+            without an output
+        defaults: Values for fields missing from a row (see DEFAULT_JOB)
+    
+    Returns:
+        List of job dicts, each with a stable "id"
+    
+    Raises:
+        ValueError: If the source is unsupported or a row has no input or
+            an unknown target language
+    """
+    defaults = {**DEFAULT_JOB, **(defaults or {})}
+    
+    if os.path.isdir(source):
+        rows = [
+            {"input": os.path.join(source, name)}
+            for name in sorted(os.listdir(source))
+            if name.lower().endswith(VIDEO_EXTENSIONS)
+        ]
+    elif source.endswith(".csv"):
+        with open(source, newline="") as manifest:
+            rows = list(csv.DictReader(manifest))
+    elif source.endswith((".jsonl", ".ndjson")):
+        with open(source) as manifest:
+            rows = [json.loads(line) for line in manifest if line.strip()]
+    else:
+        raise ValueError(f"Unsupported batch source: {source}")
+    
+    jobs = []
+    for row in rows:
+        row = {key: value for key, value in row.items() if value not in (None, "")}
+        if "input" not in row:
+            raise ValueError(f"Manifest row without input: {row}")
+        
+        job = {**defaults, **row}
+        if job["target_lang"] not in SUPPORTED_LANGUAGES and job["target_lang"] not in LANGUAGE_ALIASES:
+            raise ValueError(f"Unsupported target language '{job['target_lang']}' in manifest row: {row}")
+        job["target_lang"] = resolve_language(job["target_lang"])
+        if "output" not in job:
+            stem = os.path.splitext(os.path.basename(job["input"]))[0]
+            job["output"] = os.path.join(output_dir, f"{stem}_{job['target_lang']}.mp4")
+        
+        job["id"] = job_id(job)
+        jobs.append(job)
+    
+    return jobs
+
+
+def job_id(job: dict) -> str:
+    """
+    Get a stable identifier for a job, used to match it across resumed runs.
+    
+    Args:
+        job: Job dict
+    
+    Returns:
+        Short hex digest of the job parameters
+    """
+    fields = [job.get(key) for key in ("input", "start", "end", "target_lang", "mode", "output")]
+    return hashlib.sha1(json.dumps(fields).encode("utf-8")).hexdigest()[:12]
+
+
+class JobFile:
+    """
+    Per-job status of a batch, persisted as JSON after every change.
+    
+    Only the parent process writes the file, so no locking is needed.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Load or create the job file.
+        
+        Args:
+            path: Path to the JSON job file
+        """
+        self.path = path
+        self.jobs = {}
+        if os.path.exists(path):
+            with open(path) as job_file:
+                self.jobs = json.load(job_file)["jobs"]
+    
+    def sync(self, jobs: list) -> list:
+        """
+        Register jobs and get those still to run.
+        
+        Jobs already marked done are skipped; failed jobs get a fresh set of
+        retries.
+        
+        Args:
+            jobs: Job dicts from load_jobs
+        
+        Returns:
+            Jobs that are not done yet
+        """
+        pending = []
+        for job in jobs:
+            record = self.jobs.get(job["id"])
+            if record is not None and record["status"] == "done":
+                continue
+            self.jobs[job["id"]] = {
+                "params": job,
+                "status": "pending",
+                "attempts": 0,
+                "error": None,
+                "result": None,
+                "updated_at": time.time()
+            }
+            pending.append(job)
+        self.save()
+        return pending
+    
+    def update(self, job_id: str, **fields):
+        """
+        Update a job record and persist the file.
+        
+        Args:
+            job_id: Job identifier
+            **fields: Record fields to set
+        """
+        self.jobs[job_id].update(fields, updated_at=time.time())
+        self.save()
+    
+    def save(self):
+        """Write the file atomically."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as job_file:
+            json.dump({"jobs": self.jobs}, job_file, indent=2, default=str)
+        os.replace(tmp_path, self.path)
+    
+    def counts(self) -> dict:
+        """
+        Count jobs by status.
+        
+        Returns:
+            Dictionary mapping status to number of jobs
+        """
+        counts = {}
+        for record in self.jobs.values():
+            counts[record["status"]] = counts.get(record["status"], 0) + 1
+        return counts
+
+
+# Pipeline owned by the current worker process
+_worker_pipeline = None
+
+
+def worker_pipeline_options(pipeline_options: dict, workers: int) -> dict:
+    """
+    Divide the CPU cores between worker processes.
+    
+    Without this every worker would start one inference thread per core,
+    oversubscribing the CPU workers times over.
+    
+    Args:
+        pipeline_options: Keyword arguments for create_pipeline
+        workers: Number of worker processes
+    
+    Returns:
+        Options with whisper_cpu_threads set to this worker's share of the
+        cores, unless already given
+    """
+    return {"whisper_cpu_threads": max(1, available_cpus() // max(1, workers)), **(pipeline_options or {})}
+
+
+def init_worker(pipeline_options: dict):
+    """
+    Load this worker process's pipeline.
+    
+    Used as the initializer of worker pools (run_batch, dub_full_video);
+    run_job then dubs jobs on the pipeline loaded here.
+    
+    Args:
+        pipeline_options: Keyword arguments for create_pipeline, usually
+            from worker_pipeline_options
+    """
+    global _worker_pipeline
+    from .pipeline import create_pipeline
+    
+    threads = pipeline_options.get("whisper_cpu_threads", 0)
+    if threads > 0:
+        # PyTorch (translation) gets the same share of the cores as Whisper
+        import torch
+        torch.set_num_threads(threads)
+    _worker_pipeline = create_pipeline(**pipeline_options)
+
+
+def preload_shared_models(pipeline_options: dict) -> list:
+    """
+    Load the models that forked workers can share into this process.
+    
+    Worker pipelines get their models from the registry inherited through
+    fork, so models loaded here stay in pages shared copy-on-write with
+    every worker instead of being loaded once per worker. The collector is
+    frozen afterwards so garbage collection in the workers does not write
+    to (and so copy) the shared objects; call gc.unfreeze() once the
+    workers have been forked (run_batch does).
+    
+    Only PyTorch models can be shared this way: CTranslate2 models (Whisper
+    and the ctranslate2 translation backend) run on native threads that a
+    forked child does not inherit, so workers still load those themselves.
+    
+    Args:
+        pipeline_options: Keyword arguments for create_pipeline
+    
+    Returns:
+        List of (kind, model name) of the shared models
+    """
+    from .models import get_registry
+    
+    shared = []
+    backend = pipeline_options.get("translator_backend", "torch")
+    if backend in ("torch", "torch-int8"):
+        model_name = pipeline_options.get("translator_model", "facebook/nllb-200-distilled-600M")
+        compute_type = "int8" if backend == "torch-int8" else "float32"
+        get_registry().get_translator(model_name, compute_type=compute_type)
+        shared.append(("translator", model_name))
+    
+    gc.collect()
+    gc.freeze()
+    return shared
+
+
+def run_job(job: dict) -> tuple:
+    """
+    Dub one job on this worker's pipeline (see init_worker).
+    
+    Errors are returned rather than raised, so one failed job does not
+    stop the pool.
+    
+    Args:
+        job: Job dict with id, input, output, start, end, target_lang, mode
+            and optionally source_language
+    
+    Returns:
+        Tuple of (job id, result dict or None, error string or None)
+    """
+    try:
+        output_dir = os.path.dirname(os.path.abspath(job["output"]))
+        os.makedirs(output_dir, exist_ok=True)
+        result = _worker_pipeline.run(
+            job["input"],
+            job["output"],
+            job["start"],
+            job["end"],
+            job["target_lang"],
+            mode=job["mode"],
+            source_language=job.get("source_language")
+        )
+        result["worker_memory"] = {"pid": os.getpid(), **process_memory()}
+        return job["id"], result, None
+    except Exception as e:
+        traceback.print_exc()
+        return job["id"], None, f"{type(e).__name__}: {e}"
+
+
+def run_batch(
+    jobs: list,
+    job_file: str = "supernan_jobs.json",
+    workers: int = 2,
+    max_retries: int = 2,
+    pipeline_options: dict = None,
+    share_models: bool = False
+) -> dict:
+    """
+    Dub a list of jobs on a pool of worker processes.
+    
+    Each worker loads its own pipeline once; with share_models the
+    shareable models are loaded once in this process instead and the
+    workers are forked from it (see preload_shared_models). Job status is
+    written to job_file after every change, so rerunning the same batch
+    resumes it: finished jobs are skipped and the rest are run again. Each
+    job result records the unique and shared memory of the worker that ran it.
+    The CPU cores are divided between the workers (see
+    worker_pipeline_options).
+    
+    If a worker process dies (killed for memory, or a crash in native
+    code), every job still in the pool counts as a failed attempt and the
+    pool is replaced before retrying.
+    
+    Args:
+        jobs: Job dicts from load_jobs
+        job_file: Path to the JSON job status file
+        workers: Number of worker processes
+        max_retries: Number of times a failed job is retried
+        pipeline_options: Keyword arguments for create_pipeline
+        share_models: Share models loaded in this process with forked
+            workers (POSIX only)
+    
+    Returns:
+        Dictionary mapping status to number of jobs
+    """
+    if share_models and "fork" not in multiprocessing.get_all_start_methods():
+        raise ValueError("Sharing models with workers requires the fork start method")
+    
+    state = JobFile(job_file)
+    pending = state.sync(jobs)
+    print(f"Batch: {len(pending)} of {len(jobs)} jobs to run on {workers} workers")
+    
+    if not pending:
+        return state.counts()
+    
+    context = multiprocessing.get_context()
+    if share_models:
+        shared = preload_shared_models(pipeline_options or {})
+        print(f"Sharing {', '.join(name for _, name in shared) or 'no models'} with workers")
+        context = multiprocessing.get_context("fork")
+    
+    worker_memory = {}
+    processes = max(1, min(workers, len(pending)))
+    options = worker_pipeline_options(pipeline_options, processes)
+    pool = None
+    try:
+        while pending:
+            if pool is None:
+                if share_models:
+                    # Replacement pools fork from a frozen parent too
+                    gc.freeze()
+                pool = ProcessPoolExecutor(
+                    max_workers=processes,
+                    mp_context=context,
+                    initializer=init_worker,
+                    initargs=(options,)
+                )
+            
+            retry = []
+            broken = False
+            for job in pending:
+                state.update(job["id"], status="queued", attempts=state.jobs[job["id"]]["attempts"] + 1)
+            futures = {pool.submit(run_job, job): job for job in pending}
+            if share_models:
+                # A fork pool starts all its workers on the first submit;
+                # they stay frozen, while this process collects normally again
+                gc.unfreeze()
+            
+            for future in as_completed(futures):
+                job = futures[future]
+                current_id = job["id"]
+                try:
+                    _, result, error = future.result()
+                except BrokenProcessPool:
+                    broken = True
+                    result, error = None, "BrokenProcessPool: a worker process died"
+                
+                attempts = state.jobs[current_id]["attempts"]
+                if error is None:
+                    state.update(current_id, status="done", result=result, error=None)
+                    worker_memory[result["worker_memory"]["pid"]] = result["worker_memory"]
+                    print(f"[{current_id}] done")
+                elif attempts <= max_retries:
+                    state.update(current_id, status="pending", error=error)
+                    retry.append(job)
+                    print(f"[{current_id}] failed (attempt {attempts}), retrying: {error}")
+                else:
+                    state.update(current_id, status="failed", error=error)
+                    print(f"[{current_id}] failed after {attempts} attempts: {error}")
+            
+            if broken:
+                pool.shutdown(wait=True)
+                pool = None
+            pending = retry
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True)
+        if share_models:
+            gc.unfreeze()
+    
+    for pid, memory in sorted(worker_memory.items()):
+        if "uss_bytes" in memory:
+            print(
+                f"Worker {pid}: {memory['uss_bytes'] / 2**20:.0f} MiB unique, "
+                f"{memory['shared_bytes'] / 2**20:.0f} MiB shared"
+            )
+    
+    return state.counts()
@@ -0,0 +1,310 @@
+"""
+Persistent caching module for SuperNan project.
+Stores results of expensive model calls in a local SQLite file.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Optional
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text before using it as part of a cache key.
+    
+    Args:
+        text: Text to normalize
+    
+    Returns:
+        NFC-normalized text with collapsed whitespace
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def make_key(*parts) -> str:
+    """
+    Build a stable cache key from JSON-serializable parts.
+    
+    Args:
+        parts: Values identifying the cached result
+    
+    Returns:
+        Hex SHA-256 digest of the parts
+    """
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SQLiteCache:
+    """
+    Size-bounded LRU cache stored in a SQLite file.
+    
+    The file can be shared by several worker processes: the database runs
+    in WAL mode, writes take an immediate lock and each process opens its
+    own connection.
+    """
+    
+    def __init__(
+        self,
+        path: str,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        timeout: float = 30.0
+    ):
+        """
+        Initialize the cache.
+        
+        Args:
+            path: Path to the SQLite file (created if missing)
+            max_entries: Maximum number of entries kept (unbounded if None)
+            max_bytes: Maximum total size of stored values (unbounded if None)
+            timeout: Seconds to wait for a lock held by another process
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, "
+                "value BLOB NOT NULL, "
+                "meta TEXT, "
+                "size INTEGER NOT NULL, "
+                "last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_access)")
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Return this process's connection, reopening it after a fork."""
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(
+                self.path,
+                timeout=self.timeout,
+                isolation_level=None,
+                check_same_thread=False
+            )
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._pid = os.getpid()
+        return self._conn
+    
+    def get_entry(self, key: str) -> Optional[tuple]:
+        """
+        Look up an entry and mark it as recently used.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Tuple of (value bytes, meta string) or None on a miss
+        """
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value, meta FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            
+            if row is None:
+                self.misses += 1
+                return None
+            
+            self.hits += 1
+            conn.execute(
+                "UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            return bytes(row[0]), row[1]
+    
+    def put_entry(self, key: str, value: bytes, meta: Optional[str] = None):
+        """
+        Store an entry and evict least recently used entries over the limits.
+        
+        Args:
+            key: Cache key
+            value: Value bytes
+            meta: Optional text stored alongside the value
+        """
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, meta, size, last_access) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, value, meta, len(value), time.time())
+                )
+                self._evict(conn)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+    
+    def _evict(self, conn: sqlite3.Connection):
+        """Delete least recently used entries until the limits hold."""
+        if self.max_entries is not None:
+            count = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            if count > self.max_entries:
+                conn.execute(
+                    "DELETE FROM entries WHERE key IN "
+                    "(SELECT key FROM entries ORDER BY last_access ASC LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+        
+        if self.max_bytes is not None:
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total > self.max_bytes:
+                excess = total - self.max_bytes
+                stale = []
+                for key, size in conn.execute(
+                    "SELECT key, size FROM entries ORDER BY last_access ASC"
+                ):
+                    stale.append((key,))
+                    excess -= size
+                    if excess <= 0:
+                        break
+                conn.executemany("DELETE FROM entries WHERE key = ?", stale)
+    
+    def clear(self):
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._connection().execute("DELETE FROM entries")
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self) -> dict:
+        """
+        Get cache statistics.
+        
+        Returns:
+            Dictionary with hit/miss counters of this instance and the
+            current number of entries and bytes in the shared file
+        """
+        with self._lock:
+            entries, size = self._connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": entries,
+            "bytes": size
+        }
+    
+    def __len__(self) -> int:
+        return self.stats()["entries"]
+
+
+class TranslationCache(SQLiteCache):
+    """Cache of translated sentences keyed by model, languages and decoding parameters."""
+    
+    def __init__(self, path: str = ".supernan_cache/translations.sqlite", max_entries: int = 100000, **kwargs):
+        """
+        Initialize the translation cache.
+        
+        Args:
+            path: Path to the SQLite file
+            max_entries: Maximum number of cached sentences
+            **kwargs: Passed to SQLiteCache
+        """
+        super().__init__(path, max_entries=max_entries, **kwargs)
+    
+    @staticmethod
+    def key(model_name: str, source_lang: str, target_lang: str, params: dict, text: str) -> str:
+        """
+        Build the cache key for one sentence.
+        
+        Args:
+            model_name: Translation model name
+            source_lang: Source language code
+            target_lang: Target language code
+            params: Decoding parameters
+            text: Source sentence
+        
+        Returns:
+            Cache key
+        """
+        return make_key("translation", model_name, source_lang, target_lang, params, normalize_text(text))
+    
+    def get(self, model_name: str, source_lang: str, target_lang: str, params: dict, text: str) -> Optional[str]:
+        """
+        Look up a cached translation.
+        
+        Returns:
+            Translated sentence or None on a miss
+        """
+        entry = self.get_entry(self.key(model_name, source_lang, target_lang, params, text))
+        return entry[0].decode("utf-8") if entry is not None else None
+    
+    def put(self, model_name: str, source_lang: str, target_lang: str, params: dict, text: str, translation: str):
+        """
+        Store a translation.
+        """
+        self.put_entry(
+            self.key(model_name, source_lang, target_lang, params, text),
+            translation.encode("utf-8")
+        )
+
+
+class TTSCache(SQLiteCache):
+    """Content-addressed cache of synthesized audio and word timings."""
+    
+    def __init__(self, path: str = ".supernan_cache/tts.sqlite", max_bytes: int = 512 * 1024 * 1024, **kwargs):
+        """
+        Initialize the TTS cache.
+        
+        Args:
+            path: Path to the SQLite file
+            max_bytes: Maximum total size of cached audio
+            **kwargs: Passed to SQLiteCache
+        """
+        super().__init__(path, max_bytes=max_bytes, **kwargs)
+    
+    @staticmethod
+    def key(voice: str, text: str, options: dict) -> str:
+        """
+        Build the cache key for one synthesis request.
+        
+        Args:
+            voice: Voice name
+            text: Text to synthesize
+            options: Synthesis options (rate, volume, pitch, ...)
+        
+        Returns:
+            Cache key
+        """
+        return make_key("tts", voice, options, normalize_text(text))
+    
+    def get(self, voice: str, text: str, options: dict) -> Optional[tuple]:
+        """
+        Look up cached speech.
+        
+        Returns:
+            Tuple of (audio bytes, word boundary list) or None on a miss
+        """
+        entry = self.get_entry(self.key(voice, text, options))
+        if entry is None:
+            return None
+        audio, meta = entry
+        return audio, json.loads(meta) if meta else []
+    
+    def put(self, voice: str, text: str, options: dict, audio: bytes, subtitles: list):
+        """
+        Store synthesized speech and its word boundaries.
+        """
+        self.put_entry(self.key(voice, text, options), audio, json.dumps(subtitles))
@@ -0,0 +1,136 @@
+"""
+FFmpeg runner for SuperNan project.
+Runs ffmpeg/ffprobe over subprocess pipes and decodes audio into memory.
+"""
+
+import json
+import subprocess
+
+import numpy as np
+
+
+# Sample rate expected by Whisper
+WHISPER_SAMPLE_RATE = 16000
+
+
+class FFmpegError(RuntimeError):
+    """Raised when an ffmpeg or ffprobe process exits with an error."""
+    
+    def __init__(self, command: list, returncode: int, stderr: str):
+        self.command = command
+        self.returncode = returncode
+        self.stderr = stderr
+        message = stderr.strip().splitlines()[-1] if stderr.strip() else "no error output"
+        super().__init__(f"{command[0]} exited with code {returncode}: {message}")
+
+
+def _run(command: list, input_bytes: bytes = None) -> bytes:
+    """
+    Run a command, returning stdout and raising FFmpegError on failure.
+    
+    Args:
+        command: Command and arguments
+        input_bytes: Data written to the process's stdin
+    
+    Returns:
+        Captured stdout bytes
+    """
+    try:
+        process = subprocess.run(
+            command,
+            input=input_bytes,
+            stdin=None if input_bytes is not None else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+    except FileNotFoundError:
+        raise FFmpegError(command, 127, f"{command[0]} not found on PATH")
+    
+    if process.returncode != 0:
+        raise FFmpegError(command, process.returncode, process.stderr.decode("utf-8", "replace"))
+    
+    return process.stdout
+
+
+def run_ffmpeg(args: list, input_bytes: bytes = None) -> bytes:
+    """
+    Run ffmpeg with the given arguments.
+    
+    Output files are overwritten and only errors are logged.
+    
+    Args:
+        args: ffmpeg arguments (without the executable)
+        input_bytes: Data written to ffmpeg's stdin (for pipe:0 inputs)
+    
+    Returns:
+        Captured stdout bytes (for pipe:1 outputs)
+    
+    Raises:
+        FFmpegError: If ffmpeg fails
+    """
+    command = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-y"] + [str(arg) for arg in args]
+    return _run(command, input_bytes)
+
+
+def run_ffprobe(args: list) -> bytes:
+    """
+    Run ffprobe with the given arguments.
+    
+    Args:
+        args: ffprobe arguments (without the executable)
+    
+    Returns:
+        Captured stdout bytes
+    
+    Raises:
+        FFmpegError: If ffprobe fails
+    """
+    command = ["ffprobe", "-hide_banner", "-loglevel", "error"] + [str(arg) for arg in args]
+    return _run(command)
+
+
+def decode_audio(
+    path: str,
+    sample_rate: int = WHISPER_SAMPLE_RATE,
+    start: float = None,
+    duration: float = None,
+    channels: int = 1
+) -> np.ndarray:
+    """
+    Decode the first audio stream of a media file into memory.
+    
+    Args:
+        path: Path to an audio or video file
+        sample_rate: Output sample rate
+        start: Start offset in seconds (beginning of file if None)
+        duration: Length to decode in seconds (to the end if None)
+        channels: Output channel count (ffmpeg down- or upmixes)
+    
+    Returns:
+        Float32 samples in [-1, 1]: shape (samples,) for mono, otherwise
+        (samples, channels)
+    """
+    args = []
+    if start is not None:
+        args += ["-ss", start]
+    args += ["-i", path]
+    if duration is not None:
+        args += ["-t", duration]
+    args += ["-map", "0:a:0", "-ac", channels, "-ar", sample_rate, "-f", "f32le", "-acodec", "pcm_f32le", "pipe:1"]
+    
+    samples = np.frombuffer(run_ffmpeg(args), dtype=np.float32).copy()
+    return samples if channels == 1 else samples.reshape(-1, channels)
+
+
+def probe(path: str) -> dict:
+    """
+    Read container and stream information with ffprobe.
+    
+    Args:
+        path: Path to an audio or video file
+    
+    Returns:
+        Dictionary with "format" and "streams" entries as reported by ffprobe
+    """
+    output = run_ffprobe(["-show_format", "-show_streams", "-of", "json", path])
+    return json.loads(output)
@@ -0,0 +1,196 @@
+"""
+Full-length dubbing module for SuperNan project.
+Splits a whole video at quiet keyframes, dubs the chunks in parallel
+worker processes and joins the results without re-encoding video.
+"""
+
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from .batch import init_worker, run_job, worker_pipeline_options
+from .ffmpeg import probe, run_ffmpeg
+from .keyframes import get_keyframes
+from .video_processor import concat_files
+
+
+def detect_silences(video_path: str, noise_db: float = -35.0, min_silence: float = 0.3) -> list:
+    """
+    Find silent stretches in a file's audio in one streaming ffmpeg pass.
+    
+    Args:
+        video_path: Path to video or audio file
+        noise_db: Level below which audio counts as silence
+        min_silence: Minimum silence length in seconds
+    
+    Returns:
+        List of (start, end) tuples in seconds
+    """
+    output = run_ffmpeg([
+        "-i", video_path, "-map", "0:a:0", "-vn",
+        "-af", f"silencedetect=noise={noise_db}dB:d={min_silence},ametadata=mode=print:file=-",
+        "-f", "null", "-"
+    ]).decode("utf-8", "replace")
+    
+    silences = []
+    start = None
+    for line in output.splitlines():
+        if line.startswith("lavfi.silence_start="):
+            start = float(line.split("=", 1)[1])
+        elif line.startswith("lavfi.silence_end=") and start is not None:
+            silences.append((max(0.0, start), float(line.split("=", 1)[1])))
+            start = None
+    return silences
+
+
+def plan_chunks(video_path: str, chunk_seconds: float = 60.0, search_seconds: float = 10.0) -> list:
+    """
+    Choose chunk boundaries for a whole video.
+    
+    Boundaries are placed roughly every chunk_seconds. Near each target the
+    middle of the closest silence is preferred, and the cut is snapped to
+    the nearest keyframe so chunks can be extracted by stream copy.
+    
+    Args:
+        video_path: Path to video file
+        chunk_seconds: Target chunk length in seconds
+        search_seconds: How far from the target a boundary may move
+    
+    Returns:
+        List of (start, end) tuples in seconds covering the whole video
+    """
+    duration = float(probe(video_path)["format"]["duration"])
+    keyframes = get_keyframes(video_path)
+    silences = detect_silences(video_path)
+    
+    boundaries = [0.0]
+    target = chunk_seconds
+    while target < duration - chunk_seconds / 2:
+        nearby = [
+            (start + end) / 2 for start, end in silences
+            if abs((start + end) / 2 - target) <= search_seconds
+        ]
+        cut = min(nearby, key=lambda t: abs(t - target)) if nearby else target
+        
+        if keyframes:
+            cut = min(keyframes, key=lambda t: abs(t - cut))
+        
+        if cut > boundaries[-1]:
+            boundaries.append(cut)
+        target = boundaries[-1] + chunk_seconds
+    
+    boundaries.append(duration)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def dub_full_video(
+    input_video: str,
+    output_video: str,
+    target_lang: str = "hin_Deva",
+    mode: str = "segments",
+    chunk_seconds: float = 60.0,
+    workers: int = 2,
+    source_language: str = None,
+    pipeline_options: dict = None
+) -> dict:
+    """
+    Dub a whole video by splitting it into chunks dubbed in parallel.
+    
+    The first chunk is dubbed on its own so the language Whisper detects
+    there can be passed to every later chunk. The remaining chunks are
+    spread over the worker pool, which divides the CPU cores between its
+    workers, and the dubbed chunks are joined with the concat demuxer
+    without re-encoding video.
+    
+    Args:
+        input_video: Path to input video
+        output_video: Path to save dubbed video
+        target_lang: Target language code
+        mode: Pipeline mode used for each chunk ("clip" or "segments")
+        chunk_seconds: Target chunk length in seconds
+        workers: Number of worker processes
+        source_language: Spoken language of the input (detected if None)
+        pipeline_options: Keyword arguments for create_pipeline
+    
+    Returns:
+        Dictionary with overall results and per-chunk results
+    """
+    chunks = plan_chunks(input_video, chunk_seconds=chunk_seconds)
+    print(f"Full-length: {len(chunks)} chunks on {workers} workers")
+    
+    temp_dir = tempfile.mkdtemp()
+    try:
+        jobs = [
+            {
+                "id": f"chunk-{index:04d}",
+                "input": input_video,
+                "output": os.path.join(temp_dir, f"chunk_{index:04d}.mp4"),
+                "start": f"{start:.3f}",
+                "end": f"{end:.3f}",
+                "target_lang": target_lang,
+                "mode": mode,
+                "source_language": source_language
+            }
+            for index, (start, end) in enumerate(chunks)
+        ]
+        
+        processes = max(1, min(workers, len(jobs)))
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            initializer=init_worker,
+            initargs=(worker_pipeline_options(pipeline_options, processes),)
+        ) as pool:
+            try:
+                first_result = _chunk_result(pool.submit(run_job, jobs[0]), jobs[0])
+                
+                language = source_language or first_result["language"]
+                for job in jobs[1:]:
+                    job["source_language"] = language
+                
+                results = {jobs[0]["id"]: first_result}
+                futures = {pool.submit(run_job, job): job for job in jobs[1:]}
+                for future in as_completed(futures):
+                    job = futures[future]
+                    results[job["id"]] = _chunk_result(future, job)
+                    print(f"[{job['id']}] done ({len(results)}/{len(jobs)})")
+            except RuntimeError:
+                # The video cannot be completed; drop the chunks not started yet
+                pool.shutdown(cancel_futures=True)
+                raise
+        
+        print("Joining chunks...")
+        concat_files([job["output"] for job in jobs], output_video)
+        
+        ordered = [results[job["id"]] for job in jobs]
+        return {
+            "success": True,
+            "input_video": input_video,
+            "output_video": output_video,
+            "language": language,
+            "transcript": " ".join(result["transcript"] for result in ordered),
+            "translated_text": " ".join(result["translated_text"] for result in ordered),
+            "chunks": [
+                {"start": start, "end": end, **result}
+                for (start, end), result in zip(chunks, ordered)
+            ]
+        }
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def _chunk_result(future, job: dict) -> dict:
+    """
+    Wait for a chunk job and get its result.
+    
+    Raises:
+        RuntimeError: If the job failed or its worker process died
+    """
+    try:
+        _, result, error = future.result()
+    except BrokenProcessPool:
+        error = "BrokenProcessPool: a worker process died"
+    if error is not None:
+        raise RuntimeError(f"{job['id']} failed: {error}")
+    return result
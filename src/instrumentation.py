@@ -0,0 +1,254 @@
+"""
+Instrumentation module for SuperNan project.
+Records per-stage wall time, CPU time, memory, I/O and cache activity,
+and exports them as Chrome trace JSON or CSV.
+"""
+
+import csv
+import json
+import os
+import resource
+import threading
+import time
+from contextlib import contextmanager
+
+from .memory import peak_rss_bytes, reset_peak_rss, rss_bytes
+
+
+# Callables invoked with every finished stage record
+_hooks = []
+
+# Stages running in this process, across all tracers; the peak RSS is
+# process-wide, so it is only reset while this is zero
+_active_stages = 0
+_active_lock = threading.Lock()
+
+CSV_FIELDS = [
+    "name", "start", "wall_seconds", "cpu_seconds", "rtf",
+    "rss_bytes", "peak_rss_bytes", "read_bytes", "write_bytes",
+    "cache_hits", "cache_misses"
+]
+
+
+def register_hook(hook):
+    """
+    Register a callable that receives every finished stage record.
+    
+    Hooks run in the thread that finished the stage; exceptions they raise
+    are reported and otherwise ignored.
+    
+    Args:
+        hook: Callable taking a stage record dictionary
+    """
+    _hooks.append(hook)
+
+
+def unregister_hook(hook):
+    """
+    Remove a hook added with register_hook.
+    
+    Args:
+        hook: Previously registered callable
+    """
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+def _cpu_seconds() -> float:
+    """User plus system CPU time of this process and its waited-for children."""
+    total = 0.0
+    for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+        usage = resource.getrusage(who)
+        total += usage.ru_utime + usage.ru_stime
+    return total
+
+
+def _io_bytes() -> tuple:
+    """
+    Bytes read from and written to storage by this process and its children.
+    
+    /proc/self/io covers this process; ffmpeg children are counted through
+    their block I/O in getrusage.
+    
+    Returns:
+        Tuple of (read bytes, written bytes)
+    """
+    read_bytes = write_bytes = 0
+    try:
+        with open("/proc/self/io") as io:
+            for line in io:
+                name, _, value = line.partition(":")
+                if name == "read_bytes":
+                    read_bytes = int(value)
+                elif name == "write_bytes":
+                    write_bytes = int(value)
+    except (OSError, ValueError):
+        pass
+    
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return read_bytes + children.ru_inblock * 512, write_bytes + children.ru_oublock * 512
+
+
+class Tracer:
+    """
+    Collects per-stage measurements for one pipeline run.
+    
+    Measurements are process-wide, so stages running concurrently in other
+    threads are included in each other's CPU and I/O numbers. The peak RSS
+    is reset only when a stage starts while no other stage of any tracer
+    in the process is running.
+    """
+    
+    def __init__(self, caches: dict = None, clip_duration: float = None):
+        """
+        Initialize the tracer.
+        
+        Args:
+            caches: Mapping of name to an object with hits/misses counters
+                (SQLiteCache, ArtifactStore); None values are skipped
+            clip_duration: Media duration in seconds, used for the real-time
+                factor (may be set later)
+        """
+        self.caches = {name: cache for name, cache in (caches or {}).items() if cache is not None}
+        self.clip_duration = clip_duration
+        self.stages = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+    
+    def _cache_counters(self) -> dict:
+        return {name: (cache.hits, cache.misses) for name, cache in self.caches.items()}
+    
+    @contextmanager
+    def stage(self, name: str, **attributes):
+        """
+        Measure a block of work as a named stage.
+        
+        Args:
+            name: Stage name
+            **attributes: Extra values stored with the record
+        
+        Yields:
+            The stage record, completed when the block exits
+        """
+        global _active_stages
+        depth = getattr(self._local, "depth", 0)
+        with _active_lock:
+            if _active_stages == 0:
+                reset_peak_rss()
+            _active_stages += 1
+        self._local.depth = depth + 1
+        
+        record = {"name": name, "depth": depth, "thread": threading.get_ident(), **attributes}
+        caches_before = self._cache_counters()
+        read_before, write_before = _io_bytes()
+        cpu_before = _cpu_seconds()
+        start = time.perf_counter()
+        record["start"] = start - self._origin
+        
+        try:
+            yield record
+        finally:
+            record["wall_seconds"] = time.perf_counter() - start
+            record["cpu_seconds"] = _cpu_seconds() - cpu_before
+            read_after, write_after = _io_bytes()
+            record["read_bytes"] = read_after - read_before
+            record["write_bytes"] = write_after - write_before
+            record["rss_bytes"] = rss_bytes()
+            record["peak_rss_bytes"] = peak_rss_bytes()
+            caches_after = self._cache_counters()
+            record["cache_hits"] = {
+                cache: caches_after[cache][0] - caches_before[cache][0] for cache in self.caches
+            }
+            record["cache_misses"] = {
+                cache: caches_after[cache][1] - caches_before[cache][1] for cache in self.caches
+            }
+            self._local.depth = depth
+            
+            with _active_lock:
+                _active_stages -= 1
+            with self._lock:
+                self.stages.append(record)
+            for hook in list(_hooks):
+                try:
+                    hook(dict(record, rtf=self._rtf(record)))
+                except Exception as e:
+                    print(f"Warning: instrumentation hook failed: {e}")
+    
+    def _rtf(self, record: dict):
+        """Real-time factor of a stage (wall time per second of media)."""
+        if not self.clip_duration:
+            return None
+        return record["wall_seconds"] / self.clip_duration
+    
+    def metrics(self) -> dict:
+        """
+        Summarize the recorded stages.
+        
+        The total wall time spans from the first stage start to the last
+        stage end, so stages overlapping in different threads count once.
+        
+        Returns:
+            Dictionary with clip duration, total wall time, total real-time
+            factor and the list of stage records
+        """
+        with self._lock:
+            stages = [dict(record, rtf=self._rtf(record)) for record in self.stages]
+        
+        total_wall = (
+            max(record["start"] + record["wall_seconds"] for record in stages)
+            - min(record["start"] for record in stages)
+        ) if stages else 0.0
+        return {
+            "clip_duration": self.clip_duration,
+            "wall_seconds": total_wall,
+            "rtf": total_wall / self.clip_duration if self.clip_duration else None,
+            "peak_rss_bytes": max((record["peak_rss_bytes"] for record in stages), default=None),
+            "stages": stages
+        }
+    
+    def to_chrome_trace(self, path: str):
+        """
+        Write the stages as a Chrome trace (loadable in Perfetto or chrome://tracing).
+        
+        Args:
+            path: Output JSON path
+        """
+        pid = os.getpid()
+        events = []
+        for record in self.metrics()["stages"]:
+            args = {
+                key: value for key, value in record.items()
+                if key not in ("name", "start", "wall_seconds", "thread", "depth")
+            }
+            events.append({
+                "name": record["name"],
+                "ph": "X",
+                "ts": record["start"] * 1e6,
+                "dur": record["wall_seconds"] * 1e6,
+                "pid": pid,
+                "tid": record["thread"],
+                "args": args
+            })
+        
+        with open(path, "w") as output:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, output, indent=2)
+    
+    def to_csv(self, path: str):
+        """
+        Write the stages as a flat CSV with one row per stage.
+        
+        Cache counters are summed over all caches.
+        
+        Args:
+            path: Output CSV path
+        """
+        with open(path, "w", newline="") as output:
+            writer = csv.DictWriter(output, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            for record in self.metrics()["stages"]:
+                writer.writerow(dict(
+                    record,
+                    cache_hits=sum(record["cache_hits"].values()),
+                    cache_misses=sum(record["cache_misses"].values())
+                ))
@@ -0,0 +1,186 @@
+"""
+Job queue module for SuperNan project.
+Runs dubbing jobs on a bounded pool of worker threads and tracks their status.
+"""
+
+import collections
+import itertools
+import queue
+import threading
+import time
+import traceback
+import uuid
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a job is submitted to a queue that is already full."""
+
+
+class JobQueue:
+    """
+    Bounded job queue with status and result lookup.
+    
+    Jobs are plain dicts of parameters passed to a handler callable. Each
+    job record tracks its status (queued, running, done, failed), result
+    or error, and timestamps. Finished jobs are kept for lookup until they
+    are older than retention seconds or more than max_finished of them
+    have piled up, oldest first.
+    """
+    
+    def __init__(
+        self,
+        handler,
+        max_workers: int = 1,
+        max_pending: int = 100,
+        max_finished: int = 1000,
+        retention: float = 24 * 3600
+    ):
+        """
+        Initialize the queue and start its workers.
+        
+        Args:
+            handler: Callable taking the job params dict and returning a result dict
+            max_workers: Number of jobs processed concurrently
+            max_pending: Maximum number of queued jobs before submit is refused
+            max_finished: Maximum number of done or failed jobs kept
+            retention: Seconds a done or failed job is kept (forever if None)
+        """
+        self.handler = handler
+        self._queue = queue.Queue(maxsize=max_pending)
+        self.max_finished = max_finished
+        self.retention = retention
+        self._jobs = {}
+        self._finished = collections.deque()
+        self._lock = threading.Lock()
+        self._counter = itertools.count(1)
+        self._workers = [
+            threading.Thread(target=self._work, name=f"supernan-job-{i}", daemon=True)
+            for i in range(max(1, max_workers))
+        ]
+        for worker in self._workers:
+            worker.start()
+    
+    def submit(self, params: dict) -> dict:
+        """
+        Queue a job.
+        
+        Args:
+            params: Job parameters passed to the handler
+        
+        Returns:
+            Snapshot of the new job record
+        
+        Raises:
+            QueueFullError: If max_pending jobs are already waiting
+        """
+        job_id = f"{next(self._counter):06d}-{uuid.uuid4().hex[:8]}"
+        job = {
+            "id": job_id,
+            "status": "queued",
+            "params": dict(params),
+            "result": None,
+            "error": None,
+            "submitted_at": time.time(),
+            "started_at": None,
+            "finished_at": None
+        }
+        
+        with self._lock:
+            self._prune()
+            self._jobs[job_id] = job
+        
+        try:
+            self._queue.put_nowait(job_id)
+        except queue.Full:
+            with self._lock:
+                del self._jobs[job_id]
+            raise QueueFullError("Job queue is full")
+        
+        return self.get(job_id)
+    
+    def get(self, job_id: str) -> dict:
+        """
+        Get a snapshot of a job record.
+        
+        Args:
+            job_id: Job identifier
+        
+        Returns:
+            Copy of the job record, or None if unknown
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+    
+    def list(self) -> list:
+        """
+        Get snapshots of all job records in submission order.
+        
+        Returns:
+            List of job record copies
+        """
+        with self._lock:
+            return [dict(job) for job in self._jobs.values()]
+    
+    def counts(self) -> dict:
+        """
+        Count jobs by status.
+        
+        Returns:
+            Dictionary mapping status to number of jobs
+        """
+        counts = {"queued": 0, "running": 0, "done": 0, "failed": 0}
+        with self._lock:
+            for job in self._jobs.values():
+                counts[job["status"]] += 1
+        return counts
+    
+    def shutdown(self, wait: bool = True):
+        """
+        Stop the workers after the queued jobs finish.
+        
+        Args:
+            wait: Block until all workers have exited
+        """
+        for _ in self._workers:
+            self._queue.put(None)
+        if wait:
+            for worker in self._workers:
+                worker.join()
+    
+    def _work(self):
+        """Worker loop: run queued jobs until a shutdown sentinel arrives."""
+        while True:
+            job_id = self._queue.get()
+            if job_id is None:
+                return
+            
+            with self._lock:
+                job = self._jobs[job_id]
+                job["status"] = "running"
+                job["started_at"] = time.time()
+            
+            try:
+                result = self.handler(job["params"])
+                status, error = "done", None
+            except Exception as e:
+                result = None
+                status, error = "failed", f"{type(e).__name__}: {e}"
+                traceback.print_exc()
+            
+            with self._lock:
+                job["status"] = status
+                job["result"] = result
+                job["error"] = error
+                job["finished_at"] = time.time()
+                self._finished.append(job_id)
+                self._prune()
+    
+    def _prune(self):
+        """Forget expired and excess finished jobs (caller holds the lock)."""
+        expired_before = time.time() - self.retention if self.retention is not None else None
+        while self._finished and (
+            len(self._finished) > self.max_finished
+            or (expired_before is not None and self._jobs[self._finished[0]]["finished_at"] < expired_before)
+        ):
+            del self._jobs[self._finished.popleft()]
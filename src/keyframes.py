@@ -0,0 +1,108 @@
+"""
+Keyframe index module for SuperNan project.
+Builds and caches the keyframe timestamps of a video with ffprobe.
+"""
+
+import bisect
+import json
+import os
+
+from .ffmpeg import run_ffprobe
+
+
+def index_path(video_path: str) -> str:
+    """
+    Get the path of the cached keyframe index for a video.
+    
+    Args:
+        video_path: Path to video file
+    
+    Returns:
+        Path of the index file stored next to the video
+    """
+    return f"{video_path}.keyframes.json"
+
+
+def get_keyframes(video_path: str, use_cache: bool = True) -> list:
+    """
+    Get the keyframe timestamps of a video's first video stream.
+    
+    The index is read from packet flags (no decoding) and cached next to
+    the video. A cached index is reused while the video's size and
+    modification time are unchanged.
+    
+    Args:
+        video_path: Path to video file
+        use_cache: Read and write the cached index
+    
+    Returns:
+        Sorted keyframe timestamps in seconds (empty if there is no video)
+    """
+    stat = os.stat(video_path)
+    fingerprint = {"size": stat.st_size, "mtime": stat.st_mtime}
+    cache_path = index_path(video_path)
+    
+    if use_cache and os.path.exists(cache_path):
+        try:
+            with open(cache_path) as index_file:
+                cached = json.load(index_file)
+            if cached.get("fingerprint") == fingerprint:
+                return cached["keyframes"]
+        except (OSError, ValueError, KeyError):
+            pass
+    
+    output = run_ffprobe([
+        "-select_streams", "v:0",
+        "-show_entries", "packet=pts_time,flags",
+        "-of", "csv=p=0",
+        video_path
+    ]).decode("utf-8", "replace")
+    
+    keyframes = []
+    for line in output.splitlines():
+        pts_time, _, flags = line.partition(",")
+        if "K" in flags and pts_time not in ("", "N/A"):
+            keyframes.append(float(pts_time))
+    keyframes.sort()
+    
+    if use_cache:
+        try:
+            with open(cache_path, "w") as index_file:
+                json.dump({"fingerprint": fingerprint, "keyframes": keyframes}, index_file)
+        except OSError:
+            # Read-only source directory: the index just isn't cached
+            pass
+    
+    return keyframes
+
+
+def keyframe_at_or_after(keyframes: list, time: float, tolerance: float = 0.001) -> float:
+    """
+    Find the first keyframe at or after a time.
+    
+    Args:
+        keyframes: Sorted keyframe timestamps
+        time: Time in seconds
+        tolerance: Keyframes this close before time also match
+    
+    Returns:
+        Keyframe timestamp, or None if there is none
+    """
+    index = bisect.bisect_left(keyframes, time - tolerance)
+    return keyframes[index] if index < len(keyframes) else None
+
+
+def keyframe_at_or_before(keyframes: list, time: float, tolerance: float = 0.001) -> float:
+    """
+    Find the last keyframe at or before a time.
+    
+    Args:
+        keyframes: Sorted keyframe timestamps
+        time: Time in seconds
+        tolerance: Keyframes this close after time also match
+    
+    Returns:
+        Keyframe timestamp, or None if there is none
+    """
+    index = bisect.bisect_right(keyframes, time + tolerance)
+    return keyframes[index - 1] if index > 0 else None
@@ -0,0 +1,98 @@
+"""
+Memory accounting utilities for SuperNan project.
+Reads process memory usage for model and stage reporting.
+"""
+
+import os
+import resource
+
+
+def rss_bytes() -> int:
+    """
+    Get the current resident set size of this process.
+    
+    Returns:
+        Resident memory in bytes (peak RSS where /proc is unavailable)
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return peak_rss_bytes()
+
+
+def peak_rss_bytes() -> int:
+    """
+    Get the peak resident set size of this process.
+    
+    The peak is read from /proc (VmHWM) where available so that it honours
+    reset_peak_rss; elsewhere the lifetime peak from getrusage is returned.
+    
+    Returns:
+        Peak resident memory in bytes
+    """
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+def reset_peak_rss() -> bool:
+    """
+    Reset the peak resident set size to the current RSS (Linux only).
+    
+    Returns:
+        True if the peak was reset
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def process_memory(pid="self") -> dict:
+    """
+    Break down the resident memory of a process into unique and shared parts.
+    
+    Unique memory (USS) is held by this process alone and is what another
+    worker really costs; pages still shared with a parent after fork count
+    towards shared memory instead. Read from /proc (Linux only).
+    
+    Args:
+        pid: Process id, or "self"
+    
+    Returns:
+        Dictionary with rss_bytes, pss_bytes, uss_bytes and shared_bytes,
+        empty where /proc is unavailable
+    """
+    fields = {}
+    for path in (f"/proc/{pid}/smaps_rollup", f"/proc/{pid}/smaps"):
+        try:
+            with open(path) as smaps:
+                for line in smaps:
+                    name, _, value = line.partition(":")
+                    parts = value.split()
+                    if len(parts) == 2 and parts[1] == "kB":
+                        fields[name] = fields.get(name, 0) + int(parts[0]) * 1024
+            break
+        except (OSError, ValueError):
+            fields = {}
+    
+    if not fields:
+        return {}
+    return {
+        "rss_bytes": fields.get("Rss", 0),
+        "pss_bytes": fields.get("Pss", 0),
+        "uss_bytes": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+        "shared_bytes": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0)
+    }
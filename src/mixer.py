@@ -0,0 +1,134 @@
+"""
+Audio mixer module for SuperNan project.
+Mixes dubbed speech over the original soundtrack in memory, ducking the
+soundtrack under the speech so music and effects stay audible around it.
+"""
+
+import numpy as np
+
+from .audio_processor import OUTPUT_SAMPLE_RATE
+
+
+# Resolution of the speech activity and gain envelope, in seconds
+ENVELOPE_FRAME = 0.01
+
+
+def speech_activity(
+    speech: np.ndarray,
+    sample_rate: int = OUTPUT_SAMPLE_RATE,
+    threshold_db: float = -45.0,
+    frame: float = ENVELOPE_FRAME
+) -> np.ndarray:
+    """
+    Find the frames of a dubbed track that contain speech.
+    
+    Args:
+        speech: Mono float32 samples
+        sample_rate: Sample rate of the samples
+        threshold_db: Frame RMS level (dBFS) above which a frame is active
+        frame: Frame length in seconds
+    
+    Returns:
+        Boolean array with one entry per frame
+    """
+    frame_length = max(1, int(round(frame * sample_rate)))
+    frames = -(-len(speech) // frame_length)
+    padded = np.zeros(frames * frame_length, dtype=np.float32)
+    padded[:len(speech)] = speech
+    power = np.mean(np.square(padded.reshape(frames, frame_length)), axis=1)
+    return power > 10 ** (threshold_db / 10)
+
+
+def duck_envelope(
+    active: np.ndarray,
+    duck_db: float = -15.0,
+    attack: float = 0.08,
+    release: float = 0.4,
+    hold: float = 0.25,
+    frame: float = ENVELOPE_FRAME
+) -> np.ndarray:
+    """
+    Compute the gain of the original soundtrack from speech activity.
+    
+    The gain fades down to duck_db over attack seconds before speech
+    starts, stays down for hold seconds after it stops (so it does not
+    pump between words), then fades back up over release seconds. Fades
+    follow a raised-cosine curve. Every frame is computed at once from its
+    distance to the nearest active frame before and after it.
+    
+    Args:
+        active: Speech activity per frame (from speech_activity)
+        duck_db: Soundtrack level under speech in dB
+        attack: Fade-down time in seconds
+        release: Fade-up time in seconds
+        hold: Time the soundtrack stays down after speech ends, in seconds
+        frame: Frame length in seconds
+    
+    Returns:
+        Float32 gain per frame in (0, 1]
+    """
+    frames = len(active)
+    if not active.any():
+        return np.ones(frames, dtype=np.float32)
+    
+    index = np.arange(frames)
+    never = 2 * frames + 1
+    last_active = np.maximum.accumulate(np.where(active, index, -never))
+    next_active = np.minimum.accumulate(np.where(active, index, never)[::-1])[::-1]
+    
+    since = (index - last_active) * frame - hold
+    until = (next_active - index) * frame
+    releasing = 1.0 - np.clip(since / max(release, frame), 0.0, 1.0)
+    attacking = 1.0 - np.clip(until / max(attack, frame), 0.0, 1.0)
+    depth = 0.5 - 0.5 * np.cos(np.pi * np.maximum(releasing, attacking))
+    
+    floor = 10 ** (duck_db / 20)
+    return (1.0 - (1.0 - floor) * depth).astype(np.float32)
+
+
+def mix_over_background(
+    speech: np.ndarray,
+    background: np.ndarray,
+    sample_rate: int = OUTPUT_SAMPLE_RATE,
+    duck_db: float = -15.0,
+    ceiling_db: float = -1.0,
+    **envelope
+) -> np.ndarray:
+    """
+    Mix a dubbed track over the original soundtrack in one pass.
+    
+    The soundtrack is ducked under speech, the mono speech is added to
+    every channel, and the mix is scaled down if its peak would pass the
+    ceiling instead of being clipped.
+    
+    Args:
+        speech: Dubbed mono float32 samples; sets the length of the mix
+        background: Original soundtrack as (samples,) or (samples, channels)
+            float32, trimmed or padded with silence to the speech length
+        sample_rate: Sample rate of both inputs and the mix
+        duck_db: Soundtrack level under speech in dB
+        ceiling_db: Highest peak level of the mix in dBFS
+        **envelope: attack, release and hold passed to duck_envelope
+    
+    Returns:
+        Float32 mix of shape (samples, channels)
+    """
+    if background.ndim == 1:
+        background = background[:, None]
+    length = len(speech)
+    if len(background) < length:
+        background = np.pad(background, ((0, length - len(background)), (0, 0)))
+    background = background[:length]
+    
+    gains = duck_envelope(speech_activity(speech, sample_rate), duck_db=duck_db, **envelope)
+    frame_times = (np.arange(len(gains)) + 0.5) * ENVELOPE_FRAME
+    gain = np.interp(np.arange(length) / sample_rate, frame_times, gains).astype(np.float32)
+    
+    mix = background * gain[:, None]
+    mix += speech[:, None]
+    
+    peak = float(np.abs(mix).max()) if length else 0.0
+    ceiling = 10 ** (ceiling_db / 20)
+    if peak > ceiling:
+        mix *= ceiling / peak
+    return mix
@@ -0,0 +1,380 @@
+"""
+Model registry module for SuperNan project.
+Loads each model once per process and shares it between services.
+"""
+
+import gc
+import os
+import threading
+
+from .memory import rss_bytes
+
+
+# Coqui XTTS model used for local speech synthesis
+XTTS_MODEL = "tts_models/multilingual/multi-dataset/xtts_v2"
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded models.
+    
+    Each (kind, model, compute_type, device) combination is loaded once and
+    the same instance is returned to every caller.
+    """
+    
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._models = {}
+        self._lock = threading.RLock()
+    
+    def _get(self, key: tuple, loader):
+        """
+        Return a cached model, loading it on first use.
+        
+        Args:
+            key: (kind, name, compute_type, device) tuple
+            loader: Callable returning the loaded model
+        
+        Returns:
+            The cached model object
+        """
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is None:
+                rss_before = rss_bytes()
+                model = loader()
+                entry = {
+                    "model": model,
+                    "memory_bytes": _model_bytes(model, rss_bytes() - rss_before)
+                }
+                self._models[key] = entry
+            return entry["model"]
+    
+    def get_whisper(
+        self,
+        model_size: str = "medium",
+        compute_type: str = "auto",
+        device: str = "auto",
+        cpu_threads: int = 0,
+        num_workers: int = 1
+    ):
+        """
+        Get a Faster Whisper model.
+        
+        "auto" settings are resolved with whisper_settings. Threading only
+        applies when the model is first loaded.
+        
+        Args:
+            model_size: Whisper model size (tiny, base, small, medium, large)
+            compute_type: Computation type (auto, float32, float16, int8, ...)
+            device: Device to run on (auto, cpu, cuda)
+            cpu_threads: Threads per worker on CPU (0 picks from the CPU count)
+            num_workers: Number of transcriptions that can run in parallel
+        
+        Returns:
+            Shared WhisperModel instance
+        """
+        settings = whisper_settings(compute_type, device, cpu_threads, num_workers)
+        
+        def load():
+            from faster_whisper import WhisperModel
+            return WhisperModel(model_size, **settings)
+        
+        return self._get(("whisper", model_size, settings["compute_type"], settings["device"]), load)
+    
+    def get_translator(
+        self,
+        model_name: str = "facebook/nllb-200-distilled-600M",
+        compute_type: str = "float32",
+        device: str = "cpu"
+    ) -> tuple:
+        """
+        Get a translation tokenizer and model.
+        
+        With compute_type "int8" the model's linear layers are quantized
+        to int8 with PyTorch dynamic quantization (CPU only).
+        
+        Args:
+            model_name: Hugging Face model name for translation
+            compute_type: Computation type (float32, int8)
+            device: Device to run on (cpu, cuda)
+        
+        Returns:
+            Shared (tokenizer, model) tuple
+        """
+        if compute_type not in ("float32", "int8"):
+            raise ValueError(f"Unsupported translator compute type: {compute_type}")
+        if compute_type == "int8" and device != "cpu":
+            raise ValueError("int8 dynamic quantization runs on the CPU only")
+        
+        def load():
+            from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+            tokenizer = AutoTokenizer.from_pretrained(model_name)
+            model = AutoModelForSeq2SeqLM.from_pretrained(model_name).to(device)
+            model.eval()
+            if compute_type == "int8":
+                import torch
+                model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+            return tokenizer, model
+        
+        return self._get(("translator", model_name, compute_type, device), load)
+    
+    def get_ct2_translator(self, model_dir: str, compute_type: str = "int8", device: str = "cpu") -> tuple:
+        """
+        Get a tokenizer and CTranslate2 translator for a converted model.
+        
+        Args:
+            model_dir: Directory written by convert_translator
+            compute_type: CTranslate2 computation type (int8, int8_float32, float32)
+            device: Device to run on (cpu, cuda)
+        
+        Returns:
+            Shared (tokenizer, ctranslate2.Translator) tuple
+        """
+        def load():
+            import ctranslate2
+            from transformers import AutoTokenizer
+            tokenizer = AutoTokenizer.from_pretrained(model_dir)
+            translator = ctranslate2.Translator(model_dir, device=device, compute_type=compute_type)
+            return tokenizer, translator
+        
+        return self._get(("translator-ct2", model_dir, compute_type, device), load)
+    
+    def get_tts(self, model_name: str = XTTS_MODEL, device: str = "auto"):
+        """
+        Get a Coqui TTS model.
+        
+        The weights must already be in the Coqui model cache (or the Coqui
+        terms of service accepted with COQUI_TOS_AGREED=1 for the download).
+        
+        Args:
+            model_name: Coqui model name
+            device: Device to run on (auto, cpu, cuda)
+        
+        Returns:
+            Shared TTS.api.TTS instance
+        """
+        import torch
+        
+        if device == "auto":
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+        
+        def load():
+            from TTS.api import TTS
+            return TTS(model_name, progress_bar=False).to(device)
+        
+        return self._get(("tts", model_name, "float32", device), load)
+    
+    def preload(
+        self,
+        whisper_model: str = None,
+        translator_model: str = None,
+        whisper_compute_type: str = "auto",
+        device: str = "auto"
+    ):
+        """
+        Load models ahead of the first request.
+        
+        Args:
+            whisper_model: Whisper model size to load (skipped if None)
+            translator_model: Translation model name to load (skipped if None)
+            whisper_compute_type: Computation type for Whisper
+            device: Device for Whisper
+        """
+        if whisper_model:
+            self.get_whisper(whisper_model, compute_type=whisper_compute_type, device=device)
+        if translator_model:
+            self.get_translator(translator_model)
+    
+    def unload(self, kind: str = None, name: str = None) -> int:
+        """
+        Drop cached models so their memory can be released.
+        
+        Args:
+            kind: Only unload this kind ("whisper", "translator", "translator-ct2",
+                "tts"), all if None
+            name: Only unload this model name, all if None
+        
+        Returns:
+            Number of models unloaded
+        """
+        with self._lock:
+            keys = [
+                key for key in self._models
+                if (kind is None or key[0] == kind) and (name is None or key[1] == name)
+            ]
+            for key in keys:
+                del self._models[key]
+        
+        gc.collect()
+        _empty_cuda_cache()
+        return len(keys)
+    
+    def memory_report(self) -> list:
+        """
+        Report the memory held by each cached model.
+        
+        Torch models report the size of their state (parameters, buffers and
+        packed quantized weights); other models report the resident memory
+        growth measured while loading.
+        
+        Returns:
+            List of dicts with kind, name, compute_type, device and memory_bytes
+        """
+        with self._lock:
+            return [
+                {
+                    "kind": kind,
+                    "name": name,
+                    "compute_type": compute_type,
+                    "device": device,
+                    "memory_bytes": entry["memory_bytes"]
+                }
+                for (kind, name, compute_type, device), entry in self._models.items()
+            ]
+
+
+def available_cpus() -> int:
+    """
+    Get the number of CPUs this process may run on.
+    
+    Returns:
+        CPU count honouring the affinity mask where supported
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def whisper_settings(
+    compute_type: str = "auto",
+    device: str = "auto",
+    cpu_threads: int = 0,
+    num_workers: int = 1
+) -> dict:
+    """
+    Resolve Whisper inference settings from the detected hardware.
+    
+    A CUDA device is used when CTranslate2 sees one. The compute type is
+    the fastest the device supports: float16 on GPUs, int8 on CPUs
+    (float32 only where neither is available). On CPU the available cores
+    are divided between the workers.
+    
+    Args:
+        compute_type: Computation type, or "auto"
+        device: Device, or "auto"
+        cpu_threads: Threads per worker, or 0 to derive from the CPU count
+        num_workers: Number of transcriptions that can run in parallel
+    
+    Returns:
+        Dictionary of device, compute_type, cpu_threads and num_workers
+        keyword arguments for WhisperModel
+    """
+    import ctranslate2
+    
+    if device == "auto":
+        device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+    
+    if compute_type == "auto":
+        supported = ctranslate2.get_supported_compute_types(device)
+        preferred = ("float16", "int8_float16", "int8", "float32") if device == "cuda" else ("int8", "int8_float32", "float32")
+        compute_type = next((name for name in preferred if name in supported), "default")
+    
+    num_workers = max(1, num_workers)
+    if device == "cpu" and cpu_threads <= 0:
+        cpu_threads = max(1, available_cpus() // num_workers)
+    
+    return {
+        "device": device,
+        "compute_type": compute_type,
+        "cpu_threads": cpu_threads,
+        "num_workers": num_workers
+    }
+
+
+def _model_bytes(model, rss_delta: int) -> int:
+    """
+    Estimate the memory held by a loaded model.
+    
+    Args:
+        model: Loaded model, or tuple containing one
+        rss_delta: Resident memory growth observed while loading
+    
+    Returns:
+        Memory in bytes
+    """
+    parts = model if isinstance(model, tuple) else (model,)
+    total = 0
+    for part in parts:
+        if hasattr(part, "state_dict") and hasattr(part, "parameters"):
+            total += _state_bytes(part.state_dict().values())
+    return total if total else max(0, rss_delta)
+
+
+def _state_bytes(values) -> int:
+    """Size of the tensors in state dict values (quantized layers store tuples)."""
+    total = 0
+    for value in values:
+        if isinstance(value, (tuple, list)):
+            total += _state_bytes(value)
+        elif hasattr(value, "numel") and hasattr(value, "element_size"):
+            total += value.numel() * value.element_size()
+    return total
+
+
+def _empty_cuda_cache():
+    """Release cached CUDA memory if torch is loaded."""
+    import sys
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+
+# Shared registry used by all services in this process
+registry = ModelRegistry()
+
+
+def get_registry() -> ModelRegistry:
+    """
+    Get the process-wide model registry.
+    
+    Returns:
+        Shared ModelRegistry instance
+    """
+    return registry
+
+
+def preload_models(whisper_model: str = "medium", translator_model: str = "facebook/nllb-200-distilled-600M"):
+    """
+    Convenience function to load the default models into the registry.
+    
+    Args:
+        whisper_model: Whisper model size
+        translator_model: Translation model name
+    """
+    registry.preload(whisper_model=whisper_model, translator_model=translator_model)
+
+
+def unload_models(kind: str = None, name: str = None) -> int:
+    """
+    Convenience function to drop models from the registry.
+    
+    Args:
+        kind: Only unload this kind, all if None
+        name: Only unload this model name, all if None
+    
+    Returns:
+        Number of models unloaded
+    """
+    return registry.unload(kind=kind, name=name)
+
+
+def model_memory_report() -> list:
+    """
+    Convenience function to report memory held by cached models.
+    
+    Returns:
+        List of per-model memory entries
+    """
+    return registry.memory_report()
@@ -3,11 +3,42 @@ Main pipeline module for SuperNan project.
 Orchestrates the complete video dubbing workflow.
 """
 
-from .video_processor import extract_chunk, extract_audio, merge_audio_video
-from .audio_processor import get_duration, adjust_duration, match_audio_duration
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import soundfile as sf
+
+from .video_processor import extract_chunk, extract_audio, load_audio, merge_audio_samples
+from .audio_processor import (
+    OUTPUT_SAMPLE_RATE,
+    load_audio_file,
+    time_stretch,
+    place_segments,
+)
+from .ffmpeg import WHISPER_SAMPLE_RATE
 from .transcriber import TranscriptionService, transcribe_auto
 from .translator import TranslationService, translate_to_hindi
-from .tts import TTSService, generate_hindi_speech
+from .tts import TTSService, generate_hindi_speech, voice_for_language
+from .tts_client import EdgeTTSBackend, HTTPTTSBackend, TTSClient, XTTSBackend
+from .cache import TranslationCache, TTSCache
+from .artifacts import ArtifactStore, file_fingerprint
+from .instrumentation import Tracer
+from .models import XTTS_MODEL
+from .vad import SpeechMap, detect_speech
+from .mixer import mix_over_background
+
+
+# Capacity of each queue between streaming stages
+STREAM_QUEUE_SIZE = 8
+
+# Most segments translated together in streaming mode
+STREAM_TRANSLATE_BATCH = 8
+
+
+# Modes accepted by VideoDubbingPipeline.run
+PIPELINE_MODES = ("clip", "segments", "streaming")
 
 
 class VideoDubbingPipeline:
@@ -19,13 +50,40 @@ class VideoDubbingPipeline:
     4. Generates speech
     5. Matches duration
     6. Merges with video
+    
+    In "segments" mode, steps 3-5 run per Whisper segment: each segment is
+    translated, synthesized and stretched to its own time slot, and the
+    results are placed at their original offsets.
+    
+    "streaming" mode dubs per segment as well, but overlaps the stages:
+    segments are translated as Whisper decodes them and synthesized as soon
+    as their translation is ready, with bounded queues between the stages.
+    
+    With voice activity detection enabled, only the detected speech regions
+    are transcribed, and the dubbed speech is fitted into those regions so
+    pauses, music and other non-speech stay silent.
+    
+    Given several target languages, the chunk is transcribed once, translated
+    into every language in shared batches, synthesized for all languages
+    concurrently, and written as one output with an audio track per language.
     """
     
     def __init__(
         self,
         whisper_model: str = "medium",
         translator_model: str = "facebook/nllb-200-distilled-600M",
-        tts_voice: str = "hi-IN-SwaraNeural"
+        tts_voice: str = "hi-IN-SwaraNeural",
+        translation_cache: TranslationCache = None,
+        tts_cache: TTSCache = None,
+        artifact_store: ArtifactStore = None,
+        translator_backend: str = "torch",
+        whisper_compute_type: str = "auto",
+        whisper_cpu_threads: int = 0,
+        whisper_num_workers: int = 1,
+        vad: bool = False,
+        tts_voices: dict = None,
+        tts_client: TTSClient = None,
+        keep_background: bool = False
     ):
         """
         Initialize the pipeline.
@@ -34,10 +92,41 @@ class VideoDubbingPipeline:
             whisper_model: Whisper model size
             translator_model: NLLB model name
             tts_voice: Edge TTS voice
+            translation_cache: Optional persistent translation cache
+            tts_cache: Optional persistent synthesized-speech cache
+            artifact_store: Optional store of stage outputs; stages whose
+                output is already stored are skipped on reruns
+            translator_backend: Translation inference backend ("torch",
+                "torch-int8" or "ctranslate2")
+            whisper_compute_type: Whisper computation type ("auto" picks
+                int8 on CPU and float16 on CUDA)
+            whisper_cpu_threads: Whisper threads per transcription on CPU (0
+                divides the available cores between whisper_num_workers)
+            whisper_num_workers: Transcriptions that can run in parallel
+            vad: Detect speech regions first and skip everything else
+            tts_voices: Voice per target language for multi-language runs
+                (defaults from tts.LANGUAGE_VOICES)
+            tts_client: Client sending speech synthesis requests (Edge TTS
+                with default limits if None)
+            keep_background: Mix the dubbed speech over the original
+                soundtrack, ducked under speech, instead of replacing it
         """
-        self.transcriber = TranscriptionService(model_size=whisper_model)
-        self.translator = TranslationService(model_name=translator_model)
-        self.tts = TTSService(voice=tts_voice)
+        self.transcriber = TranscriptionService(
+            model_size=whisper_model,
+            compute_type=whisper_compute_type,
+            cpu_threads=whisper_cpu_threads,
+            num_workers=whisper_num_workers
+        )
+        self.translator = TranslationService(
+            model_name=translator_model,
+            cache=translation_cache,
+            backend=translator_backend
+        )
+        self.tts = TTSService(voice=tts_voice, cache=tts_cache, client=tts_client)
+        self.artifacts = artifact_store
+        self.vad = vad
+        self.tts_voices = tts_voices
+        self.keep_background = keep_background
     
     def run(
         self,
@@ -45,7 +134,11 @@ class VideoDubbingPipeline:
         output_video: str,
         start_time: str = "00:00:15",
         end_time: str = "00:00:30",
-        target_lang: str = "hin_Deva"
+        target_lang="hin_Deva",
+        mode: str = "clip",
+        max_workers: int = 4,
+        source_language: str = None,
+        tracer: Tracer = None
     ) -> dict:
         """
         Run the complete dubbing pipeline.
@@ -55,73 +148,802 @@ class VideoDubbingPipeline:
             output_video: Path to save dubbed video
             start_time: Start time for chunk extraction
             end_time: End time for chunk extraction
-            target_lang: Target language code
-            
+            target_lang: Target language code, or list of codes to dub into
+                every language at once (not supported in "streaming" mode)
+            mode: "clip" to dub the chunk as one block, "segments" to dub
+                each Whisper segment separately at its original offset,
+                "streaming" to do the same with the stages overlapped
+            max_workers: Number of segments processed concurrently in
+                "segments" and "streaming" modes and in multi-language runs
+            source_language: Spoken language of the input (detected if None)
+            tracer: Tracer recording per-stage measurements (a new one is
+                created if None); its summary is returned under "metrics"
+        
         Returns:
-            Dictionary with pipeline results and metadata
+            Dictionary with pipeline results and metadata; in multi-language
+            runs "translated_text" maps each language to its translation
         """
-        import os
         import tempfile
         
+        if mode not in PIPELINE_MODES:
+            raise ValueError(f"Unknown pipeline mode: {mode}")
+        multi = not isinstance(target_lang, str)
+        if multi:
+            target_langs = list(target_lang)
+            if not target_langs:
+                raise ValueError("No target languages given")
+            if mode == "streaming":
+                raise ValueError("Streaming mode dubs a single target language")
+        
+        if tracer is None:
+            tracer = Tracer()
+        tracer.caches.update({
+            name: cache for name, cache in (
+                ("translation", self.translator.cache),
+                ("tts", self.tts.cache),
+                ("artifacts", self.artifacts)
+            ) if cache is not None
+        })
+        
         # Create temp directory
         temp_dir = tempfile.mkdtemp()
         
         try:
             # Step 1: Extract chunk
-            chunk_path = os.path.join(temp_dir, "chunk.mp4")
             print("Step 1: Extracting video chunk...")
-            extract_chunk(input_video, chunk_path, start_time, end_time)
+            chunk_key = ArtifactStore.key("chunk", file_fingerprint(input_video), start=start_time, end=end_time)
+            with tracer.stage("extract_chunk"):
+                chunk_path = self._stage_file(
+                    chunk_key, "chunk.mp4", temp_dir,
+                    lambda path: extract_chunk(input_video, path, start_time, end_time)
+                )
             
-            # Step 2: Extract audio
-            audio_path = os.path.join(temp_dir, "original_audio.wav")
+            # Step 2: Decode audio into memory
             print("Step 2: Extracting audio...")
-            extract_audio(chunk_path, audio_path)
-            
-            # Step 3: Transcribe
-            print("Step 3: Transcribing audio...")
-            transcript = self.transcriber.transcribe_to_english(audio_path)
-            print(f"English transcript: {transcript}")
+            audio_key = ArtifactStore.key("audio", chunk_key, sample_rate=WHISPER_SAMPLE_RATE)
+            with tracer.stage("decode_audio"):
+                audio = self._stage_array(audio_key, "audio.npy", lambda: load_audio(chunk_path))
+            original_duration = len(audio) / WHISPER_SAMPLE_RATE
+            tracer.clip_duration = original_duration
             
-            # Step 4: Translate
-            print(f"Step 4: Translating to {target_lang}...")
-            translated_text = self.translator.translate(transcript, target_lang=target_lang)
-            print(f"Translated text: {translated_text}")
+            speech_map = None
+            if self.vad:
+                print("Detecting speech...")
+                with tracer.stage("vad"):
+                    speech_map = SpeechMap(self._stage_json(
+                        ArtifactStore.key("speech_regions", audio_key), "speech_regions.json",
+                        lambda: detect_speech(audio)
+                    ))
+                print(f"Found {len(speech_map.regions)} speech regions "
+                      f"({speech_map.speech_duration:.1f}s of {original_duration:.1f}s)")
             
-            # Step 5: Generate speech
-            tts_path = os.path.join(temp_dir, "generated_speech.wav")
-            print("Step 5: Generating speech...")
-            self.tts.generate_speech(translated_text, tts_path)
+            speaker = self._speaker_reference(audio, temp_dir, speech_map)
             
-            # Step 6: Match duration
-            adjusted_path = os.path.join(temp_dir, "adjusted_speech.wav")
-            print("Step 6: Matching duration...")
-            match_audio_duration(audio_path, tts_path, adjusted_path)
+            if speech_map is not None and not speech_map.regions:
+                print("No speech detected; the dubbed track is silent")
+                silence = place_segments([], original_duration)
+                dubbed = {
+                    "language": source_language,
+                    "transcript": "",
+                    "translated_text": {lang: "" for lang in target_langs} if multi else "",
+                    "segments": None if mode == "clip" else [],
+                    "speech": {lang: silence for lang in target_langs} if multi else silence
+                }
+            elif multi:
+                dubbed = self._dub_languages(
+                    audio, audio_key, original_duration, temp_dir, target_langs,
+                    mode, source_language, max_workers, tracer, speech_map, speaker
+                )
+            elif mode == "segments":
+                dubbed = self._dub_segments(
+                    audio, audio_key, original_duration, temp_dir,
+                    target_lang, source_language, max_workers, tracer, speech_map,
+                    self._tts_for(target_lang, self.tts.voice, speaker)
+                )
+            elif mode == "streaming":
+                dubbed = self._dub_streaming(
+                    audio, original_duration, temp_dir,
+                    target_lang, source_language, max_workers, tracer, speech_map,
+                    self._tts_for(target_lang, self.tts.voice, speaker)
+                )
+            else:
+                dubbed = self._dub_clip(
+                    audio, audio_key, original_duration, temp_dir,
+                    target_lang, source_language, tracer, speech_map,
+                    self._tts_for(target_lang, self.tts.voice, speaker)
+                )
             
             # Step 7: Merge audio and video
             print("Step 7: Creating final output...")
-            merge_audio_video(chunk_path, adjusted_path, output_video)
+            tracks = dubbed["speech"] if multi else {target_lang: dubbed["speech"]}
+            with tracer.stage("merge"):
+                self._merge(chunk_path, tracks, output_video, multi)
             
             return {
                 "success": True,
                 "input_video": input_video,
                 "output_video": output_video,
-                "transcript": transcript,
-                "translated_text": translated_text,
-                "original_duration": get_duration(audio_path),
-                "final_duration": get_duration(adjusted_path)
+                "language": dubbed["language"],
+                "transcript": dubbed["transcript"],
+                "translated_text": dubbed["translated_text"],
+                "segments": dubbed["segments"],
+                "original_duration": original_duration,
+                "final_duration": len(next(iter(tracks.values()))) / OUTPUT_SAMPLE_RATE,
+                "metrics": tracer.metrics()
             }
-            
+        
         finally:
             # Cleanup temp files
             import shutil
             shutil.rmtree(temp_dir, ignore_errors=True)
+            if self.artifacts is not None:
+                self.artifacts.evict()
+    
+    def _stage_file(self, key: str, name: str, temp_dir: str, produce) -> str:
+        """
+        Produce a stage's output file, reusing the artifact store if enabled.
+        
+        Args:
+            key: Artifact key of the stage output
+            name: File name of the output
+            temp_dir: Working directory used when no store is configured
+            produce: Callable writing the output to the path it is given
+        
+        Returns:
+            Path of the output file
+        """
+        if self.artifacts is not None:
+            return self.artifacts.fetch_file(key, name, produce)
+        path = os.path.join(temp_dir, name)
+        produce(path)
+        return path
+    
+    def _stage_json(self, key: str, name: str, compute):
+        """Compute a JSON-serializable stage output, reusing the artifact store if enabled."""
+        if self.artifacts is not None:
+            return self.artifacts.fetch_json(key, name, compute)
+        return compute()
+    
+    def _stage_array(self, key: str, name: str, compute):
+        """Compute a NumPy stage output, reusing the artifact store if enabled."""
+        if self.artifacts is not None:
+            return self.artifacts.fetch_array(key, name, compute)
+        return compute()
+    
+    def _transcribe_stage(
+        self,
+        audio,
+        audio_key: str,
+        source_language: str,
+        tracer: Tracer,
+        speech_map: SpeechMap = None
+    ) -> tuple:
+        """
+        Transcribe the chunk audio to English (artifact-backed).
+        
+        Returns:
+            Tuple of (transcription dict, transcript artifact key)
+        """
+        key = self._transcript_key(audio_key, source_language, speech_map)
+        with tracer.stage("transcribe"):
+            transcription = self._stage_json(
+                key, "transcript.json",
+                lambda: self._transcribe(audio, source_language, speech_map)
+            )
+        return transcription, key
+    
+    def _transcript_key(self, audio_key: str, source_language: str, speech_map: SpeechMap = None) -> str:
+        """Artifact key of the transcript of the chunk audio."""
+        return ArtifactStore.key(
+            "transcript", audio_key,
+            model=self.transcriber.model_size,
+            compute_type=self.transcriber.compute_type,
+            language=source_language,
+            speech_regions=speech_map.regions if speech_map is not None else None
+        )
+    
+    def _transcribe(self, audio, source_language: str, speech_map: SpeechMap = None) -> dict:
+        """
+        Transcribe the chunk audio to English.
+        
+        With a speech map, only the speech regions are transcribed and the
+        segment times are mapped back to the chunk timeline.
+        """
+        if speech_map is None:
+            return self.transcriber.transcribe(audio, task="translate", language=source_language)
+        transcription = self.transcriber.transcribe(
+            speech_map.gather(audio), task="translate", language=source_language
+        )
+        return {**transcription, "segments": speech_map.remap_segments(transcription["segments"])}
+    
+    def _fit(self, samples, start: float, end: float, speech_map: SpeechMap = None):
+        """Stretch dubbed speech over an interval, or into its speech slots with a speech map."""
+        if speech_map is None:
+            return time_stretch(samples, int(round((end - start) * OUTPUT_SAMPLE_RATE)))
+        return speech_map.fit(samples, start, end)
+    
+    def _dub_clip(
+        self,
+        audio,
+        audio_key: str,
+        original_duration: float,
+        temp_dir: str,
+        target_lang: str,
+        source_language: str = None,
+        tracer: Tracer = None,
+        speech_map: SpeechMap = None,
+        tts: TTSService = None
+    ) -> dict:
+        """
+        Dub the whole chunk as a single block of text.
+        
+        Args:
+            audio: Original chunk audio as 16 kHz mono samples
+            audio_key: Artifact key of the chunk audio
+            original_duration: Duration of the chunk audio in seconds
+            temp_dir: Working directory for intermediate files
+            target_lang: Target language code
+            source_language: Spoken language of the audio (detected if None)
+            tracer: Tracer recording per-stage measurements
+            speech_map: Speech regions to transcribe and to fit the dubbed
+                speech into (the whole chunk if None)
+            tts: TTS service speaking the target language (the
+                pipeline's own if None)
+        
+        Returns:
+            Dictionary with language, transcript, translated text,
+            segments (None in this mode) and the duration-matched speech
+            samples at OUTPUT_SAMPLE_RATE
+        """
+        if tracer is None:
+            tracer = Tracer()
+        if tts is None:
+            tts = self.tts
+        
+        # Step 3: Transcribe
+        print("Step 3: Transcribing audio...")
+        transcription, transcript_key = self._transcribe_stage(
+            audio, audio_key, source_language, tracer, speech_map
+        )
+        transcript = transcription["text"]
+        print(f"English transcript: {transcript}")
+        
+        # Step 4: Translate
+        print(f"Step 4: Translating to {target_lang}...")
+        translation_key = ArtifactStore.key(
+            "translation", transcript_key, model=self.translator.model_name,
+            backend=self.translator.backend, target_lang=target_lang
+        )
+        with tracer.stage("translate"):
+            translated_text = self._stage_json(
+                translation_key, "translation.json",
+                lambda: self.translator.translate(transcript, target_lang=target_lang)
+            )
+        print(f"Translated text: {translated_text}")
+        
+        # Steps 5-6: Generate speech and match duration in memory; a stored
+        # adjusted track skips synthesis entirely
+        tts_key = ArtifactStore.key("tts", translation_key, voice=tts.voice, **tts.options)
+        adjusted_key = ArtifactStore.key(
+            "adjusted", tts_key, duration=original_duration,
+            speech_regions=speech_map.regions if speech_map is not None else None
+        )
+        
+        def synthesize_and_fit():
+            print("Step 5: Generating speech...")
+            with tracer.stage("synthesize"):
+                tts_path = self._stage_file(
+                    tts_key, "generated_speech.wav", temp_dir,
+                    lambda path: tts.generate_speech(translated_text, path)
+                )
+            print("Step 6: Matching duration...")
+            with tracer.stage("fit_duration"):
+                return self._fit(load_audio_file(tts_path), 0.0, original_duration, speech_map)
+        
+        speech = self._stage_array(adjusted_key, "adjusted_speech.npy", synthesize_and_fit)
+        
+        return {
+            "language": transcription["language"],
+            "transcript": transcript,
+            "translated_text": translated_text,
+            "segments": None,
+            "speech": speech
+        }
+    
+    def _dub_segments(
+        self,
+        audio,
+        audio_key: str,
+        original_duration: float,
+        temp_dir: str,
+        target_lang: str,
+        source_language: str = None,
+        max_workers: int = 4,
+        tracer: Tracer = None,
+        speech_map: SpeechMap = None,
+        tts: TTSService = None
+    ) -> dict:
+        """
+        Dub each Whisper segment separately and place it at its offset.
+        
+        Args:
+            audio: Original chunk audio as 16 kHz mono samples
+            audio_key: Artifact key of the chunk audio
+            original_duration: Duration of the chunk audio in seconds
+            temp_dir: Working directory for intermediate files
+            target_lang: Target language code
+            source_language: Spoken language of the audio (detected if None)
+            max_workers: Number of segments processed concurrently
+            tracer: Tracer recording per-stage measurements
+            speech_map: Speech regions to transcribe and to fit each dubbed
+                segment into (the whole segment if None)
+            tts: TTS service speaking the target language (the
+                pipeline's own if None)
+        
+        Returns:
+            Dictionary with language, transcript, translated text, the
+            dubbed segment list and the assembled speech samples at
+            OUTPUT_SAMPLE_RATE
+        """
+        if tracer is None:
+            tracer = Tracer()
+        if tts is None:
+            tts = self.tts
+        
+        # Step 3: Transcribe
+        print("Step 3: Transcribing audio into segments...")
+        transcription, transcript_key = self._transcribe_stage(
+            audio, audio_key, source_language, tracer, speech_map
+        )
+        segments = [segment for segment in transcription["segments"] if segment["text"]]
+        print(f"Found {len(segments)} segments")
+        
+        # Step 4: Translate all segments in batches
+        print(f"Step 4: Translating segments to {target_lang}...")
+        translation_key = ArtifactStore.key(
+            "segment_translations", transcript_key, model=self.translator.model_name,
+            backend=self.translator.backend, target_lang=target_lang
+        )
+        with tracer.stage("translate", segments=len(segments)):
+            translations = self._stage_json(
+                translation_key, "translations.json",
+                lambda: self.translator.translate_batch(
+                    [segment["text"] for segment in segments], target_lang=target_lang
+                )
+            )
+        dubbed = [
+            {**segment, "translated_text": translated}
+            for segment, translated in zip(segments, translations)
+        ]
+        
+        # Steps 5-6 run per segment; a stored adjusted track skips them
+        tts_options = {"voice": tts.voice, **tts.options}
+        adjusted_key = ArtifactStore.key(
+            "segment_adjusted", translation_key, duration=original_duration,
+            speech_regions=speech_map.regions if speech_map is not None else None, **tts_options
+        )
+        
+        def dub_segment(index: int, segment: dict):
+            tts_key = ArtifactStore.key("segment_tts", translation_key, index=index, **tts_options)
+            tts_path = self._stage_file(
+                tts_key, f"segment_{index:04d}_speech.wav", temp_dir,
+                lambda path: tts.generate_speech(segment["translated_text"], path)
+            )
+            samples = self._fit(load_audio_file(tts_path), segment["start"], segment["end"], speech_map)
+            return {"start": segment["start"], "samples": samples}
+        
+        def synthesize_and_place():
+            print("Steps 5-6: Synthesizing and fitting segments...")
+            with tracer.stage("synthesize", segments=len(dubbed)):
+                with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                    placed = list(executor.map(dub_segment, range(len(dubbed)), dubbed))
+                return place_segments(placed, original_duration)
+        
+        speech = self._stage_array(adjusted_key, "adjusted_speech.npy", synthesize_and_place)
+        
+        return {
+            "language": transcription["language"],
+            "transcript": " ".join(segment["text"] for segment in dubbed),
+            "translated_text": " ".join(segment["translated_text"] for segment in dubbed),
+            "segments": dubbed,
+            "speech": speech
+        }
+    
+    def _merge(self, chunk_path: str, tracks: dict, output_video: str, tag_languages: bool = False):
+        """
+        Mix the dubbed tracks and mux them with the chunk video in one encode.
+        
+        Args:
+            chunk_path: Path to the chunk video
+            tracks: Dubbed mono samples at OUTPUT_SAMPLE_RATE per language
+            output_video: Path to save the dubbed video
+            tag_languages: Tag each audio track with its language
+        """
+        speech_tracks = list(tracks.values())
+        if self.keep_background:
+            background = load_audio(chunk_path, sample_rate=OUTPUT_SAMPLE_RATE, channels=2)
+            speech_tracks = [mix_over_background(speech, background) for speech in speech_tracks]
+        merge_audio_samples(
+            chunk_path, speech_tracks, output_video, OUTPUT_SAMPLE_RATE,
+            languages=[lang.split("_")[0] for lang in tracks] if tag_languages else None
+        )
+    
+    def _speaker_reference(self, audio, temp_dir: str, speech_map: SpeechMap = None) -> str:
+        """
+        Write the original speech for voice-cloning TTS backends to condition on.
+        
+        Args:
+            audio: Original chunk audio as 16 kHz mono samples
+            temp_dir: Working directory for intermediate files
+            speech_map: Speech regions; only these are written if given
+        
+        Returns:
+            Path to the reference recording, or None if the TTS backend
+            does not clone voices
+        """
+        client = getattr(self.tts, "client", None)
+        if client is None or not client.backend.clones_voice:
+            return None
+        path = os.path.join(temp_dir, "speaker.wav")
+        sf.write(path, speech_map.gather(audio) if speech_map is not None else audio, WHISPER_SAMPLE_RATE)
+        return path
+    
+    def _tts_for(self, lang: str, voice: str = None, speaker: str = None):
+        """
+        Get the TTS service speaking a target language.
+        
+        Args:
+            lang: Target language code
+            voice: Voice to use (from tts_voices or the language default if None)
+            speaker: Reference recording of the original speaker
+        
+        Returns:
+            The pipeline's own service when it fits, otherwise a variant of
+            it; voice-cloning backends also get the language and speaker
+        """
+        voice = voice or voice_for_language(lang, self.tts_voices)
+        client = getattr(self.tts, "client", None)
+        if client is not None and client.backend.clones_voice:
+            return self.tts.variant(voice=voice, language=lang, speaker=speaker)
+        if voice == self.tts.voice:
+            return self.tts
+        return self.tts.variant(voice=voice)
+    
+    def _dub_languages(
+        self,
+        audio,
+        audio_key: str,
+        original_duration: float,
+        temp_dir: str,
+        target_langs: list,
+        mode: str = "clip",
+        source_language: str = None,
+        max_workers: int = 4,
+        tracer: Tracer = None,
+        speech_map: SpeechMap = None,
+        speaker: str = None
+    ) -> dict:
+        """
+        Dub the chunk into several languages from one transcription.
+        
+        The texts (the whole transcript in "clip" mode, each Whisper segment
+        in "segments" mode) are translated into all languages with shared
+        batches. Every language is then synthesized in its own thread, with
+        segments of all languages sharing a pool of max_workers TTS workers.
+        
+        Args:
+            audio: Original chunk audio as 16 kHz mono samples
+            audio_key: Artifact key of the chunk audio
+            original_duration: Duration of the chunk audio in seconds
+            temp_dir: Working directory for intermediate files
+            target_langs: Target language codes
+            mode: "clip" or "segments"
+            source_language: Spoken language of the audio (detected if None)
+            max_workers: Number of segments synthesized concurrently
+            tracer: Tracer recording per-stage measurements
+            speech_map: Speech regions to transcribe and to fit the dubbed
+                speech into (the whole chunk or segment if None)
+            speaker: Reference recording of the original speaker for
+                voice-cloning TTS backends
+        
+        Returns:
+            Dictionary with language, transcript, translated text per
+            language, segments (None in "clip" mode, otherwise with a
+            "translations" dict per segment) and the speech samples per
+            language at OUTPUT_SAMPLE_RATE
+        """
+        if tracer is None:
+            tracer = Tracer()
+        
+        # Step 3: Transcribe once for all languages
+        print("Step 3: Transcribing audio...")
+        transcription, transcript_key = self._transcribe_stage(
+            audio, audio_key, source_language, tracer, speech_map
+        )
+        if mode == "clip":
+            segments = [{"start": 0.0, "end": original_duration, "text": transcription["text"]}]
+        else:
+            segments = [segment for segment in transcription["segments"] if segment["text"]]
+        print(f"English transcript: {transcription['text']}")
+        
+        # Step 4: Translate into every language in shared batches
+        print(f"Step 4: Translating to {', '.join(target_langs)}...")
+        translation_key = ArtifactStore.key(
+            "multi_translations", transcript_key, model=self.translator.model_name,
+            backend=self.translator.backend, target_langs=target_langs, mode=mode
+        )
+        with tracer.stage("translate", segments=len(segments), languages=len(target_langs)):
+            translations = self._stage_json(
+                translation_key, "translations.json",
+                lambda: self.translator.translate_multi(
+                    [segment["text"] for segment in segments], target_langs
+                )
+            )
+        
+        # Steps 5-6: Synthesize and fit every language concurrently
+        print("Steps 5-6: Synthesizing speech for every language...")
+        services = {lang: self._tts_for(lang, speaker=speaker) for lang in target_langs}
+        segment_pool = ThreadPoolExecutor(max_workers=max(1, max_workers))
+        
+        def dub_language(lang: str):
+            tts = services[lang]
+            tts_options = {"voice": tts.voice, **tts.options}
+            track_key = ArtifactStore.key(
+                "dubbed_track", translation_key, lang=lang, duration=original_duration,
+                speech_regions=speech_map.regions if speech_map is not None else None, **tts_options
+            )
+            
+            def dub_segment(index: int, segment: dict, text: str):
+                tts_key = ArtifactStore.key("segment_tts", translation_key, lang=lang, index=index, **tts_options)
+                tts_path = self._stage_file(
+                    tts_key, f"{lang}_segment_{index:04d}_speech.wav", temp_dir,
+                    lambda path: tts.generate_speech(text, path)
+                )
+                samples = self._fit(load_audio_file(tts_path), segment["start"], segment["end"], speech_map)
+                return {"start": segment["start"], "samples": samples}
+            
+            def synthesize_and_place():
+                with tracer.stage("synthesize", language=lang, segments=len(segments)):
+                    placed = list(segment_pool.map(dub_segment, range(len(segments)), segments, translations[lang]))
+                    return place_segments(placed, original_duration)
+            
+            return self._stage_array(track_key, f"adjusted_speech_{lang}.npy", synthesize_and_place)
+        
+        with segment_pool, ThreadPoolExecutor(max_workers=len(target_langs)) as language_pool:
+            speech = dict(zip(target_langs, language_pool.map(dub_language, target_langs)))
+        
+        return {
+            "language": transcription["language"],
+            "transcript": transcription["text"] if mode == "clip" else " ".join(segment["text"] for segment in segments),
+            "translated_text": {lang: " ".join(translations[lang]) for lang in target_langs},
+            "segments": None if mode == "clip" else [
+                {**segment, "translations": {lang: translations[lang][index] for lang in target_langs}}
+                for index, segment in enumerate(segments)
+            ],
+            "speech": speech
+        }
+    
+    def _dub_streaming(
+        self,
+        audio,
+        original_duration: float,
+        temp_dir: str,
+        target_lang: str,
+        source_language: str = None,
+        max_workers: int = 4,
+        tracer: Tracer = None,
+        speech_map: SpeechMap = None,
+        tts: TTSService = None
+    ) -> dict:
+        """
+        Dub each Whisper segment with transcription, translation and speech
+        synthesis overlapped.
+        
+        Whisper segments are pushed to a translator thread as they are
+        decoded; the translator takes whatever has queued up (at most
+        STREAM_TRANSLATE_BATCH segments) per batch and hands each result to
+        a pool of TTS workers. Queues hold at most STREAM_QUEUE_SIZE items,
+        so a slow stage holds back the stages before it. Stage outputs are
+        not stored in the artifact store in this mode.
+        
+        Args:
+            audio: Original chunk audio as 16 kHz mono samples
+            original_duration: Duration of the chunk audio in seconds
+            temp_dir: Working directory for intermediate files
+            target_lang: Target language code
+            source_language: Spoken language of the audio (detected if None)
+            max_workers: Number of TTS workers
+            tracer: Tracer recording per-stage measurements
+            speech_map: Speech regions to transcribe and to fit each dubbed
+                segment into (the whole segment if None)
+            tts: TTS service speaking the target language (the
+                pipeline's own if None)
+        
+        Returns:
+            Dictionary with language, transcript, translated text, the
+            dubbed segment list and the assembled speech samples at
+            OUTPUT_SAMPLE_RATE
+        """
+        if tracer is None:
+            tracer = Tracer()
+        if tts is None:
+            tts = self.tts
+        
+        print("Steps 3-6: Streaming transcription, translation and speech synthesis...")
+        to_translate = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+        to_synthesize = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+        stop = threading.Event()
+        errors = []
+        dubbed = {}
+        workers = max(1, max_workers)
+        
+        def put(target: queue.Queue, item):
+            # Give up instead of blocking forever if a later stage failed
+            while not stop.is_set():
+                try:
+                    target.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+        
+        def translate_worker():
+            try:
+                with tracer.stage("translate"):
+                    finished = False
+                    while not finished and not stop.is_set():
+                        batch = [to_translate.get()]
+                        while len(batch) < STREAM_TRANSLATE_BATCH:
+                            try:
+                                batch.append(to_translate.get_nowait())
+                            except queue.Empty:
+                                break
+                        if batch[-1] is None:
+                            finished = True
+                            batch.pop()
+                        if not batch:
+                            continue
+                        
+                        translations = self.translator.translate_batch(
+                            [segment["text"] for _, segment in batch], target_lang=target_lang
+                        )
+                        for (index, segment), translated in zip(batch, translations):
+                            put(to_synthesize, (index, {**segment, "translated_text": translated}))
+            except Exception as e:
+                errors.append(e)
+                stop.set()
+            finally:
+                for _ in range(workers):
+                    put(to_synthesize, None)
+        
+        def synthesize_worker():
+            try:
+                with tracer.stage("synthesize"):
+                    while not stop.is_set():
+                        item = to_synthesize.get()
+                        if item is None:
+                            break
+                        index, segment = item
+                        tts_path = os.path.join(temp_dir, f"segment_{index:04d}_speech.wav")
+                        tts.generate_speech(segment["translated_text"], tts_path)
+                        segment["samples"] = self._fit(
+                            load_audio_file(tts_path), segment["start"], segment["end"], speech_map
+                        )
+                        dubbed[index] = segment
+            except Exception as e:
+                errors.append(e)
+                stop.set()
+        
+        threads = [threading.Thread(target=translate_worker, daemon=True)]
+        threads += [threading.Thread(target=synthesize_worker, daemon=True) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        
+        try:
+            with tracer.stage("transcribe"):
+                if speech_map is not None:
+                    audio = speech_map.gather(audio)
+                info, segments = self.transcriber.transcribe_stream(audio, task="translate", language=source_language)
+                index = 0
+                for segment in segments:
+                    if stop.is_set():
+                        break
+                    if speech_map is not None:
+                        segment = speech_map.remap_segments([segment])[0]
+                    if segment["text"]:
+                        put(to_translate, (index, segment))
+                        index += 1
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            put(to_translate, None)
+            if stop.is_set():
+                # Wake workers blocked on empty queues
+                for target, count in ((to_translate, 1), (to_synthesize, workers)):
+                    for _ in range(count):
+                        try:
+                            target.put_nowait(None)
+                        except queue.Full:
+                            pass
+            for thread in threads:
+                thread.join()
+        
+        if errors:
+            raise errors[0]
+        
+        ordered = [dubbed[index] for index in sorted(dubbed)]
+        speech = place_segments(ordered, original_duration)
+        for segment in ordered:
+            segment.pop("samples")
+        print(f"Dubbed {len(ordered)} segments")
+        
+        return {
+            "language": info["language"],
+            "transcript": " ".join(segment["text"] for segment in ordered),
+            "translated_text": " ".join(segment["translated_text"] for segment in ordered),
+            "segments": ordered,
+            "speech": speech
+        }
+
+
+def create_pipeline(
+    translation_cache: str = None,
+    tts_cache: str = None,
+    artifact_dir: str = None,
+    tts_url: str = None,
+    tts_concurrency: int = 8,
+    tts_rate: float = None,
+    local_tts: bool = False,
+    tts_model: str = XTTS_MODEL,
+    **kwargs
+) -> VideoDubbingPipeline:
+    """
+    Build a pipeline from plain, picklable options.
+    
+    Used by worker processes, which cannot receive open cache objects.
+    
+    Args:
+        translation_cache: Path to a translation cache file (disabled if None)
+        tts_cache: Path to a TTS cache file (disabled if None)
+        artifact_dir: Directory of a stage artifact store (disabled if None)
+        tts_url: Endpoint of an HTTP synthesis service (Edge TTS if None)
+        tts_concurrency: Speech synthesis requests in flight at once
+        tts_rate: Speech synthesis requests per second (unlimited if None)
+        local_tts: Synthesize with a local XTTS model that clones the
+            original speaker's voice, without network access
+        tts_model: Coqui model name used with local_tts
+        **kwargs: Passed to VideoDubbingPipeline
+    
+    Returns:
+        New pipeline
+    """
+    return VideoDubbingPipeline(
+        translation_cache=TranslationCache(translation_cache) if translation_cache else None,
+        tts_cache=TTSCache(tts_cache) if tts_cache else None,
+        artifact_store=ArtifactStore(artifact_dir) if artifact_dir else None,
+        tts_client=_tts_client(tts_url, tts_concurrency, tts_rate, local_tts, tts_model),
+        **kwargs
+    )
+
+
+def _tts_client(url: str, concurrency: int, rate: float, local: bool, model_name: str) -> TTSClient:
+    """Build the TTS client configured by create_pipeline's options."""
+    if local:
+        # Requests wait in the model's queue, so only inference errors end them
+        return TTSClient(XTTSBackend(model_name, batch_size=concurrency), max_concurrency=concurrency, timeout=None)
+    return TTSClient(
+        HTTPTTSBackend(url) if url else EdgeTTSBackend(),
+        max_concurrency=concurrency,
+        rate=rate
+    )
 
 
 def run_pipeline(
     input_video: str,
     output_video: str,
     start_time: str = "00:00:15",
-    end_time: str = "00:00:30"
+    end_time: str = "00:00:30",
+    mode: str = "clip"
 ) -> dict:
     """
     Convenience function to run the complete dubbing pipeline.
@@ -131,10 +953,11 @@ def run_pipeline(
         output_video: Path to save dubbed video
         start_time: Start time for chunk
         end_time: End time for chunk
-        
+        mode: "clip", "segments" or "streaming" (see VideoDubbingPipeline.run)
+    
     Returns:
         Pipeline results
     """
     pipeline = VideoDubbingPipeline()
-    return pipeline.run(input_video, output_video, start_time, end_time)
+    return pipeline.run(input_video, output_video, start_time, end_time, mode=mode)
 
@@ -0,0 +1,201 @@
+"""
+Dubbing server module for SuperNan project.
+Keeps a warm VideoDubbingPipeline and serves dubbing jobs over local HTTP.
+"""
+
+import json
+import os
+import re
+import socketserver
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .jobs import JobQueue, QueueFullError
+from .pipeline import PIPELINE_MODES, VideoDubbingPipeline
+from .translator import LANGUAGE_ALIASES, SUPPORTED_LANGUAGES, resolve_language
+
+
+class DubbingService:
+    """
+    Warm dubbing worker: one loaded pipeline behind a bounded job queue.
+    """
+    
+    def __init__(self, pipeline: VideoDubbingPipeline = None, max_workers: int = 1, max_pending: int = 100):
+        """
+        Initialize the service.
+        
+        Args:
+            pipeline: Pipeline used for all jobs (a default one is built if None)
+            max_workers: Number of jobs dubbed concurrently
+            max_pending: Maximum number of queued jobs
+        """
+        self.pipeline = pipeline or VideoDubbingPipeline()
+        self.jobs = JobQueue(self._run_job, max_workers=max_workers, max_pending=max_pending)
+    
+    def submit(self, params: dict) -> dict:
+        """
+        Validate and queue a dubbing job.
+        
+        Args:
+            params: Dict with "input", "output" and optional "start", "end",
+                "target_lang" and "mode"
+        
+        Returns:
+            The queued job record
+        
+        Raises:
+            ValueError: If the parameters are invalid
+            QueueFullError: If the queue is full
+        """
+        for field in ("input", "output"):
+            if not params.get(field):
+                raise ValueError(f"Missing required field: {field}")
+        
+        if not os.path.exists(params["input"]):
+            raise ValueError(f"Input file '{params['input']}' not found")
+        
+        target_lang = params.get("target_lang", "hin_Deva")
+        if not isinstance(target_lang, str) or (target_lang not in SUPPORTED_LANGUAGES and target_lang not in LANGUAGE_ALIASES):
+            raise ValueError(f"Unsupported target language: {target_lang}")
+        mode = params.get("mode", "clip")
+        if mode not in PIPELINE_MODES:
+            raise ValueError(f"Unknown mode: {mode} (expected one of {', '.join(PIPELINE_MODES)})")
+        
+        job = {
+            "input": params["input"],
+            "output": params["output"],
+            "start": params.get("start", "00:00:15"),
+            "end": params.get("end", "00:00:30"),
+            "target_lang": resolve_language(target_lang),
+            "mode": mode
+        }
+        return self.jobs.submit(job)
+    
+    def _run_job(self, job: dict) -> dict:
+        """Run one job on the warm pipeline."""
+        return self.pipeline.run(
+            job["input"],
+            job["output"],
+            job["start"],
+            job["end"],
+            job["target_lang"],
+            mode=job["mode"]
+        )
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """JSON API for a DubbingService."""
+    
+    server_version = "SuperNan"
+    
+    def do_GET(self):
+        service = self.server.service
+        
+        if self.path == "/health":
+            self._send(200, {"status": "ok", "jobs": service.jobs.counts()})
+        elif self.path == "/jobs":
+            self._send(200, {"jobs": service.jobs.list()})
+        else:
+            match = re.fullmatch(r"/jobs/([\w-]+)", self.path)
+            job = service.jobs.get(match.group(1)) if match else None
+            if job is None:
+                self._send(404, {"error": "Not found"})
+            else:
+                self._send(200, job)
+    
+    def do_POST(self):
+        if self.path != "/jobs":
+            self._send(404, {"error": "Not found"})
+            return
+        
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            params = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(params, dict):
+                raise ValueError("Request body must be a JSON object")
+            job = self.server.service.submit(params)
+        except QueueFullError as e:
+            self._send(503, {"error": str(e)})
+        except ValueError as e:
+            self._send(400, {"error": str(e)})
+        else:
+            self._send(202, job)
+    
+    def _send(self, status: int, body: dict):
+        payload = json.dumps(body, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threading HTTP server bound to a Unix domain socket."""
+    
+    daemon_threads = True
+
+
+def create_server(service: DubbingService, host: str = "127.0.0.1", port: int = 8765, socket_path: str = None):
+    """
+    Create an HTTP server for a dubbing service.
+    
+    Args:
+        service: Service handling the jobs
+        host: Host to bind when serving over TCP
+        port: Port to bind when serving over TCP
+        socket_path: Serve on this Unix socket instead of TCP
+    
+    Returns:
+        Server object; call serve_forever() to start it
+    """
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = _UnixHTTPServer(socket_path, _RequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), _RequestHandler)
+    
+    server.service = service
+    return server
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: str = None,
+    max_workers: int = 1,
+    max_pending: int = 100,
+    pipeline: VideoDubbingPipeline = None
+):
+    """
+    Run the dubbing server until interrupted.
+    
+    Args:
+        host: Host to bind when serving over TCP
+        port: Port to bind when serving over TCP
+        socket_path: Serve on this Unix socket instead of TCP
+        max_workers: Number of jobs dubbed concurrently
+        max_pending: Maximum number of queued jobs
+        pipeline: Pipeline to keep warm (a default one is built if None)
+    """
+    if pipeline is None:
+        print("Loading models...")
+    service = DubbingService(pipeline, max_workers=max_workers, max_pending=max_pending)
+    server = create_server(service, host, port, socket_path)
+    
+    address = socket_path or f"http://{host}:{port}"
+    print(f"SuperNan server listening on {address}")
+    
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Shutting down...")
+    finally:
+        server.server_close()
+        service.jobs.shutdown(wait=False)
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
@@ -3,65 +3,228 @@ Speech recognition module for SuperNan project.
 Transcribes audio to text using Faster Whisper.
 """
 
-from faster_whisper import WhisperModel
+import bisect
+
+import numpy as np
+
+from .ffmpeg import WHISPER_SAMPLE_RATE, decode_audio
+from .models import get_registry, whisper_settings
+
+
+# Longest window Whisper decodes at once, in seconds
+WHISPER_WINDOW_SECONDS = 30.0
 
 
 class TranscriptionService:
     """Service for transcribing audio to text."""
     
-    def __init__(self, model_size: str = "medium", compute_type: str = "float32"):
+    def __init__(
+        self,
+        model_size: str = "medium",
+        compute_type: str = "auto",
+        device: str = "auto",
+        cpu_threads: int = 0,
+        num_workers: int = 1,
+        beam_size: int = 5
+    ):
         """
         Initialize the transcription service.
         
+        The Whisper model comes from the shared model registry, so services
+        with the same settings reuse one loaded model. "auto" settings are
+        chosen from the hardware: int8 on CPU, float16 on CUDA, and all
+        available cores shared between the workers.
+        
         Args:
             model_size: Whisper model size (tiny, base, small, medium, large)
-            compute_type: Computation type (float32, float16, int8)
+            compute_type: Computation type (auto, float32, float16, int8)
+            device: Device to run on (auto, cpu, cuda)
+            cpu_threads: Threads per worker on CPU (0 for automatic)
+            num_workers: Transcriptions that can run in parallel (e.g. from
+                the pipeline's thread pool or the server's job workers)
+            beam_size: Beam size for decoding (1 for greedy)
         """
-        self.model = WhisperModel(model_size, compute_type=compute_type)
+        settings = whisper_settings(compute_type, device, cpu_threads, num_workers)
+        self.model_size = model_size
+        self.compute_type = settings["compute_type"]
+        self.device = settings["device"]
+        self.beam_size = beam_size
+        self.model = get_registry().get_whisper(model_size, **settings)
+        self._batched = None
     
-    def transcribe(self, audio_path: str, task: str = "translate", language: str = None) -> dict:
+    def transcribe_stream(self, audio_path, task: str = "translate", language: str = None) -> tuple:
         """
-        Transcribe audio file.
+        Start transcribing and yield segments as Whisper decodes them.
+        
+        Language detection runs before this returns; segment decoding only
+        advances as the returned generator is consumed.
         
         Args:
-            audio_path: Path to audio file
+            audio_path: Path to audio file, or 16 kHz mono float32 samples
             task: "transcribe" or "translate"
             language: Source language (auto-detected if None)
-            
+        
         Returns:
-            Dictionary with transcript, language, and language probability
+            Tuple of (dict with language and language probability,
+            generator of segment dicts with "start", "end" and "text")
         """
         segments, info = self.model.transcribe(
             audio_path,
             task=task,
-            language=language
+            language=language,
+            beam_size=self.beam_size
         )
         
         print(f"Detected language: {info.language}")
         print(f"Language probability: {info.language_probability}")
         
-        full_text = ""
-        for segment in segments:
-            full_text += segment.text + " "
+        def timed_segments():
+            for segment in segments:
+                yield {
+                    "start": segment.start,
+                    "end": segment.end,
+                    "text": segment.text.strip()
+                }
+        
+        return {"language": info.language, "language_probability": info.language_probability}, timed_segments()
+    
+    def transcribe(self, audio_path, task: str = "translate", language: str = None) -> dict:
+        """
+        Transcribe audio file.
+        
+        Args:
+            audio_path: Path to audio file, or 16 kHz mono float32 samples
+            task: "transcribe" or "translate"
+            language: Source language (auto-detected if None)
+        
+        Returns:
+            Dictionary with transcript, timed segments, language, and
+            language probability
+        """
+        info, segments = self.transcribe_stream(audio_path, task=task, language=language)
+        timed_segments = list(segments)
         
         return {
-            "text": full_text.strip(),
-            "language": info.language,
-            "language_probability": info.language_probability
+            "text": " ".join(segment["text"] for segment in timed_segments if segment["text"]),
+            "segments": timed_segments,
+            **info
         }
     
-    def transcribe_to_english(self, audio_path: str) -> str:
+    def transcribe_many(
+        self,
+        audio_paths: list,
+        task: str = "translate",
+        language: str = None,
+        batch_size: int = 16
+    ) -> list:
         """
-        Transcribe and translate audio to English.
+        Transcribe many audio files with batched inference.
+        
+        Files are cut into windows of at most 30 seconds, and windows from
+        all files that share a language are decoded together in batches of
+        batch_size by faster-whisper's BatchedInferencePipeline. This suits
+        many short clips; each window is decoded independently, so speech
+        crossing a 30-second boundary in a long file may be split.
         
         Args:
-            audio_path: Path to audio file
+            audio_paths: Audio file paths or 16 kHz mono float32 arrays
+            task: "transcribe" or "translate"
+            language: Source language of all files (detected per file if None)
+            batch_size: Number of windows decoded together
+        
+        Returns:
+            One dictionary per input, as returned by transcribe
+        """
+        from faster_whisper import BatchedInferencePipeline
+        
+        if self._batched is None:
+            self._batched = BatchedInferencePipeline(model=self.model)
+        
+        audios = [
+            audio if isinstance(audio, np.ndarray) else decode_audio(audio)
+            for audio in audio_paths
+        ]
+        results = [
+            {"text": "", "segments": [], "language": language, "language_probability": 1.0}
+            for _ in audios
+        ]
+        
+        # Group files by language, since a batch is decoded in one language
+        groups = {}
+        for index, audio in enumerate(audios):
+            if len(audio) == 0:
+                continue
+            if language is None:
+                detected, probability, _ = self.model.detect_language(audio)
+                results[index]["language"] = detected
+                results[index]["language_probability"] = probability
+            groups.setdefault(results[index]["language"], []).append(index)
+        
+        for group_language, indices in groups.items():
+            # Lay the files end to end and mark each window as a clip
+            offsets = []
+            clips = []
+            offset = 0.0
+            for index in indices:
+                duration = len(audios[index]) / WHISPER_SAMPLE_RATE
+                offsets.append(offset)
+                start = 0.0
+                while start < duration:
+                    end = min(start + WHISPER_WINDOW_SECONDS, duration)
+                    clips.append({"start": offset + start, "end": offset + end})
+                    start = end
+                offset += duration
+            
+            segments, _ = self._batched.transcribe(
+                np.concatenate([audios[index] for index in indices]),
+                task=task,
+                language=group_language,
+                beam_size=self.beam_size,
+                batch_size=batch_size,
+                clip_timestamps=clips,
+                vad_filter=False
+            )
             
+            for segment in segments:
+                position = bisect.bisect_right(offsets, segment.start + 1e-6) - 1
+                index = indices[max(0, position)]
+                file_offset = offsets[max(0, position)]
+                results[index]["segments"].append({
+                    "start": segment.start - file_offset,
+                    "end": segment.end - file_offset,
+                    "text": segment.text.strip()
+                })
+        
+        for result in results:
+            result["text"] = " ".join(segment["text"] for segment in result["segments"] if segment["text"])
+        
+        return results
+    
+    def transcribe_to_english(self, audio_path) -> str:
+        """
+        Transcribe and translate audio to English.
+        
+        Args:
+            audio_path: Path to audio file, or 16 kHz mono float32 samples
+        
         Returns:
             English transcript
         """
         result = self.transcribe(audio_path, task="translate")
         return result["text"]
+    
+    def transcribe_segments_to_english(self, audio_path) -> list:
+        """
+        Transcribe and translate audio to English, keeping segment timing.
+        
+        Args:
+            audio_path: Path to audio file, or 16 kHz mono float32 samples
+        
+        Returns:
+            List of segment dicts with "start", "end" (seconds) and "text"
+        """
+        result = self.transcribe(audio_path, task="translate")
+        return [segment for segment in result["segments"] if segment["text"]]
 
 
 def transcribe_auto(audio_path: str, model_size: str = "medium") -> str:
@@ -71,7 +234,7 @@ def transcribe_auto(audio_path: str, model_size: str = "medium") -> str:
     Args:
         audio_path: Path to audio file
         model_size: Whisper model size
-        
+    
     Returns:
         English transcript
     """
@@ -3,49 +3,286 @@ Translation module for SuperNan project.
 Translates text between languages using NLLB model.
 """
 
-import torch
-from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+import os
+import re
+import threading
+from typing import Optional
+
+from .cache import TranslationCache
+from .models import get_registry
+
+
+# Inference backends selectable on TranslationService
+BACKENDS = ("torch", "torch-int8", "ctranslate2")
+
+# Directory holding models converted with convert_translator
+CONVERTED_MODELS_DIR = ".supernan_models"
+
+# Registry tokenizers are shared between services and threads, and the
+# source language is set on the tokenizer itself, so setting it and
+# encoding hold this lock (generation runs outside it)
+_TOKENIZER_LOCK = threading.Lock()
 
 
 class TranslationService:
     """Service for translating text between languages."""
     
-    def __init__(self, model_name: str = "facebook/nllb-200-distilled-600M"):
+    def __init__(
+        self,
+        model_name: str = "facebook/nllb-200-distilled-600M",
+        cache: Optional[TranslationCache] = None,
+        device: str = "cpu",
+        backend: str = "torch"
+    ):
         """
         Initialize the translation service.
         
+        The tokenizer and model come from the shared model registry, so
+        services with the same settings reuse one loaded model.
+        
+        Backends:
+            "torch": full-precision PyTorch model
+            "torch-int8": PyTorch with int8 dynamic quantization (CPU)
+            "ctranslate2": int8 CTranslate2 model converted once with
+                convert_translator (model_name may also be the directory
+                of a converted model)
+        
         Args:
             model_name: Hugging Face model name for translation
+            cache: Optional persistent cache; cached sentences skip generation
+            device: Device to run on (cpu, cuda)
+            backend: Inference backend (see above)
         """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown translation backend: {backend}")
+        
         self.model_name = model_name
-        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-        self.model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+        self.cache = cache
+        self.backend = backend
+        
+        registry = get_registry()
+        if backend == "ctranslate2":
+            model_dir = model_name if os.path.isdir(model_name) else converted_model_dir(model_name)
+            if not os.path.isdir(model_dir):
+                raise FileNotFoundError(
+                    f"No converted model at {model_dir}; run `python main.py convert-translator --model {model_name}`"
+                )
+            self.tokenizer, self.model = registry.get_ct2_translator(model_dir, device=device)
+        else:
+            compute_type = "int8" if backend == "torch-int8" else "float32"
+            self.tokenizer, self.model = registry.get_translator(model_name, compute_type=compute_type, device=device)
     
     def translate(self, text: str, source_lang: str = "eng_Latn", target_lang: str = "hin_Deva") -> str:
         """
         Translate text from source language to target language.
         
+        Long text is split into sentences and translated in batches, so
+        nothing is dropped past the model's maximum sequence length.
+        
         Args:
             text: Text to translate
             source_lang: Source language code (NLLB format)
             target_lang: Target language code (NLLB format)
-            
+        
         Returns:
             Translated text
         """
-        self.tokenizer.src_lang = source_lang
+        return self.translate_batch([text], source_lang=source_lang, target_lang=target_lang)[0]
+    
+    def translate_batch(
+        self,
+        texts: list,
+        source_lang: str = "eng_Latn",
+        target_lang: str = "hin_Deva",
+        batch_size: int = 16,
+        max_length: int = 512
+    ) -> list:
+        """
+        Translate several texts with batched generation.
+        
+        Every text is split into sentences. Sentences from all texts are
+        sorted by token length so each batch has little padding, run through
+        the model batch_size at a time, and reassembled in the original order.
+        Sentences found in the cache are not sent to the model.
+        
+        Args:
+            texts: Texts to translate
+            source_lang: Source language code (NLLB format)
+            target_lang: Target language code (NLLB format)
+            batch_size: Number of sentences per generate call
+            max_length: Maximum token length of a sentence and its translation
+        
+        Returns:
+            Translated texts, in the same order as the input
+        """
+        return self.translate_multi(
+            texts, [target_lang], source_lang=source_lang,
+            batch_size=batch_size, max_length=max_length
+        )[target_lang]
+    
+    def translate_multi(
+        self,
+        texts: list,
+        target_langs: list,
+        source_lang: str = "eng_Latn",
+        batch_size: int = 16,
+        max_length: int = 512
+    ) -> dict:
+        """
+        Translate several texts into several languages with batched generation.
+        
+        Works like translate_batch, but every sentence is paired with every
+        target language and the pairs share batches, so one generate call
+        can produce translations into different languages.
+        
+        Args:
+            texts: Texts to translate
+            target_langs: Target language codes (NLLB format)
+            source_lang: Source language code (NLLB format)
+            batch_size: Number of sentences per generate call
+            max_length: Maximum token length of a sentence and its translation
+        
+        Returns:
+            Dictionary mapping each target language to its translated texts,
+            in the same order as the input
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        
+        # Flatten all sentences, remembering which text each belongs to
+        sentences = []
+        owners = []
+        for index, text in enumerate(texts):
+            for sentence in split_sentences(text):
+                sentences.append(sentence)
+                owners.append(index)
+        
+        # One job per (sentence, target language) pair
+        jobs = [(sentence_id, lang) for lang in target_langs for sentence_id in range(len(sentences))]
+        translated = [None] * len(jobs)
+        params = {"max_length": max_length}
+        if self.backend != "torch":
+            # Quantized backends produce slightly different output
+            params["backend"] = self.backend
+        
+        if self.cache is not None:
+            for i, (sentence_id, lang) in enumerate(jobs):
+                translated[i] = self.cache.get(self.model_name, source_lang, lang, params, sentences[sentence_id])
+        
+        pending = [i for i, output in enumerate(translated) if output is None]
+        needed = sorted({jobs[i][0] for i in pending})
+        if needed:
+            with _TOKENIZER_LOCK:
+                self.tokenizer.src_lang = source_lang
+                lengths = dict(zip(needed, (len(ids) for ids in self.tokenizer([sentences[i] for i in needed])["input_ids"])))
+                order = sorted(pending, key=lambda i: lengths[jobs[i][0]])
+                batches = [order[start:start + batch_size] for start in range(0, len(order), batch_size)]
+                encoded = [self._encode([sentences[jobs[i][0]] for i in batch_ids], max_length) for batch_ids in batches]
+            
+            for batch_ids, inputs in zip(batches, encoded):
+                outputs = self._generate(inputs, [jobs[i][1] for i in batch_ids], max_length)
+                for job_id, output in zip(batch_ids, outputs):
+                    translated[job_id] = output
+                    if self.cache is not None:
+                        sentence_id, lang = jobs[job_id]
+                        self.cache.put(self.model_name, source_lang, lang, params, sentences[sentence_id], output)
+        
+        results = {lang: [[] for _ in texts] for lang in target_langs}
+        for (sentence_id, lang), output in zip(jobs, translated):
+            results[lang][owners[sentence_id]].append(output)
+        
+        return {lang: [" ".join(parts) for parts in parts_by_text] for lang, parts_by_text in results.items()}
+    
+    def _encode(self, sentences: list, max_length: int):
+        """
+        Encode one batch of sentences in the tokenizer's current source language.
+        
+        Args:
+            sentences: Sentences to translate
+            max_length: Maximum token length of a sentence
+        
+        Returns:
+            Padded input tensors, or source token lists for the CTranslate2
+            backend
+        """
+        if self.backend == "ctranslate2":
+            return [
+                self.tokenizer.convert_ids_to_tokens(
+                    self.tokenizer.encode(sentence, truncation=True, max_length=max_length)
+                )
+                for sentence in sentences
+            ]
+        
+        return self.tokenizer(
+            sentences,
+            return_tensors="pt",
+            padding=True,
+            truncation=True,
+            max_length=max_length
+        ).to(self.model.device)
+    
+    def _generate(self, inputs, target_langs: list, max_length: int) -> list:
+        """
+        Run one encoded batch of sentences through the model.
+        
+        Args:
+            inputs: Batch encoded by _encode
+            target_langs: Target language code (NLLB format) of each sentence
+            max_length: Maximum token length of input and output
+        
+        Returns:
+            Translated sentences
+        """
+        if self.backend == "ctranslate2":
+            return self._generate_ct2(inputs, target_langs, max_length)
+        
+        import torch
         
-        inputs = self.tokenizer(text, return_tensors="pt", truncation=True, max_length=512)
+        if len(set(target_langs)) == 1:
+            forced = {"forced_bos_token_id": self.tokenizer.convert_tokens_to_ids(target_langs[0])}
+        else:
+            # Mixed languages: start every output with its own language token
+            start_id = self.model.config.decoder_start_token_id
+            forced = {"decoder_input_ids": torch.tensor(
+                [[start_id, self.tokenizer.convert_tokens_to_ids(lang)] for lang in target_langs],
+                device=self.model.device
+            )}
         
         with torch.no_grad():
             generated_tokens = self.model.generate(
                 **inputs,
-                forced_bos_token_id=self.tokenizer.convert_tokens_to_ids(target_lang),
-                max_length=512
+                **forced,
+                max_length=max_length
             )
         
-        translated_text = self.tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)[0]
-        return translated_text
+        return self.tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)
+    
+    def _generate_ct2(self, source_tokens: list, target_langs: list, max_length: int) -> list:
+        """
+        Run one batch of sentences through the CTranslate2 model.
+        
+        Args:
+            source_tokens: Token list of each sentence, from _encode
+            target_langs: Target language code (NLLB format) of each sentence
+            max_length: Maximum token length of input and output
+        
+        Returns:
+            Translated sentences
+        """
+        results = self.model.translate_batch(
+            source_tokens,
+            target_prefix=[[lang] for lang in target_langs],
+            beam_size=1,
+            max_decoding_length=max_length
+        )
+        # Each hypothesis starts with the forced target language token
+        return [
+            self.tokenizer.decode(
+                self.tokenizer.convert_tokens_to_ids(result.hypotheses[0][1:]),
+                skip_special_tokens=True
+            )
+            for result in results
+        ]
     
     def translate_to_hindi(self, text: str) -> str:
         """
@@ -53,7 +290,7 @@ class TranslationService:
         
         Args:
             text: English text to translate
-            
+        
         Returns:
             Hindi translation
         """
@@ -66,7 +303,7 @@ class TranslationService:
         Args:
             text: Text to translate
             source_lang: Source language code
-            
+        
         Returns:
             English translation
         """
@@ -83,18 +320,114 @@ SUPPORTED_LANGUAGES = {
     "ita_Latn": "Italian",
     "por_Latn": "Portuguese",
     "jpn_Jpan": "Japanese",
-    "kor_Kore": "Korean",
-    "chi_Simp": "Chinese (Simplified)",
+    "kor_Hang": "Korean",
+    "zho_Hans": "Chinese (Simplified)",
 }
 
 
+# Short language codes accepted by the CLI and job APIs
+LANGUAGE_ALIASES = {
+    "hi": "hin_Deva",
+    "en": "eng_Latn",
+    "es": "spa_Latn",
+    "fr": "fra_Latn",
+}
+
+
+def resolve_language(code: str, default: str = "hin_Deva") -> str:
+    """
+    Resolve a short or NLLB language code to an NLLB code.
+    
+    Args:
+        code: Short code (e.g. "hi") or NLLB code (e.g. "hin_Deva")
+        default: Code returned for unknown short codes
+    
+    Returns:
+        NLLB language code
+    """
+    if code in SUPPORTED_LANGUAGES:
+        return code
+    return LANGUAGE_ALIASES.get(code, default)
+
+
+# Sentence-final punctuation, including the Devanagari danda
+_SENTENCE_END = re.compile(r"(?<=[.!?\u0964])\s+")
+
+
+def split_sentences(text: str, max_words: int = 150) -> list:
+    """
+    Split text into sentences for translation.
+    
+    Sentences longer than max_words (e.g. unpunctuated ASR output) are
+    further split into word windows so none exceed the model's input limit.
+    
+    Args:
+        text: Text to split
+        max_words: Maximum number of words per piece
+    
+    Returns:
+        List of non-empty sentences
+    """
+    sentences = []
+    for sentence in _SENTENCE_END.split(text.strip()):
+        words = sentence.split()
+        for start in range(0, len(words), max_words):
+            sentences.append(" ".join(words[start:start + max_words]))
+    return sentences
+
+
+def converted_model_dir(model_name: str, quantization: str = "int8") -> str:
+    """
+    Get the default directory of a converted CTranslate2 model.
+    
+    Args:
+        model_name: Hugging Face model name
+        quantization: Weight quantization of the converted model
+    
+    Returns:
+        Directory under CONVERTED_MODELS_DIR
+    """
+    return os.path.join(CONVERTED_MODELS_DIR, f"{model_name.replace('/', '--')}-ct2-{quantization}")
+
+
+def convert_translator(
+    model_name: str = "facebook/nllb-200-distilled-600M",
+    output_dir: str = None,
+    quantization: str = "int8",
+    force: bool = False
+) -> str:
+    """
+    Convert a Hugging Face translation model to CTranslate2 (one-time step).
+    
+    The tokenizer is saved next to the converted weights, so the output
+    directory is self-contained.
+    
+    Args:
+        model_name: Hugging Face model name or local path
+        output_dir: Output directory (converted_model_dir if None)
+        quantization: Weight quantization (int8, int8_float32, float16, float32)
+        force: Overwrite an existing conversion
+    
+    Returns:
+        Directory of the converted model
+    """
+    import ctranslate2
+    from transformers import AutoTokenizer
+    
+    output_dir = output_dir or converted_model_dir(model_name, quantization)
+    converter = ctranslate2.converters.TransformersConverter(model_name)
+    converter.convert(output_dir, quantization=quantization, force=force)
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(output_dir)
+    return output_dir
+
+
 def translate_to_hindi(text: str) -> str:
     """
     Convenience function to translate English to Hindi.
     
     Args:
         text: English text
-        
+    
     Returns:
         Hindi translation
     """
@@ -1,24 +1,114 @@
 """
 Text-to-Speech module for SuperNan project.
-Generates speech from text using Edge TTS.
+Generates speech from text using Edge TTS or a local XTTS model.
 """
 
 import asyncio
-import edge_tts
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
+from .artifacts import file_digest
+from .cache import TTSCache
+from .tts_client import TTSClient
+
 
 class TTSService:
     """Service for converting text to speech."""
     
-    def __init__(self, voice: str = "hi-IN-SwaraNeural"):
+    def __init__(
+        self,
+        voice: str = "hi-IN-SwaraNeural",
+        rate: str = "+0%",
+        volume: str = "+0%",
+        pitch: str = "+0Hz",
+        cache: Optional[TTSCache] = None,
+        client: Optional[TTSClient] = None,
+        language: str = None,
+        speaker: str = None
+    ):
         """
         Initialize the TTS service.
         
         Args:
-            voice: Edge TTS voice name
+            voice: Edge TTS voice name (a built-in speaker name for XTTS)
+            rate: Speaking rate adjustment (e.g. "+10%")
+            volume: Volume adjustment (e.g. "-5%")
+            pitch: Pitch adjustment (e.g. "+2Hz")
+            cache: Optional audio cache; hits are written without synthesis
+            client: Client sending the synthesis requests (Edge TTS with
+                default limits if None); share one client between services
+                to share its concurrency and rate limits
+            language: Language spoken (NLLB code), for backends that speak
+                several languages with one voice
+            speaker: Reference recording whose voice is cloned by
+                voice-cloning backends
         """
         self.voice = voice
+        self.rate = rate
+        self.volume = volume
+        self.pitch = pitch
+        self.cache = cache
+        self.client = client or TTSClient()
+        self.language = language
+        self.speaker = speaker
+        # The reference is usually a temporary file; identify it by content
+        self._speaker_digest = file_digest(speaker) if speaker else None
+    
+    @property
+    def options(self) -> dict:
+        """Synthesis options that affect the generated audio."""
+        options = {"rate": self.rate, "volume": self.volume, "pitch": self.pitch}
+        if self.client.backend.name != "edge":
+            # Other backends produce different audio for the same voice name
+            options["backend"] = self.client.backend.name
+        if self.language:
+            options["language"] = self.language
+        if self.speaker:
+            options["speaker"] = self._speaker_digest
+        return options
+    
+    def variant(self, **changes) -> "TTSService":
+        """
+        Get a service sharing this one's cache and client with some settings changed.
+        
+        Args:
+            **changes: Constructor arguments to override (voice, language, ...)
+        
+        Returns:
+            New TTSService
+        """
+        settings = {
+            "voice": self.voice, "rate": self.rate, "volume": self.volume, "pitch": self.pitch,
+            "cache": self.cache, "client": self.client, "language": self.language, "speaker": self.speaker
+        }
+        settings.update(changes)
+        return TTSService(**settings)
+    
+    async def _synthesize(self, text: str) -> tuple:
+        """
+        Synthesize text, using the cache when available.
+        
+        Args:
+            text: Text to convert to speech
+        
+        Returns:
+            Tuple of (audio bytes, word boundary list)
+        """
+        if self.cache is not None:
+            cached = self.cache.get(self.voice, text, self.options)
+            if cached is not None:
+                return cached
+        
+        request = {"rate": self.rate, "volume": self.volume, "pitch": self.pitch}
+        if self.language:
+            request["language"] = self.language
+        if self.speaker:
+            request["speaker"] = self.speaker
+        audio, subs = await self.client.synthesize(text, self.voice, request)
+        if self.cache is not None:
+            self.cache.put(self.voice, text, self.options, audio, subs)
+        
+        return audio, subs
     
     async def generate_speech_async(self, text: str, output_path: str) -> str:
         """
@@ -27,26 +117,37 @@ class TTSService:
         Args:
             text: Text to convert to speech
             output_path: Path to save audio file
-            
+        
         Returns:
             Path to generated audio file
         """
-        communicate = edge_tts.Communicate(text, self.voice)
-        await communicate.save(output_path)
+        audio, _ = await self._synthesize(text)
+        with open(output_path, "wb") as audio_file:
+            audio_file.write(audio)
         return output_path
     
     def generate_speech(self, text: str, output_path: str) -> str:
         """
         Generate speech from text.
         
+        Safe to call from code running inside an event loop; async callers
+        should prefer generate_speech_async.
+        
         Args:
             text: Text to convert to speech
             output_path: Path to save audio file
-            
+        
         Returns:
             Path to generated audio file
         """
-        return asyncio.run(self.generate_speech_async(text, output_path))
+        async def generate():
+            try:
+                return await self.generate_speech_async(text, output_path)
+            finally:
+                # The loop ends with this call; drop its connections
+                await self.client.close()
+        
+        return _run_sync(generate())
     
     async def generate_speech_with_subs_async(self, text: str, output_path: str) -> dict:
         """
@@ -55,23 +156,13 @@ class TTSService:
         Args:
             text: Text to convert to speech
             output_path: Path to save audio file
-            
+        
         Returns:
             Dictionary with audio path and subtitle information
         """
-        subs = []
-        communicate = edge_tts.Communicate(text, self.voice)
-        
+        audio, subs = await self._synthesize(text)
         with open(output_path, "wb") as audio_file:
-            async for chunk in communicate.stream():
-                if chunk["type"] == "audio":
-                    audio_file.write(chunk["data"])
-                elif chunk["type"] == "WordBoundary":
-                    subs.append({
-                        "text": chunk["text"],
-                        "offset": chunk["offset"],
-                        "duration": chunk["duration"]
-                    })
+            audio_file.write(audio)
         
         return {
             "audio_path": output_path,
@@ -79,6 +170,22 @@ class TTSService:
         }
 
 
+def _run_sync(coroutine):
+    """
+    Run a coroutine to completion from synchronous code.
+    
+    asyncio.run cannot start while this thread already runs an event loop
+    (e.g. in a notebook), so the coroutine then gets its own loop in a
+    helper thread.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
+
+
 # Available Hindi voices
 HINDI_VOICES = {
     "swara": "hi-IN-SwaraNeural",
@@ -93,6 +200,38 @@ ENGLISH_VOICES = {
 }
 
 
+# Default voice for each target language (NLLB codes)
+LANGUAGE_VOICES = {
+    "hin_Deva": "hi-IN-SwaraNeural",
+    "eng_Latn": "en-US-JennyNeural",
+    "spa_Latn": "es-ES-ElviraNeural",
+    "fra_Latn": "fr-FR-DeniseNeural",
+    "deu_Latn": "de-DE-KatjaNeural",
+    "ita_Latn": "it-IT-ElsaNeural",
+    "por_Latn": "pt-BR-FranciscaNeural",
+    "jpn_Jpan": "ja-JP-NanamiNeural",
+    "kor_Hang": "ko-KR-SunHiNeural",
+    "zho_Hans": "zh-CN-XiaoxiaoNeural",
+}
+
+
+def voice_for_language(lang: str, voices: dict = None) -> str:
+    """
+    Pick the TTS voice for a target language.
+    
+    Args:
+        lang: Target language code (NLLB format)
+        voices: Optional overrides mapping language codes to voices
+    
+    Returns:
+        Edge TTS voice name
+    """
+    voice = (voices or {}).get(lang) or LANGUAGE_VOICES.get(lang)
+    if voice is None:
+        raise ValueError(f"No TTS voice configured for {lang}")
+    return voice
+
+
 def generate_hindi_speech(text: str, output_path: str = "hindi_speech.wav") -> str:
     """
     Generate Hindi speech from text.
@@ -100,7 +239,7 @@ def generate_hindi_speech(text: str, output_path: str = "hindi_speech.wav") -> s
     Args:
         text: Text to convert to Hindi speech
         output_path: Path to save audio file
-        
+    
     Returns:
         Path to generated audio file
     """
@@ -115,7 +254,7 @@ async def generate_hindi_speech_async(text: str, output_path: str = "hindi_speec
     Args:
         text: Text to convert to Hindi speech
         output_path: Path to save audio file
-        
+    
     Returns:
         Path to generated audio file
     """
@@ -0,0 +1,521 @@
+"""
+TTS client module for SuperNan project.
+Dispatches speech synthesis requests to pluggable backends with bounded
+concurrency, rate limiting and retries.
+"""
+
+import asyncio
+import collections
+import concurrent.futures
+import io
+import queue
+import random
+import threading
+import time
+import weakref
+
+from .artifacts import file_digest
+from .models import XTTS_MODEL, get_registry
+
+
+# XTTS language codes of the NLLB target languages it can speak
+XTTS_LANGUAGES = {
+    "eng_Latn": "en",
+    "spa_Latn": "es",
+    "fra_Latn": "fr",
+    "deu_Latn": "de",
+    "ita_Latn": "it",
+    "por_Latn": "pt",
+    "pol_Latn": "pl",
+    "tur_Latn": "tr",
+    "rus_Cyrl": "ru",
+    "nld_Latn": "nl",
+    "ces_Latn": "cs",
+    "arb_Arab": "ar",
+    "zho_Hans": "zh-cn",
+    "jpn_Jpan": "ja",
+    "hun_Latn": "hu",
+    "kor_Hang": "ko",
+    "hin_Deva": "hi",
+}
+
+# Built-in XTTS speaker used when no reference audio is given
+DEFAULT_XTTS_SPEAKER = "Ana Florence"
+
+
+class TTSBackendError(RuntimeError):
+    """Raised by a TTS backend when a request fails."""
+    
+    def __init__(self, message: str, retryable: bool = True):
+        """
+        Initialize the error.
+        
+        Args:
+            message: Error description
+            retryable: Whether the same request may succeed if retried
+        """
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class TTSBackend:
+    """
+    Interface of a speech synthesis backend.
+    
+    Subclasses implement synthesize. Backends may be used from several
+    threads, each running its own event loop; close releases what the
+    backend holds for the calling thread's loop.
+    """
+    
+    name = "base"
+    # Whether the backend speaks in the voice of a reference recording
+    clones_voice = False
+    
+    async def synthesize(self, text: str, voice: str, options: dict) -> tuple:
+        """
+        Synthesize text.
+        
+        Args:
+            text: Text to speak
+            voice: Voice name
+            options: Synthesis options ("rate", "volume", "pitch", and for
+                voice-cloning backends "language" and "speaker")
+        
+        Returns:
+            Tuple of (audio bytes, word boundary list)
+        """
+        raise NotImplementedError
+    
+    def is_retryable(self, error: Exception) -> bool:
+        """
+        Decide whether a failed request is worth retrying.
+        
+        Args:
+            error: Exception raised by synthesize
+        
+        Returns:
+            True for transient failures (network errors, timeouts, errors
+            the backend marked retryable)
+        """
+        if isinstance(error, TTSBackendError):
+            return error.retryable
+        return isinstance(error, (OSError, asyncio.TimeoutError))
+    
+    async def close(self):
+        """Release connections held for the running event loop."""
+
+
+class EdgeTTSBackend(TTSBackend):
+    """
+    Microsoft Edge online TTS through edge_tts.
+    
+    Every request opens its own websocket session; the service protocol
+    does not allow reusing one between requests.
+    """
+    
+    name = "edge"
+    
+    async def synthesize(self, text: str, voice: str, options: dict) -> tuple:
+        import edge_tts
+        
+        audio = bytearray()
+        subs = []
+        communicate = edge_tts.Communicate(
+            text, voice, **{name: options[name] for name in ("rate", "volume", "pitch") if name in options}
+        )
+        
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                audio.extend(chunk["data"])
+            elif chunk["type"] == "WordBoundary":
+                subs.append({
+                    "text": chunk["text"],
+                    "offset": chunk["offset"],
+                    "duration": chunk["duration"]
+                })
+        
+        return bytes(audio), subs
+    
+    def is_retryable(self, error: Exception) -> bool:
+        import aiohttp
+        import edge_tts.exceptions
+        
+        if isinstance(error, (edge_tts.exceptions.EdgeTTSException, aiohttp.ClientError)):
+            return True
+        return super().is_retryable(error)
+
+
+class HTTPTTSBackend(TTSBackend):
+    """
+    HTTP synthesis service (e.g. benchmarks.fake_tts or a self-hosted model).
+    
+    Requests are POSTed as JSON {"text", "voice", "options"} and answered
+    with audio bytes. Each event loop keeps one aiohttp session, so
+    keep-alive connections are reused between requests.
+    """
+    
+    name = "http"
+    
+    def __init__(self, url: str = "http://127.0.0.1:8766/synthesize", max_connections: int = 16):
+        """
+        Initialize the backend.
+        
+        Args:
+            url: Synthesis endpoint
+            max_connections: Connections kept open per event loop
+        """
+        self.url = url
+        self.max_connections = max_connections
+        self._sessions = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+    
+    def _session(self):
+        """Get the aiohttp session of the running event loop."""
+        import aiohttp
+        
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._sessions.get(loop)
+            if session is None or session.closed:
+                session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(limit=self.max_connections)
+                )
+                self._sessions[loop] = session
+        return session
+    
+    async def synthesize(self, text: str, voice: str, options: dict) -> tuple:
+        import aiohttp
+        
+        try:
+            async with self._session().post(
+                self.url, json={"text": text, "voice": voice, "options": options}
+            ) as response:
+                body = await response.read()
+        except aiohttp.ClientError as e:
+            raise TTSBackendError(f"TTS request failed: {e}") from e
+        
+        if response.status >= 400:
+            # Overload and server errors are transient; other client errors are not
+            retryable = response.status == 429 or response.status >= 500
+            raise TTSBackendError(f"TTS server returned HTTP {response.status}", retryable=retryable)
+        return body, []
+    
+    async def close(self):
+        with self._lock:
+            session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
+
+
+class XTTSBackend(TTSBackend):
+    """
+    Local Coqui XTTS model; runs without network access.
+    
+    The model is loaded once through the model registry and driven by a
+    single worker thread. Requests queue up while the model is busy and are
+    taken off the queue as a batch, grouped by speaker and language, so
+    every batch pays the per-speaker setup once.
+    
+    With a "speaker" option (a reference recording, e.g. the original
+    audio of the clip) the voice is cloned. Speaker conditioning is
+    computed once per recording, keyed by its contents, and reused for
+    every sentence; otherwise a built-in speaker is used. The "rate" and
+    "volume" options are honoured, "pitch" is ignored.
+    """
+    
+    name = "xtts"
+    clones_voice = True
+    
+    def __init__(
+        self,
+        model_name: str = XTTS_MODEL,
+        device: str = "auto",
+        batch_size: int = 16,
+        max_speakers: int = 32
+    ):
+        """
+        Initialize the backend (the model loads on the first request).
+        
+        Args:
+            model_name: Coqui model name
+            device: Device to run on (auto, cpu, cuda)
+            batch_size: Most requests taken off the queue at once
+            max_speakers: Speaker conditionings kept in memory
+        """
+        self.model_name = model_name
+        self.device = device
+        self.batch_size = max(1, batch_size)
+        self.max_speakers = max_speakers
+        self._speakers = collections.OrderedDict()
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+    
+    def is_retryable(self, error: Exception) -> bool:
+        # Local inference fails the same way again
+        return False
+    
+    async def synthesize(self, text: str, voice: str, options: dict) -> tuple:
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._work, name="xtts", daemon=True)
+                self._worker.start()
+        
+        # Unsupported languages fail here, before reaching the worker thread
+        language = self._language(voice, options)
+        future = concurrent.futures.Future()
+        self._queue.put((text, voice, language, options, future))
+        return await asyncio.wrap_future(future), []
+    
+    def _work(self):
+        """Worker thread: synthesize queued requests batch by batch."""
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            # Drop requests whose caller stopped waiting (timeout, cancellation)
+            batch = [request for request in batch if request[4].set_running_or_notify_cancel()]
+            groups = collections.defaultdict(list)
+            for request in batch:
+                text, voice, language, options, future = request
+                groups[(options.get("speaker"), voice, language)].append(request)
+            
+            try:
+                model = get_registry().get_tts(self.model_name, device=self.device).synthesizer.tts_model
+            except Exception as e:
+                for request in batch:
+                    request[4].set_exception(e)
+                continue
+            
+            for (speaker, voice, language), requests in groups.items():
+                try:
+                    conditioning = self._conditioning(model, speaker, voice)
+                except Exception as e:
+                    for request in requests:
+                        request[4].set_exception(e)
+                    continue
+                for text, _, _, options, future in requests:
+                    try:
+                        future.set_result(self._infer(model, text, language, conditioning, options))
+                    except Exception as e:
+                        future.set_exception(e)
+    
+    @staticmethod
+    def _language(voice: str, options: dict) -> str:
+        """XTTS language code from the "language" option or the voice name."""
+        language = options.get("language")
+        if language:
+            if language not in XTTS_LANGUAGES:
+                raise ValueError(f"XTTS cannot speak {language}")
+            return XTTS_LANGUAGES[language]
+        # Edge voice names start with the language code (e.g. hi-IN-SwaraNeural)
+        code = voice.split("-")[0].lower()
+        return code if code in XTTS_LANGUAGES.values() else "en"
+    
+    def _conditioning(self, model, speaker: str, voice: str) -> tuple:
+        """
+        Get the speaker conditioning for a reference recording.
+        
+        Args:
+            model: Loaded XTTS model
+            speaker: Reference recording path (built-in speaker if None)
+            voice: Built-in speaker name tried when speaker is None
+        
+        Returns:
+            Tuple of (GPT conditioning latent, speaker embedding)
+        """
+        if not speaker:
+            speakers = model.speaker_manager.speakers
+            latents = speakers[voice if voice in speakers else DEFAULT_XTTS_SPEAKER]
+            return latents["gpt_cond_latent"], latents["speaker_embedding"]
+        
+        key = file_digest(speaker)
+        conditioning = self._speakers.get(key)
+        if conditioning is None:
+            conditioning = model.get_conditioning_latents(audio_path=[speaker])
+            self._speakers[key] = conditioning
+            while len(self._speakers) > self.max_speakers:
+                self._speakers.popitem(last=False)
+        else:
+            self._speakers.move_to_end(key)
+        return conditioning
+    
+    @staticmethod
+    def _infer(model, text: str, language: str, conditioning: tuple, options: dict) -> bytes:
+        """Synthesize one sentence and encode it as WAV bytes."""
+        import numpy as np
+        import soundfile as sf
+        
+        gpt_cond_latent, speaker_embedding = conditioning
+        output = model.inference(
+            text, language, gpt_cond_latent, speaker_embedding,
+            speed=1.0 + _percent(options.get("rate"))
+        )
+        samples = np.asarray(output["wav"], dtype=np.float32) * (1.0 + _percent(options.get("volume")))
+        
+        buffer = io.BytesIO()
+        sf.write(buffer, np.clip(samples, -1.0, 1.0), model.config.audio.output_sample_rate, format="WAV")
+        return buffer.getvalue()
+
+
+def _percent(value: str) -> float:
+    """Parse an Edge-style adjustment like "+10%" into a fraction."""
+    if not value or not value.endswith("%"):
+        return 0.0
+    return float(value[:-1]) / 100
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter shared by all threads and event loops.
+    
+    Tokens refill at rate per second up to burst. A request that finds the
+    bucket empty reserves the next token and sleeps until it is due.
+    """
+    
+    def __init__(self, rate: float, burst: int = None):
+        """
+        Initialize the bucket (full).
+        
+        Args:
+            rate: Requests allowed per second on average
+            burst: Requests allowed at once (defaults to rate, at least 1)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, int(burst if burst is not None else rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """
+        Take a token, going into debt if none is left.
+        
+        Returns:
+            Seconds to wait before the token may be used
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+    
+    async def acquire(self):
+        """Wait until a request may be sent."""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class TTSClient:
+    """
+    Sends synthesis requests to a backend.
+    
+    At most max_concurrency requests are in flight at once across all
+    threads and event loops using the client, optionally limited to a
+    request rate. Transient failures are retried with exponential backoff
+    and full jitter, so one dropped request does not fail a whole run.
+    """
+    
+    def __init__(
+        self,
+        backend: TTSBackend = None,
+        max_concurrency: int = 8,
+        rate: float = None,
+        burst: int = None,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 8.0,
+        timeout: float = 60.0
+    ):
+        """
+        Initialize the client.
+        
+        Args:
+            backend: Synthesis backend (EdgeTTSBackend if None)
+            max_concurrency: Requests in flight at once
+            rate: Requests per second allowed (unlimited if None)
+            burst: Requests allowed at once by the rate limiter
+            max_retries: Retries of a failed request
+            backoff: Base delay in seconds; retry n waits a random time of
+                up to backoff * 2**n
+            max_backoff: Longest delay between retries in seconds
+            timeout: Seconds before a single attempt is abandoned (no limit if None)
+        """
+        self.backend = backend or EdgeTTSBackend()
+        self.max_concurrency = max(1, max_concurrency)
+        self.limiter = TokenBucket(rate, burst) if rate else None
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._lock = threading.Lock()
+    
+    async def _acquire_slot(self):
+        """Wait for a free request slot without blocking the event loop."""
+        delay = 0.005
+        while not self._slots.acquire(blocking=False):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.05)
+    
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+    
+    async def synthesize(self, text: str, voice: str, options: dict) -> tuple:
+        """
+        Synthesize text, retrying transient failures.
+        
+        Args:
+            text: Text to speak
+            voice: Voice name
+            options: Synthesis options passed to the backend
+        
+        Returns:
+            Tuple of (audio bytes, word boundary list)
+        """
+        attempt = 0
+        while True:
+            if self.limiter is not None:
+                await self.limiter.acquire()
+            await self._acquire_slot()
+            try:
+                self._count("requests")
+                return await asyncio.wait_for(self.backend.synthesize(text, voice, options), self.timeout)
+            except Exception as e:
+                if attempt >= self.max_retries or not self.backend.is_retryable(e):
+                    self._count("failures")
+                    raise
+                error = e
+            finally:
+                self._slots.release()
+            
+            delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+            attempt += 1
+            self._count("retries")
+            print(f"Warning: TTS request failed ({type(error).__name__}: {error}); retry {attempt} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+    
+    async def close(self):
+        """Release backend connections held for the running event loop."""
+        await self.backend.close()
+    
+    def stats(self) -> dict:
+        """
+        Get request counters.
+        
+        Returns:
+            Dictionary with requests sent, retries and failed requests
+        """
+        return {"requests": self.requests, "retries": self.retries, "failures": self.failures}
@@ -0,0 +1,187 @@
+"""
+Voice activity detection module for SuperNan project.
+Finds speech regions so silence and music can skip recognition and dubbing.
+"""
+
+import bisect
+
+import numpy as np
+
+from .ffmpeg import WHISPER_SAMPLE_RATE
+from .audio_processor import OUTPUT_SAMPLE_RATE, stretch_regions, time_stretch
+
+
+def detect_speech(
+    samples: np.ndarray,
+    threshold: float = 0.5,
+    min_speech: float = 0.25,
+    min_silence: float = 0.5,
+    speech_pad: float = 0.2
+) -> list:
+    """
+    Find speech regions with the Silero VAD model bundled with faster-whisper.
+    
+    Args:
+        samples: 16 kHz mono float32 samples
+        threshold: Speech probability above which a frame counts as speech
+        min_speech: Shortest speech region kept, in seconds
+        min_silence: Shortest pause that splits two regions, in seconds
+        speech_pad: Padding added to both sides of each region, in seconds
+    
+    Returns:
+        List of {"start", "end"} dicts in seconds, sorted and non-overlapping
+    """
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+    
+    options = VadOptions(
+        threshold=threshold,
+        min_speech_duration_ms=int(min_speech * 1000),
+        min_silence_duration_ms=int(min_silence * 1000),
+        speech_pad_ms=int(speech_pad * 1000)
+    )
+    timestamps = get_speech_timestamps(samples, options, sampling_rate=WHISPER_SAMPLE_RATE)
+    return [
+        {"start": stamp["start"] / WHISPER_SAMPLE_RATE, "end": stamp["end"] / WHISPER_SAMPLE_RATE}
+        for stamp in timestamps
+    ]
+
+
+class SpeechMap:
+    """
+    Speech regions of a clip and the mapping to its speech-only audio.
+    
+    The speech-only audio is the regions concatenated back to back; times
+    in it map back to the original timeline region by region.
+    """
+    
+    def __init__(self, regions: list):
+        """
+        Initialize the map.
+        
+        Args:
+            regions: Speech regions as returned by detect_speech
+        """
+        self.regions = regions
+        self.offsets = []
+        offset = 0.0
+        for region in regions:
+            self.offsets.append(offset)
+            offset += region["end"] - region["start"]
+        self.speech_duration = offset
+    
+    def gather(self, samples: np.ndarray, sample_rate: int = WHISPER_SAMPLE_RATE) -> np.ndarray:
+        """
+        Cut the speech regions out of the original audio.
+        
+        Args:
+            samples: Original mono samples
+            sample_rate: Sample rate of the samples
+        
+        Returns:
+            Speech-only mono samples
+        """
+        if not self.regions:
+            return np.zeros(0, dtype=samples.dtype)
+        return np.concatenate([
+            samples[int(round(region["start"] * sample_rate)):int(round(region["end"] * sample_rate))]
+            for region in self.regions
+        ])
+    
+    def to_original(self, time: float, is_end: bool = False) -> float:
+        """
+        Map a time in the speech-only audio to the original timeline.
+        
+        Args:
+            time: Seconds into the speech-only audio
+            is_end: Whether the time ends an interval; a time on the boundary
+                between two regions then maps to the end of the earlier one
+        
+        Returns:
+            Seconds into the original audio
+        """
+        if not self.regions:
+            return time
+        
+        if is_end:
+            index = bisect.bisect_left(self.offsets, time) - 1
+        else:
+            index = bisect.bisect_right(self.offsets, time) - 1
+        index = min(max(index, 0), len(self.regions) - 1)
+        region = self.regions[index]
+        return min(region["start"] + time - self.offsets[index], region["end"])
+    
+    def remap_segments(self, segments: list) -> list:
+        """
+        Move timed segments from the speech-only audio to the original timeline.
+        
+        Args:
+            segments: Segment dicts with "start" and "end"
+        
+        Returns:
+            Copies of the segments with original-timeline times
+        """
+        return [
+            {**segment, "start": self.to_original(segment["start"]), "end": self.to_original(segment["end"], is_end=True)}
+            for segment in segments
+        ]
+    
+    def slots(self, start: float = 0.0, end: float = None) -> list:
+        """
+        Get the parts of the speech regions that fall inside an interval.
+        
+        Args:
+            start: Interval start in seconds
+            end: Interval end in seconds (end of the last region if None)
+        
+        Returns:
+            List of {"start", "end"} dicts in seconds
+        """
+        if end is None:
+            end = self.regions[-1]["end"] if self.regions else start
+        return [
+            {"start": max(region["start"], start), "end": min(region["end"], end)}
+            for region in self.regions
+            if region["end"] > start and region["start"] < end
+        ]
+    
+    def fit(
+        self,
+        samples: np.ndarray,
+        start: float,
+        end: float,
+        sample_rate: int = OUTPUT_SAMPLE_RATE
+    ) -> np.ndarray:
+        """
+        Stretch dubbed speech into the speech slots of an interval.
+        
+        The dubbed speech is split across the slots in proportion to their
+        lengths, so pauses between regions stay silent. Without any slot in
+        the interval, the speech is stretched over all of it.
+        
+        Args:
+            samples: Dubbed mono float32 samples
+            start: Interval start on the original timeline, in seconds
+            end: Interval end on the original timeline, in seconds
+            sample_rate: Sample rate of the samples and output
+        
+        Returns:
+            Mono float32 samples covering exactly the interval
+        """
+        slots = self.slots(start, end)
+        slot_duration = sum(slot["end"] - slot["start"] for slot in slots)
+        if slot_duration <= 0:
+            return time_stretch(samples, int(round((end - start) * sample_rate)))
+        
+        source_duration = len(samples) / sample_rate
+        regions = []
+        covered = 0.0
+        for slot in slots:
+            source_start = source_duration * covered / slot_duration
+            covered += slot["end"] - slot["start"]
+            regions.append({
+                "source_start": source_start,
+                "source_end": source_duration * covered / slot_duration,
+                "start": slot["start"] - start,
+                "end": slot["end"] - start
+            })
+        return stretch_regions(samples, sample_rate, regions, end - start)
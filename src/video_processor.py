@@ -4,19 +4,180 @@ Handles video chunk extraction and audio extraction.
 """
 
 import os
+import shutil
+import tempfile
 
+import numpy as np
 
-def extract_chunk(input_path: str, output_path: str, start_time: str = "00:00:15", end_time: str = "00:00:30"):
+from .ffmpeg import WHISPER_SAMPLE_RATE, decode_audio, probe, run_ffmpeg
+from .keyframes import get_keyframes, keyframe_at_or_after, keyframe_at_or_before
+
+
+# Encoders used to re-encode partial GOPs so they can be joined with copied ones
+VIDEO_ENCODERS = {
+    "h264": "libx264",
+    "hevc": "libx265",
+    "mpeg4": "mpeg4",
+    "vp9": "libvpx-vp9",
+}
+
+AUDIO_ENCODERS = {
+    "aac": "aac",
+    "mp3": "libmp3lame",
+    "opus": "libopus",
+    "vorbis": "libvorbis",
+    "ac3": "ac3",
+}
+
+H264_PROFILES = {
+    "Constrained Baseline": "baseline",
+    "Baseline": "baseline",
+    "Main": "main",
+    "High": "high",
+}
+
+
+def parse_time(value) -> float:
+    """
+    Convert a timestamp to seconds.
+    
+    Args:
+        value: Seconds (number or string) or "[HH:]MM:SS[.mmm]"
+    
+    Returns:
+        Time in seconds
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+    
+    seconds = 0.0
+    for part in str(value).strip().split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def extract_chunk(
+    input_path: str,
+    output_path: str,
+    start_time: str = "00:00:15",
+    end_time: str = "00:00:30",
+    smart: bool = True
+):
     """
     Extract a specific time chunk from a video file.
     
+    With smart cutting, the input is seeked directly to the range using a
+    cached keyframe index. GOPs lying entirely inside the range are
+    stream-copied and only the partial GOPs at each end are re-encoded, so
+    the chunk starts and ends at the requested times.
+    
     Args:
         input_path: Path to input video file
         output_path: Path to save extracted chunk
         start_time: Start time in HH:MM:SS format
         end_time: End time in HH:MM:SS format
+        smart: Use keyframe-aware cutting (plain stream copy if False)
     """
-    os.system(f"ffmpeg -i {input_path} -ss {start_time} -to {end_time} -c copy {output_path}")
+    if not smart:
+        run_ffmpeg(["-i", input_path, "-ss", start_time, "-to", end_time, "-c", "copy", output_path])
+        return
+    
+    start = parse_time(start_time)
+    end = parse_time(end_time)
+    if end <= start:
+        raise ValueError(f"End time {end_time} is not after start time {start_time}")
+    
+    info = probe(input_path)
+    video = next((st for st in info["streams"] if st["codec_type"] == "video"), None)
+    keyframes = get_keyframes(input_path) if video is not None else []
+    
+    if not keyframes:
+        # Audio-only input: every packet is a sync point
+        run_ffmpeg(["-ss", start, "-i", input_path, "-t", end - start, "-c", "copy", output_path])
+        return
+    
+    first = keyframe_at_or_after(keyframes, start)
+    last = keyframe_at_or_before(keyframes, end)
+    encoder = VIDEO_ENCODERS.get(video["codec_name"])
+    
+    if encoder is None or first is None or last is None or last <= first:
+        # Range lies inside one GOP (or codec can't be matched): re-encode it
+        _encode_range(input_path, output_path, start, end, info, "libx264" if encoder is None else encoder)
+        return
+    
+    temp_dir = tempfile.mkdtemp()
+    try:
+        parts = []
+        if first - start > 0.001:
+            parts.append(os.path.join(temp_dir, "head.ts"))
+            _encode_range(input_path, parts[-1], start, first, info, encoder)
+        
+        parts.append(os.path.join(temp_dir, "body.ts"))
+        run_ffmpeg([
+            "-ss", first, "-i", input_path, "-t", last - first,
+            "-map", "0:v:0", "-map", "0:a?", "-c", "copy", parts[-1]
+        ])
+        
+        if end - last > 0.001:
+            parts.append(os.path.join(temp_dir, "tail.ts"))
+            _encode_range(input_path, parts[-1], last, end, info, encoder)
+        
+        concat_files(parts, output_path)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def _encode_range(input_path: str, output_path: str, start: float, end: float, info: dict, encoder: str):
+    """
+    Re-encode a time range with settings matching the source streams.
+    
+    Args:
+        input_path: Path to input video file
+        output_path: Path to save the encoded range
+        start: Start time in seconds
+        end: End time in seconds
+        info: ffprobe information for the input
+        encoder: Video encoder name
+    """
+    video = next(st for st in info["streams"] if st["codec_type"] == "video")
+    audio = next((st for st in info["streams"] if st["codec_type"] == "audio"), None)
+    
+    args = [
+        "-ss", start, "-i", input_path, "-t", end - start,
+        "-map", "0:v:0", "-map", "0:a?",
+        "-c:v", encoder, "-pix_fmt", video.get("pix_fmt", "yuv420p")
+    ]
+    if encoder == "libx264":
+        args += ["-preset", "veryfast", "-crf", 18]
+        if video.get("profile") in H264_PROFILES:
+            args += ["-profile:v", H264_PROFILES[video["profile"]]]
+    if audio is not None:
+        args += [
+            "-c:a", AUDIO_ENCODERS.get(audio.get("codec_name"), "aac"),
+            "-ar", audio.get("sample_rate", 44100),
+            "-ac", audio.get("channels", 2)
+        ]
+    run_ffmpeg(args + [output_path])
+
+
+def concat_files(paths: list, output_path: str):
+    """
+    Join media files with matching codecs without re-encoding.
+    
+    Args:
+        paths: Files to join, in order
+        output_path: Path to save the joined file
+    """
+    list_dir = tempfile.mkdtemp()
+    try:
+        list_path = os.path.join(list_dir, "concat.txt")
+        with open(list_path, "w") as list_file:
+            for path in paths:
+                escaped = os.path.abspath(path).replace("'", "'\\''")
+                list_file.write(f"file '{escaped}'\n")
+        run_ffmpeg(["-f", "concat", "-safe", 0, "-i", list_path, "-map", "0", "-c", "copy", output_path])
+    finally:
+        shutil.rmtree(list_dir, ignore_errors=True)
 
 
 def extract_audio(video_path: str, audio_path: str):
@@ -27,21 +188,108 @@ def extract_audio(video_path: str, audio_path: str):
         video_path: Path to video file
         audio_path: Path to save extracted audio
     """
-    os.system(f"ffmpeg -i {video_path} -q:a 0 -map a {audio_path}")
+    run_ffmpeg(["-i", video_path, "-q:a", 0, "-map", "a", audio_path])
 
 
-def merge_audio_video(video_path: str, audio_path: str, output_path: str):
+def load_audio(video_path: str, sample_rate: int = WHISPER_SAMPLE_RATE, channels: int = 1) -> np.ndarray:
+    """
+    Decode the audio of a video file straight into memory.
+    
+    The default 16 kHz mono float32 format can be passed directly to
+    TranscriptionService without writing a WAV file.
+    
+    Args:
+        video_path: Path to video file
+        sample_rate: Output sample rate
+        channels: Output channel count
+    
+    Returns:
+        Float32 samples, shaped (samples, channels) unless mono
+    """
+    return decode_audio(video_path, sample_rate=sample_rate, channels=channels)
+
+
+def merge_audio_video(video_path: str, audio_path, output_path: str, languages: list = None):
     """
     Merge audio with video file.
     
+    Several audio files become separate audio tracks, in order; the first
+    one is the default track.
+    
     Args:
         video_path: Path to video file
-        audio_path: Path to audio file
+        audio_path: Path to audio file, or list of paths
         output_path: Path to save final output
+        languages: Optional language tag of each audio track (ISO 639-2,
+            e.g. "hin")
     """
-    command = (
-        f"ffmpeg -y -i {video_path} -i {audio_path} "
-        f"-c:v copy -map 0:v:0 -map 1:a:0 -shortest {output_path}"
-    )
-    os.system(command)
+    audio_paths = [audio_path] if isinstance(audio_path, str) else list(audio_path)
+    
+    args = ["-i", video_path]
+    for path in audio_paths:
+        args += ["-i", path]
+    args += ["-c:v", "copy", "-map", "0:v:0"]
+    for index in range(len(audio_paths)):
+        args += ["-map", f"{index + 1}:a:0"]
+    for index, language in enumerate(languages or []):
+        args += [f"-metadata:s:a:{index}", f"language={language}"]
+    if len(audio_paths) > 1:
+        args += ["-disposition:a:0", "default"]
+    run_ffmpeg(args + ["-shortest", output_path])
 
+
+def merge_audio_samples(
+    video_path: str,
+    tracks: list,
+    output_path: str,
+    sample_rate: int,
+    languages: list = None
+):
+    """
+    Merge in-memory audio tracks with a video file in one ffmpeg run.
+    
+    The tracks are piped to ffmpeg as raw PCM and encoded once, straight
+    into the output; no intermediate audio files are written. Several
+    tracks become separate audio tracks, in order; the first one is the
+    default track.
+    
+    Args:
+        video_path: Path to video file
+        tracks: Float32 sample arrays, each (samples,) or (samples, channels)
+        output_path: Path to save final output
+        sample_rate: Sample rate of the tracks
+        languages: Optional language tag of each audio track (ISO 639-2,
+            e.g. "hin")
+    """
+    tracks = [track[:, None] if track.ndim == 1 else track for track in tracks]
+    length = max(len(track) for track in tracks)
+    # All tracks travel through stdin as the channels of one PCM stream
+    pcm = np.concatenate([
+        np.pad(track, ((0, length - len(track)), (0, 0))) for track in tracks
+    ], axis=1).astype(np.float32)
+    
+    args = [
+        "-i", video_path,
+        "-f", "f32le", "-ar", sample_rate, "-ac", pcm.shape[1], "-i", "pipe:0",
+        "-c:v", "copy", "-map", "0:v:0"
+    ]
+    if len(tracks) == 1:
+        args += ["-map", "1:a:0"]
+    else:
+        # Split the stream back into one audio track per input track
+        graph = [f"[1:a]asplit={len(tracks)}" + "".join(f"[in{index}]" for index in range(len(tracks)))]
+        first = 0
+        for index, track in enumerate(tracks):
+            channels = track.shape[1]
+            layout = {1: "mono", 2: "stereo"}.get(channels, f"{channels}c")
+            mapping = "|".join(f"c{channel}=c{first + channel}" for channel in range(channels))
+            graph.append(f"[in{index}]pan={layout}|{mapping}[out{index}]")
+            first += channels
+        args += ["-filter_complex", ";".join(graph)]
+        for index in range(len(tracks)):
+            args += ["-map", f"[out{index}]"]
+    for index, language in enumerate(languages or []):
+        args += [f"-metadata:s:a:{index}", f"language={language}"]
+    if len(tracks) > 1:
+        args += ["-disposition:a:0", "default"]
+    run_ffmpeg(args + ["-shortest", output_path], input_bytes=pcm.tobytes())